@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from app.config import (
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM,
+    ARGON2_TIME_COST,
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_QUEUE_TIMEOUT,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_SCHEMES,
+)
+from app.utils.metrics import Histogram
+
+# Serviço único de hash de senhas. Os algoritmos rodam em processos
+# separados: uma rajada de logins não ocupa as threads que atendem o
+# restante da API.
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_MAX_PENDING)
+
+_context: Optional[CryptContext] = None
+
+# Tempo de CPU (ms) medido no worker, por (esquema, operação)
+_timings: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+_timings_lock = threading.Lock()
+
+
+def build_context() -> CryptContext:
+    # min == max == custo configurado: qualquer hash com outro custo (ou de
+    # um esquema que não é o padrão) é marcado para atualização
+    settings = {}
+    if "bcrypt" in PASSWORD_SCHEMES:
+        settings.update(
+            bcrypt__rounds=BCRYPT_ROUNDS,
+            bcrypt__min_rounds=BCRYPT_ROUNDS,
+            bcrypt__max_rounds=BCRYPT_ROUNDS,
+        )
+    if "argon2" in PASSWORD_SCHEMES:
+        settings.update(
+            argon2__type="ID",
+            argon2__rounds=ARGON2_TIME_COST,
+            argon2__min_rounds=ARGON2_TIME_COST,
+            argon2__max_rounds=ARGON2_TIME_COST,
+            argon2__memory_cost=ARGON2_MEMORY_COST,
+            argon2__parallelism=ARGON2_PARALLELISM,
+        )
+    return CryptContext(schemes=PASSWORD_SCHEMES, deprecated="auto", **settings)
+
+
+def _get_context() -> CryptContext:
+    global _context
+    if _context is None:
+        _context = build_context()
+    return _context
+
+
+def _hash_job(password: str):
+    context = _get_context()
+    start = time.perf_counter()
+    hashed = context.hash(password)
+    elapsed = (time.perf_counter() - start) * 1000
+    return hashed, context.default_scheme(), elapsed
+
+
+def _verify_and_update_job(password: str, hashed: str):
+    context = _get_context()
+    scheme = context.identify(hashed) or "unknown"
+    start = time.perf_counter()
+    result = context.verify_and_update(password, hashed)
+    elapsed = (time.perf_counter() - start) * 1000
+    return result, scheme, elapsed
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+        return _executor
+
+
+def _run(operation: str, job, *args):
+    # Back-pressure: no máximo PASSWORD_HASH_MAX_PENDING operações em andamento
+    if not _slots.acquire(timeout=PASSWORD_HASH_QUEUE_TIMEOUT):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado, tente novamente em instantes.",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        result, scheme, elapsed = _get_executor().submit(job, *args).result()
+    finally:
+        _slots.release()
+
+    with _timings_lock:
+        histogram = _timings[(scheme, operation)]
+    histogram.observe(elapsed)
+    return result
+
+
+def hash_password(password: str) -> str:
+    return _run("hash", _hash_job, password)
+
+
+def verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """Retorna (válida, novo_hash); novo_hash vem quando o esquema ou custo mudou."""
+    return _run("verify", _verify_and_update_job, password, hashed)
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    valid, _ = verify_and_update(password, hashed)
+    return valid
+
+
+def hashing_stats() -> dict:
+    with _timings_lock:
+        items = list(_timings.items())
+    stats: dict = {}
+    for (scheme, operation), histogram in items:
+        stats.setdefault(scheme, {})[operation] = histogram.snapshot()
+    return stats
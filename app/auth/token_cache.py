@@ -0,0 +1,42 @@
+import hashlib
+import time
+from typing import Iterable, Optional
+from app.auth.tokens import TokenClaims, check_type
+from app.auth.tokens import decode_token as verify_token
+from app.config import JWT_CACHE_SIZE
+from app.utils.cache import TTLCache
+
+# Claims já validadas, por digest do token, até o `exp` de cada token. O cache
+# só poupa a verificação da assinatura, então fica sempre no processo: a
+# revogação é o corte users.tokens_valid_after, conferido a cada requisição
+# (check_not_revoked).
+_claims_cache = TTLCache(maxsize=JWT_CACHE_SIZE)
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def decode_token(
+    token: str, expected_types: Optional[Iterable[str]] = None
+) -> TokenClaims:
+    """decode_token do serviço de tokens, com cache. Levanta TokenError."""
+    key = _digest(token)
+    claims = _claims_cache.get(key)
+    if claims is None or claims.exp <= time.time():
+        claims = verify_token(token)
+        ttl = claims.exp - time.time()
+        if ttl > 0:
+            _claims_cache.set(key, claims, ttl=ttl, tags=(("user", claims.sub),))
+
+    check_type(claims, expected_types)
+    return claims
+
+
+def evict_user_tokens(user_id: str) -> None:
+    """Descarta as claims em cache do usuário após a revogação dos tokens."""
+    _claims_cache.invalidate_tag(("user", str(user_id)))
+
+
+def token_cache_stats() -> dict:
+    return _claims_cache.stats()
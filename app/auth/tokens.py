@@ -0,0 +1,184 @@
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional
+import jwt
+from jwt.algorithms import get_default_algorithms
+from app.config import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    ALGORITHM,
+    INVITE_TOKEN_EXPIRE_MINUTES,
+    JWT_KEY_ID,
+    JWT_PREVIOUS_KEYS,
+    JWT_PRIVATE_KEY_FILE,
+    REFRESH_TOKEN_EXPIRE_MINUTES,
+    RESET_TOKEN_EXPIRE_MINUTES,
+    SECRET_KEY,
+)
+
+# Serviço único de tokens: criação, verificação e rotação de chaves.
+# HS256 usa SECRET_KEY; EdDSA/ES256 assinam com JWT_PRIVATE_KEY_FILE e
+# publicam as chaves públicas em /.well-known/jwks.json.
+ASYMMETRIC_ALGORITHMS = {"EdDSA", "ES256"}
+
+ACCESS = "access"
+REFRESH = "refresh"
+RESET = "reset"
+INVITE = "invite"
+
+
+class TokenError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    sub: str
+    type: Optional[str]
+    exp: int
+    jti: Optional[str] = None
+    iat: Optional[float] = None
+    extra: Dict[str, object] = field(default_factory=dict)
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "TokenClaims":
+        known = {"sub", "type", "exp", "jti", "iat"}
+        return cls(
+            sub=str(payload["sub"]),
+            type=payload.get("type"),
+            exp=int(payload["exp"]),
+            jti=payload.get("jti"),
+            iat=payload.get("iat"),
+            extra={k: v for k, v in payload.items() if k not in known},
+        )
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _load_keys():
+    """Prepara as chaves uma única vez: (assinatura, {kid: verificação})."""
+    algorithm = get_default_algorithms()[ALGORITHM]
+
+    if ALGORITHM not in ASYMMETRIC_ALGORITHMS:
+        verify = {JWT_KEY_ID: SECRET_KEY.encode()}
+        for kid, secret in JWT_PREVIOUS_KEYS.items():
+            verify[kid] = secret.encode()
+        return verify[JWT_KEY_ID], verify
+
+    if not JWT_PRIVATE_KEY_FILE:
+        raise ValueError(f"JWT_PRIVATE_KEY_FILE é obrigatório para {ALGORITHM}")
+
+    signing = algorithm.prepare_key(_read(JWT_PRIVATE_KEY_FILE))
+    verify = {JWT_KEY_ID: signing.public_key()}
+    # Chaves anteriores: apenas a pública (PEM) é necessária
+    for kid, path in JWT_PREVIOUS_KEYS.items():
+        verify[kid] = algorithm.prepare_key(_read(path))
+    return signing, verify
+
+
+_signing_key, _verify_keys = _load_keys()
+
+
+def create_token(
+    sub: str,
+    token_type: str,
+    expires_minutes: int,
+    jti: Optional[str] = None,
+    **extra,
+) -> str:
+    now = datetime.now(timezone.utc)
+    payload = {
+        **extra,
+        "sub": str(sub),
+        "type": token_type,
+        # Com fração de segundo: a revogação compara com tokens_valid_after
+        "iat": now.timestamp(),
+        "exp": now + timedelta(minutes=expires_minutes),
+        "jti": jti or uuid.uuid4().hex,
+    }
+    return jwt.encode(
+        payload, _signing_key, algorithm=ALGORITHM, headers={"kid": JWT_KEY_ID}
+    )
+
+
+def create_access_token(user_id: str) -> str:
+    return create_token(user_id, ACCESS, ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
+def create_refresh_token(user_id: str, jti: str, family_id: str) -> str:
+    return create_token(
+        user_id, REFRESH, REFRESH_TOKEN_EXPIRE_MINUTES, jti=jti, fid=family_id
+    )
+
+
+def create_reset_token(user_id: str) -> str:
+    return create_token(user_id, RESET, RESET_TOKEN_EXPIRE_MINUTES)
+
+
+def create_invite_token(
+    email: str, workspace_id: str, workspace_name: str, workspace_icon: Optional[str]
+) -> str:
+    return create_token(
+        email,
+        INVITE,
+        INVITE_TOKEN_EXPIRE_MINUTES,
+        workspace_id=workspace_id,
+        workspace_name=workspace_name,
+        workspace_icon=workspace_icon,
+    )
+
+
+def decode_token(
+    token: str, expected_types: Optional[Iterable[str]] = None
+) -> TokenClaims:
+    """Verifica assinatura e expiração. Levanta TokenError se inválido."""
+    try:
+        # Tokens emitidos antes da rotação não têm `kid`: usa a chave ativa
+        kid = jwt.get_unverified_header(token).get("kid", JWT_KEY_ID)
+        key = _verify_keys.get(kid)
+        if key is None:
+            raise TokenError("Chave de assinatura desconhecida")
+
+        payload = jwt.decode(
+            token, key, algorithms=[ALGORITHM], options={"require": ["exp", "sub"]}
+        )
+    except jwt.PyJWTError as e:
+        raise TokenError(str(e)) from e
+
+    claims = TokenClaims.from_payload(payload)
+    check_type(claims, expected_types)
+    return claims
+
+
+def check_type(claims: TokenClaims, expected_types: Optional[Iterable[str]]) -> None:
+    if expected_types is not None and claims.type not in tuple(expected_types):
+        raise TokenError("Tipo de token inválido")
+
+
+def check_not_revoked(
+    claims: TokenClaims, tokens_valid_after: Optional[datetime]
+) -> None:
+    """Recusa tokens emitidos antes do corte do usuário (logout, troca de senha)."""
+    if tokens_valid_after is None:
+        return
+    cutoff = tokens_valid_after.replace(tzinfo=timezone.utc).timestamp()
+    if claims.iat is None or claims.iat < cutoff:
+        raise TokenError("Token revogado")
+
+
+def jwks() -> dict:
+    """Chaves públicas para verificação offline (vazio no modo HMAC)."""
+    if ALGORITHM not in ASYMMETRIC_ALGORITHMS:
+        return {"keys": []}
+
+    algorithm = get_default_algorithms()[ALGORITHM]
+    keys = []
+    for kid, key in _verify_keys.items():
+        jwk = json.loads(algorithm.to_jwk(key))
+        jwk.update(kid=kid, alg=ALGORITHM, use="sig")
+        keys.append(jwk)
+    return {"keys": keys}
@@ -1,22 +1,129 @@
+import json
 import os
 from dotenv import load_dotenv
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
+ALGORITHM = os.getenv("ALGORITHM", "HS256")  # HS256, EdDSA ou ES256
+# Rotação de chaves: `kid` da chave ativa e chaves antigas aceitas só para
+# verificação, em JSON {"kid": "segredo"} (HS256) ou {"kid": "caminho.pem"}
+JWT_KEY_ID = os.getenv("JWT_KEY_ID", "default")
+JWT_PREVIOUS_KEYS = json.loads(os.getenv("JWT_PREVIOUS_KEYS", "{}"))
+JWT_PRIVATE_KEY_FILE = os.getenv("JWT_PRIVATE_KEY_FILE")  # EdDSA/ES256
 INVITE_TOKEN_EXPIRE_MINUTES = int(os.getenv("INVITE_TOKEN_EXPIRE_MINUTES", 60 * 5))
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 RESET_TOKEN_EXPIRE_MINUTES = int(os.getenv("RESET_TOKEN_EXPIRE_MINUTES", 60))
 REFRESH_TOKEN_EXPIRE_MINUTES = int(os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES", 60 * 24 * 7))
 
 BREVO_API_KEY = os.getenv("BREVO_API_KEY")
+# Aponte para o sink local (python -m app.scripts.email_sink) em testes
+BREVO_API_URL = os.getenv("BREVO_API_URL", "https://api.brevo.com/v3/smtp/email")
+
+# Worker do outbox de e-mails
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", 2))
+# Reserva de um lote pelo worker; deve cobrir o envio do lote inteiro
+EMAIL_OUTBOX_LEASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", 600))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", 8))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", 30))
+EMAIL_RETRY_MAX_SECONDS = float(os.getenv("EMAIL_RETRY_MAX_SECONDS", 3600))
+
+# Cliente HTTP de saída (provedores externos)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 3))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 10))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 10))
+HTTP_MAX_CONCURRENCY = int(os.getenv("HTTP_MAX_CONCURRENCY", 10))
+HTTP_BREAKER_FAILURES = int(os.getenv("HTTP_BREAKER_FAILURES", 5))
+HTTP_BREAKER_RESET_SECONDS = float(os.getenv("HTTP_BREAKER_RESET_SECONDS", 30))
 
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
+# "sync" (psycopg2 + threadpool) ou "async" (asyncpg + AsyncSession)
+DB_MODE = os.getenv("DB_MODE", "sync")
+
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", 10_000))
+
+# Hash de senhas. O primeiro esquema é usado para novos hashes; os demais
+# só verificam hashes antigos, que são regravados no próximo login.
+PASSWORD_SCHEMES = [
+    s.strip() for s in os.getenv("PASSWORD_SCHEMES", "bcrypt").split(",") if s.strip()
+]
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 3))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 65536))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 4))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 16))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", 2))
+
+# Pool de conexões do banco
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # segundos; -1 desativa
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))  # 0 = sem limite
+
+EXPENSES_PAGE_SIZE = int(os.getenv("EXPENSES_PAGE_SIZE", 100))
+EXPENSES_MAX_PAGE_SIZE = int(os.getenv("EXPENSES_MAX_PAGE_SIZE", 1000))
+EXPENSES_STREAM_BATCH_SIZE = int(os.getenv("EXPENSES_STREAM_BATCH_SIZE", 500))
+EXPENSES_BULK_MAX_IDS = int(os.getenv("EXPENSES_BULK_MAX_IDS", 10_000))
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 5000))
+
+# Importação em lote
+IMPORT_COPY_BATCH_SIZE = int(os.getenv("IMPORT_COPY_BATCH_SIZE", 5000))
+IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", 200_000))
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", 1000))
+
+# Previsão de gastos (Prophet)
+FORECAST_WORKERS = int(os.getenv("FORECAST_WORKERS", 1))
+FORECAST_MAX_PENDING = int(os.getenv("FORECAST_MAX_PENDING", 4))
+FORECAST_QUEUE_TIMEOUT = float(os.getenv("FORECAST_QUEUE_TIMEOUT", 2))
+FORECAST_CACHE_SIZE = int(os.getenv("FORECAST_CACHE_SIZE", 256))
+FORECAST_MIN_MONTHS = int(os.getenv("FORECAST_MIN_MONTHS", 6))
+FORECAST_MAX_MONTHS = int(os.getenv("FORECAST_MAX_MONTHS", 24))
+
+# Detecção de anomalias e duplicatas (worker em lote)
+ANOMALY_BATCH_SIZE = int(os.getenv("ANOMALY_BATCH_SIZE", 500))
+ANOMALY_POLL_SECONDS = float(os.getenv("ANOMALY_POLL_SECONDS", 5))
+ANOMALY_MODEL_CACHE_SIZE = int(os.getenv("ANOMALY_MODEL_CACHE_SIZE", 1000))
+ANOMALY_MODEL_TTL_SECONDS = int(os.getenv("ANOMALY_MODEL_TTL_SECONDS", 3600))
+ANOMALY_MIN_SAMPLES = int(os.getenv("ANOMALY_MIN_SAMPLES", 30))
+ANOMALY_CONTAMINATION = float(os.getenv("ANOMALY_CONTAMINATION", 0.01))
+ANOMALY_TRAINING_DAYS = int(os.getenv("ANOMALY_TRAINING_DAYS", 365))
+
+# Sugestão de tag e categoria (classificador de texto por workspace)
+SUGGEST_CACHE_SIZE = int(os.getenv("SUGGEST_CACHE_SIZE", 500))
+SUGGEST_MODEL_TTL_SECONDS = int(os.getenv("SUGGEST_MODEL_TTL_SECONDS", 24 * 3600))
+SUGGEST_CHECK_SECONDS = float(os.getenv("SUGGEST_CHECK_SECONDS", 60))
+SUGGEST_RETRAIN_MIN_NEW_ROWS = int(os.getenv("SUGGEST_RETRAIN_MIN_NEW_ROWS", 50))
+SUGGEST_MIN_ROWS = int(os.getenv("SUGGEST_MIN_ROWS", 20))
+SUGGEST_TRAINING_ROWS = int(os.getenv("SUGGEST_TRAINING_ROWS", 20_000))
+SUGGEST_TRAIN_WORKERS = int(os.getenv("SUGGEST_TRAIN_WORKERS", 1))
+
+# Backend dos caches compartilhados (acesso a workspaces, versões das
+# respostas): "memory" (um por processo) ou "redis" (comum a todos os workers)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_KEY_PREFIX = os.getenv("REDIS_KEY_PREFIX", "expensely")
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 0.5))
+# Após N falhas seguidas o Redis é ignorado por alguns segundos (circuit breaker)
+REDIS_BREAKER_FAILURES = int(os.getenv("REDIS_BREAKER_FAILURES", 3))
+REDIS_BREAKER_RESET_SECONDS = float(os.getenv("REDIS_BREAKER_RESET_SECONDS", 5))
+
+MEMBERSHIP_CACHE_SIZE = int(os.getenv("MEMBERSHIP_CACHE_SIZE", 10_000))
+MEMBERSHIP_CACHE_TTL_SECONDS = int(os.getenv("MEMBERSHIP_CACHE_TTL_SECONDS", 60))
+
+# Cache de respostas (ETag / GET condicional). Com o backend em memória as
+# versões expiram após o TTL, o que limita por quanto tempo um worker pode
+# servir dados antigos.
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 10_000))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 60))
+
+# Token exigido (header X-Metrics-Token) nas rotas /metrics; sem ele as rotas
+# ficam desativadas
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
 if not SECRET_KEY:
     raise ValueError("SECRET_KEY não está definida no .env")
 if not BREVO_API_KEY:
@@ -2,17 +2,70 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 from dotenv import load_dotenv
+from app.config import (
+    DB_MODE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_TIMEOUT_MS,
+)
+from app.utils.pool_metrics import TimedAsyncQueuePool, TimedQueuePool
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
+connect_args = {}
+if DB_STATEMENT_TIMEOUT_MS:
+    connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+
+engine = create_engine(
+    DATABASE_URL, poolclass=TimedQueuePool, connect_args=connect_args, **POOL_OPTIONS
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Engine assíncrono (asyncpg), criado apenas quando DB_MODE=async
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    ASYNC_DATABASE_URL = os.getenv(
+        "ASYNC_DATABASE_URL",
+        DATABASE_URL.replace("postgresql+psycopg2://", "postgresql://", 1).replace(
+            "postgresql://", "postgresql+asyncpg://", 1
+        ),
+    )
+    async_connect_args = {}
+    if DB_STATEMENT_TIMEOUT_MS:
+        async_connect_args["server_settings"] = {
+            "statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)
+        }
+
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=TimedAsyncQueuePool,
+        connect_args=async_connect_args,
+        **POOL_OPTIONS,
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
 
 def get_db():
     db = SessionLocal()
@@ -20,3 +73,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
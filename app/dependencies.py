@@ -1,37 +1,132 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.user_model import User
+from app.models.loading import IDENTITY_ONLY, user_load_options
 from app.schemas.schemas import TokenData
-from app.config import SECRET_KEY, ALGORITHM
-from app.database import get_db
+from app.auth.token_cache import decode_token
+from app.auth.tokens import ACCESS, TokenClaims, TokenError, check_not_revoked
+from app.config import METRICS_TOKEN
+from app.database import get_async_db, get_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login", auto_error=True)
 
 
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Não foi possível validar as credenciais.",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+def _claims_from_token(token: str) -> TokenClaims:
+    try:
+        return decode_token(token, expected_types=[ACCESS])
+    except TokenError:
+        raise credentials_exception
+
+
+def _check_revocation(claims: TokenClaims, tokens_valid_after) -> None:
+    try:
+        check_not_revoked(claims, tokens_valid_after)
+    except TokenError:
+        raise credentials_exception
+
+
+def _valid_after_query(user_id: str):
+    return select(User.tokens_valid_after).where(User.id == user_id)
+
+
+def get_current_user_id(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> str:
+    """Valida o token e a revogação lendo só users.tokens_valid_after
+    (rotas servidas do cache de respostas)."""
+    claims = _claims_from_token(token)
+    row = db.execute(_valid_after_query(claims.sub)).first()
+    if row is None:
+        raise credentials_exception
+    _check_revocation(claims, row.tokens_valid_after)
+    return claims.sub
+
+
+async def get_current_user_id_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> str:
+    claims = _claims_from_token(token)
+    row = (await db.execute(_valid_after_query(claims.sub))).first()
+    if row is None:
+        raise credentials_exception
+    _check_revocation(claims, row.tokens_valid_after)
+    return claims.sub
+
+
+def _load_current_user(token: str, db: Session, profile: str) -> User:
+    claims = _claims_from_token(token)
+    user = (
+        db.query(User)
+        .options(*user_load_options(profile))
+        .filter(User.id == claims.sub)
+        .first()
+    )
+
+    if user is None:
+        raise credentials_exception
+
+    _check_revocation(claims, user.tokens_valid_after)
+    return user
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
 ) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Não foi possível validar as credenciais.",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    return _load_current_user(token, db, IDENTITY_ONLY)
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
-        user_id = payload.get("sub")  
-        if user_id is None:
-            raise credentials_exception
+def get_current_user_with(profile: str):
+    """Dependência que carrega o usuário autenticado com outro perfil."""
 
-    except JWTError:
-        raise credentials_exception
+    def dependency(
+        token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    ) -> User:
+        return _load_current_user(token, db, profile)
 
-    user = db.query(User).filter(User.id == user_id).first()
+    return dependency
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> User:
+    claims = _claims_from_token(token)
+    result = await db.execute(
+        select(User)
+        .options(*user_load_options(IDENTITY_ONLY))
+        .where(User.id == claims.sub)
+    )
+    user = result.scalars().first()
 
     if user is None:
         raise credentials_exception
 
+    _check_revocation(claims, user.tokens_valid_after)
     return user
+
+
+def require_metrics_token(
+    x_metrics_token: Optional[str] = Header(None, alias="X-Metrics-Token")
+) -> None:
+    """Protege as rotas de métricas, lidas por monitoramento e não por usuários."""
+    if not METRICS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Métricas desativadas."
+        )
+    if not x_metrics_token or not hmac.compare_digest(
+        x_metrics_token.encode(), METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Token de métricas inválido."
+        )
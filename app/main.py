@@ -1,19 +1,27 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.config import DB_MODE
+
 # Importa suas rotas organizadas por domínio
-from app.routes import (
-    user_routes,
-    auth_routes,
-    workspaces_routes,
-    expenses_routes,
-    tags_routes,
-)
+from app.routes import user_routes, auth_routes, metrics_routes, analytics_routes
+
+# Despesas, tags e workspaces têm versão síncrona e assíncrona (DB_MODE)
+if DB_MODE == "async":
+    from app.routes import (
+        async_workspaces_routes as workspaces_routes,
+        async_expenses_routes as expenses_routes,
+        async_tags_routes as tags_routes,
+    )
+else:
+    from app.routes import workspaces_routes, expenses_routes, tags_routes
 
 app = FastAPI(
     title="Expensely API",
     version="1.0.0",
     description="Backend da aplicação Expensely.",
+    default_response_class=ORJSONResponse,
 )
 
 origins = [
@@ -36,6 +44,8 @@ app.include_router(
 )
 app.include_router(expenses_routes.router, prefix="/api", tags=["Despesas"])
 app.include_router(tags_routes.router, prefix="/api", tags=["Tags"])
+app.include_router(analytics_routes.router, prefix="/api", tags=["Análises"])
+app.include_router(metrics_routes.router, prefix="/api", tags=["Métricas"])
 
 # Endpoint raiz
 @app.get("/")
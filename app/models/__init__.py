@@ -1,4 +1,9 @@
 from .user_model import User
 from .workspace_model import Workspace, workspace_users
 from .expense_model import Expense
-from .tag_model import Tag
\ No newline at end of file
+from .tag_model import Tag
+from .expense_rollup_model import ExpenseMonthlyRollup
+from .refresh_token_model import RefreshToken
+from .email_outbox_model import EmailOutbox
+from .expense_flag_model import ExpenseFlag
+from .expense_scan_queue_model import ExpenseScanQueue
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON, Index
+from datetime import datetime
+from app.database import Base
+
+
+class EmailOutbox(Base):
+    """E-mails transacionais aguardando envio pelo worker."""
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Fila: pendentes por horário da próxima tentativa
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(String, primary_key=True)
+    payload = Column(JSON, nullable=False)  # corpo da API de e-mail (Brevo)
+    status = Column(String, nullable=False, default="pending")  # pending/sending/sent/dead
+    attempts = Column(Integer, nullable=False, default=0)
+    # Próxima tentativa; em "sending", fim da reserva do worker
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Float, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from app.database import Base
+
+
+class ExpenseFlag(Base):
+    """Despesa marcada pelo detector: valor atípico ou possível duplicata."""
+
+    __tablename__ = "expense_flags"
+    __table_args__ = (
+        Index("ix_expense_flags_workspace_id_created_at", "workspace_id", "created_at"),
+    )
+
+    expense_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("expenses.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    kind = Column(String, primary_key=True)  # outlier/duplicate
+    workspace_id = Column(String, nullable=False)
+    score = Column(Float, nullable=True)
+    detail = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
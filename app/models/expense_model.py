@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -8,6 +8,11 @@ from app.database import Base
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        # Listagem por workspace + período, ordenada por (date, id)
+        Index("ix_expenses_workspace_id_date", "workspace_id", "date", "id"),
+        Index("ix_expenses_workspace_id_user_id", "workspace_id", "user_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=True)
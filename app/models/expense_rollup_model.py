@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Float, Integer
+from app.database import Base
+
+
+class ExpenseMonthlyRollup(Base):
+    """Totais de despesas por workspace/mês/categoria/usuário.
+
+    Mantida incrementalmente pelo expenses_service; pode ser recalculada
+    do zero com `python -m app.scripts.rebuild_rollup`.
+    """
+
+    __tablename__ = "expense_monthly_rollup"
+
+    workspace_id = Column(String, primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    category_id = Column(String, primary_key=True, default="")  # "" = sem categoria
+    user_id = Column(String, primary_key=True)
+
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from app.database import Base
+
+
+class ExpenseScanQueue(Base):
+    """Despesas novas aguardando análise pelo worker de anomalias."""
+
+    __tablename__ = "expense_scan_queue"
+
+    expense_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("expenses.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    workspace_id = Column(String, nullable=False)
+    enqueued_at = Column(DateTime, default=datetime.utcnow, index=True)
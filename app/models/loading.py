@@ -0,0 +1,41 @@
+from sqlalchemy.orm import joinedload, lazyload, load_only, selectinload
+from app.models.user_model import User
+from app.models.workspace_model import Workspace
+
+# Perfis de carregamento do usuário. Os relacionamentos do modelo são
+# "joined" por padrão, então cada consulta deve escolher explicitamente
+# quanto do grafo precisa.
+IDENTITY_ONLY = "identity-only"
+MEMBERSHIP = "membership"
+FULL = "full"
+
+
+def user_load_options(profile: str = IDENTITY_ONLY) -> list:
+    if profile == IDENTITY_ONLY:
+        # Apenas a linha da tabela users, sem nenhum relacionamento
+        return [lazyload("*")]
+
+    if profile == MEMBERSHIP:
+        # Usuário + workspaces dos quais participa, sem despesas nem tags
+        return [
+            lazyload("*"),
+            selectinload(User.workspaces)
+            .load_only(
+                Workspace.id,
+                Workspace.name,
+                Workspace.color,
+                Workspace.icon,
+                Workspace.type,
+                Workspace.user_id,
+            )
+            .lazyload("*"),
+        ]
+
+    if profile == FULL:
+        return [
+            joinedload(User.workspaces),
+            joinedload(User.expenses),
+            joinedload(User.tags),
+        ]
+
+    raise ValueError(f"Perfil de carregamento desconhecido: {profile}")
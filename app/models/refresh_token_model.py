@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey
+from app.database import Base
+
+
+class RefreshToken(Base):
+    """Refresh tokens emitidos, identificados pelo hash do `jti`.
+
+    Sem relacionamentos: a rotação resolve tudo por chave primária.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    token_hash = Column(String(64), primary_key=True)
+    family_id = Column(String, nullable=False, index=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    used_at = Column(DateTime, nullable=True)
+    revoked = Column(Boolean, nullable=False, default=False)
@@ -11,7 +11,7 @@ class Tag(Base):
     color = Column(String, nullable=True)
 
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    workspace_id = Column(String, ForeignKey("workspaces.id"), nullable=False)
+    workspace_id = Column(String, ForeignKey("workspaces.id"), nullable=False, index=True)
 
     user = relationship("User", back_populates="tags")
     workspace = relationship("Workspace", back_populates="tags")
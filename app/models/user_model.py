@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Float, Date
+from sqlalchemy import Column, String, Float, Date, DateTime
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -16,6 +16,8 @@ class User(Base):
     gender = Column(String, nullable=True)
     birthdate = Column(Date, nullable=True)
     income = Column(Float, nullable=True)
+    # Tokens emitidos antes deste instante (UTC) estão revogados
+    tokens_valid_after = Column(DateTime, nullable=True)
 
     # Relacionamentos
     owned_workspaces = relationship(
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Table, JSON
+from sqlalchemy import Column, String, ForeignKey, Table, JSON, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -8,6 +8,8 @@ workspace_users = Table(
     Base.metadata,
     Column("workspace_id", String, ForeignKey("workspaces.id"), primary_key=True),
     Column("user_id", String, ForeignKey("users.id"), primary_key=True),
+    # A PK começa por workspace_id; buscas por usuário precisam do próprio índice
+    Index("ix_workspace_users_user_id", "user_id"),
 )
 
 class Workspace(Base):
@@ -19,7 +21,7 @@ class Workspace(Base):
     icon = Column(String, nullable=True)        # Novo campo icon
     type = Column(JSON, nullable=False)         # Agora aceita JSON
 
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)  # dono workspace
+    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)  # dono workspace
 
     # Relacionamentos
     owner = relationship(
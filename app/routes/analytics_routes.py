@@ -0,0 +1,136 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from sqlalchemy.orm import Session
+from app.config import FORECAST_MAX_MONTHS
+from app.dependencies import get_current_user, get_db
+from app.schemas.analytics_schema import (
+    BreakdownItem,
+    ExpenseFlagOut,
+    ExpenseForecast,
+    ExpenseSuggestions,
+    TrendPoint,
+    WorkspaceAnalytics,
+)
+from app.services.analytics_service import (
+    get_breakdown,
+    get_monthly_trend,
+    get_workspace_analytics,
+)
+from app.services.anomaly_service import list_expense_flags
+from app.services.forecast_service import get_expense_forecast
+from app.services.suggestion_service import suggest_tag_and_category
+
+# Rotas síncronas nos dois DB_MODEs: o trabalho é CPU (pandas) e roda no threadpool
+router = APIRouter(prefix="/analytics")
+
+
+@router.get("/{workspace_id}", response_model=WorkspaceAnalytics)
+def workspace_analytics(
+    workspace_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    window: int = Query(3, ge=1, le=24),
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        return get_workspace_analytics(
+            workspace_id, user_id=user.id, db=db, start=start, end=end, window=window
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{workspace_id}/breakdown/{dimension}", response_model=List[BreakdownItem])
+def workspace_breakdown(
+    workspace_id: str,
+    dimension: str = Path(..., pattern="^(category|tag|user|weekday)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        return get_breakdown(
+            workspace_id, dimension, user_id=user.id, db=db, start=start, end=end
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{workspace_id}/trend", response_model=List[TrendPoint])
+def workspace_trend(
+    workspace_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    window: int = Query(3, ge=1, le=24),
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        return get_monthly_trend(
+            workspace_id, user_id=user.id, db=db, start=start, end=end, window=window
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{workspace_id}/forecast", response_model=ExpenseForecast)
+def workspace_forecast(
+    workspace_id: str,
+    category_id: Optional[str] = None,
+    months: int = Query(6, ge=1, le=FORECAST_MAX_MONTHS),
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        return get_expense_forecast(
+            workspace_id,
+            user_id=user.id,
+            db=db,
+            category_id=category_id,
+            months=months,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{workspace_id}/flags", response_model=List[ExpenseFlagOut])
+def workspace_flags(
+    workspace_id: str,
+    kind: Optional[str] = Query(None, pattern="^(outlier|duplicate)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        return list_expense_flags(
+            workspace_id, user_id=user.id, db=db, kind=kind, limit=limit
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{workspace_id}/suggestions", response_model=ExpenseSuggestions)
+def expense_suggestions(
+    workspace_id: str,
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    limit: int = Query(3, ge=1, le=10),
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        return suggest_tag_and_category(
+            workspace_id,
+            user_id=user.id,
+            db=db,
+            name=name,
+            description=description,
+            limit=limit,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,205 @@
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import SessionLocal, get_async_db
+from app.dependencies import get_current_user_async, get_current_user_id_async
+from app.schemas.expense_schema import (
+    AnnualExpenseSummary,
+    ExpenseBulkDelete,
+    ExpenseBulkResult,
+    ExpenseBulkUpdate,
+    ExpenseCreate,
+    Expense,
+    ExpenseImportResult,
+    ExpensePage,
+)
+from app.services import async_expenses_service as expenses_service
+from app.services.async_workspaces_service import user_has_access_to_workspace
+from app.services.expense_export_service import MEDIA_TYPES, export_expense_rows
+from app.services.expense_import_service import detect_format, import_expenses
+from app.services.expenses_service import ndjson_expense_rows
+from app.utils.http_cache import async_cached_response, workspace_scope
+
+router = APIRouter()
+
+
+@router.post("/", response_model=Expense)
+async def create_expense(
+    expense: ExpenseCreate,
+    user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await expenses_service.create_expense_service(expense, user.id, db)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _import_with_own_session(**kwargs) -> ExpenseImportResult:
+    # COPY usa o driver síncrono (psycopg2); roda no threadpool
+    db = SessionLocal()
+    try:
+        return import_expenses(db=db, **kwargs)
+    finally:
+        db.close()
+
+
+@router.post("/import/{workspace_id}", response_model=ExpenseImportResult)
+async def import_expenses_file(
+    workspace_id: str,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ofx|jsonl)$"),
+    encoding: str = "utf-8-sig",
+    atomic: bool = False,
+    user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        if not await user_has_access_to_workspace(user.id, workspace_id, db):
+            raise Exception("Usuário não tem acesso a este workspace.")
+        return await run_in_threadpool(
+            _import_with_own_session,
+            workspace_id=workspace_id,
+            user_id=user.id,
+            file=file.file,
+            fmt=detect_format(file.filename, format),
+            encoding=encoding,
+            atomic=atomic,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/bulk-update", response_model=ExpenseBulkResult)
+async def bulk_update(
+    data: ExpenseBulkUpdate,
+    user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await expenses_service.bulk_update_expenses(data, user.id, db)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/bulk-delete", response_model=ExpenseBulkResult)
+async def bulk_delete(
+    data: ExpenseBulkDelete,
+    user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await expenses_service.bulk_delete_expenses(data, user.id, db)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/export/{workspace_id}")
+async def export_expenses(
+    workspace_id: str,
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if not await user_has_access_to_workspace(user.id, workspace_id, db):
+        raise HTTPException(
+            status_code=400, detail="Usuário não tem acesso a este workspace."
+        )
+
+    # O gerador é síncrono; o Starlette o consome no threadpool
+    return StreamingResponse(
+        export_expense_rows(workspace_id, fmt=format, start=start, end=end),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="expenses.{format}"'
+        },
+    )
+
+
+@router.get("/{workspace_id}", response_model=ExpensePage)
+async def list_expenses(
+    request: Request,
+    workspace_id: str,
+    month: Optional[int] = None,
+    year: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    stream: bool = False,
+    user_id: str = Depends(get_current_user_id_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        if stream:
+            if not await user_has_access_to_workspace(user_id, workspace_id, db):
+                raise Exception("Usuário não tem acesso a este workspace.")
+            # O gerador é síncrono; o Starlette o consome no threadpool
+            rows = ndjson_expense_rows(workspace_id, month=month, year=year)
+            return StreamingResponse(rows, media_type="application/x-ndjson")
+
+        return await async_cached_response(
+            request,
+            user_id,
+            [workspace_scope(workspace_id)],
+            lambda: expenses_service.get_expenses_by_workspace(
+                workspace_id,
+                user_id=user_id,
+                month=month,
+                year=year,
+                cursor=cursor,
+                limit=limit,
+                db=db,
+            ),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.delete("/{expense_id}")
+async def remove_expense(
+    expense_id: str,
+    user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await expenses_service.delete_expense(expense_id, user.id, db)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.put("/{expense_id}", response_model=Expense)
+async def edit_expense(
+    expense_id: str,
+    expense: ExpenseCreate,
+    user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await expenses_service.update_expense(expense_id, expense, user.id, db)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/annual/{workspace_id}/{year}", response_model=AnnualExpenseSummary)
+async def get_annual_summary(
+    request: Request,
+    workspace_id: str,
+    year: int,
+    user_id: str = Depends(get_current_user_id_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await async_cached_response(
+            request,
+            user_id,
+            [workspace_scope(workspace_id)],
+            lambda: expenses_service.get_annual_expense_summary(
+                workspace_id=workspace_id, user_id=user_id, year=year, db=db
+            ),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
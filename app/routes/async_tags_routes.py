@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.database import get_async_db
+from app.dependencies import get_current_user_async, get_current_user_id_async
+from app.schemas.tag_schema import TagCreate, Tag
+from app.services import async_tags_service as tags_service
+from app.utils.http_cache import async_cached_response, workspace_scope
+
+router = APIRouter()
+
+
+@router.post("/", response_model=Tag)
+async def create_tag(
+    tag: TagCreate,
+    user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await tags_service.create_tag_service(tag, user_id=user.id, db=db)
+
+
+@router.get("/{workspace_id}", response_model=List[Tag])
+async def list_tags(
+    request: Request,
+    workspace_id: str,
+    user_id: str = Depends(get_current_user_id_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await async_cached_response(
+        request,
+        user_id,
+        [workspace_scope(workspace_id)],
+        lambda: tags_service.get_tags_by_workspace(workspace_id, user_id=user_id, db=db),
+    )
+
+
+@router.delete("/{tag_id}")
+async def delete_tag(
+    tag_id: str,
+    user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await tags_service.delete_tag(tag_id=tag_id, user_id=user.id, db=db)
+
+
+@router.put("/{tag_id}", response_model=Tag)
+async def update_tag(
+    tag_id: str,
+    tag: TagCreate,
+    user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await tags_service.update_tag_service(
+        tag_id=tag_id, tag_data=tag, user_id=user.id, db=db
+    )
@@ -0,0 +1,98 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.tokens import INVITE, TokenError, decode_token
+from app.database import get_async_db
+from app.dependencies import get_current_user_async, get_current_user_id_async
+from app.models import User as UserModel
+from app.schemas.workspace_schema import WorkspaceCreate, WorkspaceUpdate, Workspace
+from app.services import async_workspaces_service as workspaces_service
+from app.utils.http_cache import async_cached_response, user_scope, workspace_scope
+
+router = APIRouter(prefix="/workspaces", tags=["Workspaces"])
+
+
+@router.get("", response_model=list[Workspace])
+async def list_workspaces(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id_async),
+):
+    # Depende da lista de membros do usuário e de cada workspace listado
+    return await async_cached_response(
+        request,
+        user_id,
+        [user_scope(user_id)],
+        lambda: workspaces_service.list_user_workspaces(user_id, db),
+        more_scopes=lambda workspaces: [workspace_scope(w.id) for w in workspaces],
+    )
+
+
+@router.post("", response_model=Workspace, status_code=status.HTTP_201_CREATED)
+async def create_workspace(
+    data: WorkspaceCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user_async),
+):
+    return await workspaces_service.create_workspace(data, current_user, db)
+
+
+@router.put("/{workspace_id}", response_model=Workspace)
+async def update_workspace(
+    workspace_id: str,
+    data: WorkspaceUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user_async),
+):
+    return await workspaces_service.update_workspace(
+        workspace_id, data, current_user, db
+    )
+
+
+@router.delete("/{workspace_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_workspace(
+    workspace_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user_async),
+):
+    await workspaces_service.delete_workspace(workspace_id, current_user, db)
+
+
+@router.post("/{workspace_id}/invite")
+async def invite_user(
+    workspace_id: str,
+    email: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user_async),
+):
+    workspace = await workspaces_service.get_workspace_by_id(workspace_id, db)
+    if workspace.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Apenas o dono pode enviar convites")
+
+    await workspaces_service.send_workspace_invite_email(
+        db,
+        email=email,
+        workspace_id=workspace_id,
+        workspace_name=workspace.name,
+        frontend_host="http://localhost:3000",
+    )
+    return {"message": f"Convite enviado para {email}"}
+
+
+@router.post("/accept-invite/{token}")
+async def accept_workspace_invite(token: str, db: AsyncSession = Depends(get_async_db)):
+    try:
+        claims = decode_token(token, expected_types=[INVITE])
+    except TokenError:
+        raise HTTPException(status_code=400, detail="Token inválido ou expirado")
+    email = claims.sub
+    workspace_id = claims.extra.get("workspace_id")
+
+    result = await db.execute(select(UserModel.id).where(UserModel.email == email))
+    user_id = result.scalar()
+    if not user_id:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+
+    await workspaces_service.add_user_to_workspace(user_id, workspace_id, db)
+    return {"message": f"{email} adicionado ao workspace com sucesso"}
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
+from app.auth.tokens import jwks
 from app.database import get_db
+from app.dependencies import get_current_user
 from app.models.auth_model import AuthLogin
 from app.services import auth_service
 
@@ -12,4 +14,14 @@ def login(auth_data: AuthLogin, db: Session = Depends(get_db)):
 
 @router.post("/refresh-token")
 def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
-    return auth_service.refresh_access_token(db, refresh_token)
\ No newline at end of file
+    return auth_service.refresh_access_token(db, refresh_token)
+
+
+@router.post("/logout")
+def logout(user=Depends(get_current_user), db: Session = Depends(get_db)):
+    return auth_service.logout_user(db, user.id)
+
+
+@router.get("/.well-known/jwks.json")
+def public_keys():
+    return jwks()
@@ -1,15 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse
+from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from app.schemas.expense_schema import AnnualExpenseSummary, ExpenseCreate, Expense
+from app.schemas.expense_schema import (
+    AnnualExpenseSummary,
+    ExpenseBulkDelete,
+    ExpenseBulkResult,
+    ExpenseBulkUpdate,
+    ExpenseCreate,
+    Expense,
+    ExpenseImportResult,
+    ExpensePage,
+)
+from app.services.expense_export_service import (
+    MEDIA_TYPES,
+    export_workspace_expenses,
+)
+from app.services.expense_import_service import detect_format, import_expenses
 from app.services.expenses_service import (
+    bulk_delete_expenses,
+    bulk_update_expenses,
     create_expense_service,
     get_annual_expense_summary,
     get_expenses_by_workspace,
+    stream_workspace_expenses,
     delete_expense,
     update_expense,
 )
-from app.dependencies import get_current_user, get_db
+from app.dependencies import get_current_user, get_current_user_id, get_db
+from app.utils.http_cache import cached_response, workspace_scope
 
 router = APIRouter()
 
@@ -21,22 +41,116 @@ def create_expense(
     db: Session = Depends(get_db),
 ):
     try:
-        return create_expense_service(expense, user["id"], db)
+        return create_expense_service(expense, user.id, db)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/import/{workspace_id}", response_model=ExpenseImportResult)
+def import_expenses_file(
+    workspace_id: str,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ofx|jsonl)$"),
+    encoding: str = "utf-8-sig",
+    atomic: bool = False,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        return import_expenses(
+            workspace_id,
+            user_id=user.id,
+            file=file.file,
+            fmt=detect_format(file.filename, format),
+            encoding=encoding,
+            atomic=atomic,
+            db=db,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/bulk-update", response_model=ExpenseBulkResult)
+def bulk_update(
+    data: ExpenseBulkUpdate,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        return bulk_update_expenses(data, user.id, db)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{workspace_id}", response_model=List[Expense])
+@router.post("/bulk-delete", response_model=ExpenseBulkResult)
+def bulk_delete(
+    data: ExpenseBulkDelete,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        return bulk_delete_expenses(data, user.id, db)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/export/{workspace_id}")
+def export_expenses(
+    workspace_id: str,
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        chunks = export_workspace_expenses(
+            workspace_id, user_id=user.id, db=db, fmt=format, start=start, end=end
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="expenses.{format}"'
+        },
+    )
+
+
+@router.get("/{workspace_id}", response_model=ExpensePage)
 def list_expenses(
+    request: Request,
     workspace_id: str,
     month: Optional[int] = None,
     year: Optional[int] = None,
-    user_data: dict = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    stream: bool = False,
+    user_id: str = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     try:
-        return get_expenses_by_workspace(
-            workspace_id, user_id=user_data["id"], month=month, year=year, db=db
+        if stream:
+            rows = stream_workspace_expenses(
+                workspace_id, user_id=user_id, month=month, year=year, db=db
+            )
+            return StreamingResponse(rows, media_type="application/x-ndjson")
+
+        return cached_response(
+            request,
+            user_id,
+            [workspace_scope(workspace_id)],
+            lambda: get_expenses_by_workspace(
+                workspace_id,
+                user_id=user_id,
+                month=month,
+                year=year,
+                cursor=cursor,
+                limit=limit,
+                db=db,
+            ),
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -47,7 +161,7 @@ def remove_expense(
     expense_id: str, user=Depends(get_current_user), db: Session = Depends(get_db)
 ):
     try:
-        return delete_expense(expense_id, user["id"], db)
+        return delete_expense(expense_id, user.id, db)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -60,21 +174,27 @@ def edit_expense(
     db: Session = Depends(get_db),
 ):
     try:
-        return update_expense(expense_id, expense, user["id"], db)
+        return update_expense(expense_id, expense, user.id, db)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/annual/{workspace_id}/{year}", response_model=AnnualExpenseSummary)
 def get_annual_summary(
+    request: Request,
     workspace_id: str,
     year: int,
-    user_data: dict = Depends(get_current_user),
+    user_id: str = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     try:
-        return get_annual_expense_summary(
-            workspace_id=workspace_id, user_id=user_data["id"], year=year, db=db
+        return cached_response(
+            request,
+            user_id,
+            [workspace_scope(workspace_id)],
+            lambda: get_annual_expense_summary(
+                workspace_id=workspace_id, user_id=user_id, year=year, db=db
+            ),
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends
+from app.auth.hashing import hashing_stats
+from app.auth.token_cache import token_cache_stats
+from app.database import async_engine, engine
+from app.dependencies import require_metrics_token
+from app.services.forecast_service import forecast_cache_stats
+from app.services.suggestion_service import suggestion_stats
+from app.services.workspaces_service import membership_cache_stats
+from app.utils.http_cache import response_cache_stats
+from app.utils.http_client import clients_stats
+from app.utils.pool_metrics import pool_stats
+
+router = APIRouter(prefix="/metrics", dependencies=[Depends(require_metrics_token)])
+
+
+@router.get("/db-pool")
+def db_pool_metrics():
+    metrics = {"sync": pool_stats(engine.pool)}
+    if async_engine is not None:
+        metrics["async"] = pool_stats(async_engine.pool)
+    return metrics
+
+
+@router.get("/caches")
+def cache_metrics():
+    return {
+        "membership": membership_cache_stats(),
+        "jwt_claims": token_cache_stats(),
+        "forecasts": forecast_cache_stats(),
+        "responses": response_cache_stats(),
+    }
+
+
+@router.get("/password-hashing")
+def password_hashing_metrics():
+    return hashing_stats()
+
+
+@router.get("/http-clients")
+def http_client_metrics():
+    return clients_stats()
+
+
+@router.get("/suggestions")
+def suggestion_metrics():
+    return suggestion_stats()
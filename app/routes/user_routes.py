@@ -2,10 +2,10 @@ from fastapi import APIRouter, Body, Depends, HTTPException, Request
 from typing import Dict, List
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
 
+from app.auth.token_cache import decode_token
+from app.auth.tokens import ACCESS, RESET, TokenError, check_not_revoked
 from app.database import get_db
-from app.config import SECRET_KEY, ALGORITHM
 from app.dependencies import get_current_user
 from app.models.user_model import User
 from app.schemas.user_schema import UserCreate, UserOut, PasswordChange
@@ -58,12 +58,14 @@ def change_password(body: Dict = Body(...), db: Session = Depends(get_db)):
         )
 
     # Decodifica o token para pegar o user_id
+    # Aceita o token de acesso ou o do link de redefinição de senha
+    # O link de redefinição deixa de valer depois da troca (tokens_valid_after)
     try:
-        payload = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")  # UUID string, não usar int()
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Token inválido")
-    except JWTError:
+        claims = decode_token(access_token, expected_types=[ACCESS, RESET])
+        user = users_service.get_user_by_id(db, claims.sub)
+        check_not_revoked(claims, user.tokens_valid_after)
+        user_id = user.id
+    except TokenError:
         raise HTTPException(status_code=401, detail="Token inválido")
 
     return users_service.change_password(db, user_id, new_password)
@@ -81,7 +83,7 @@ def send_password_reset_request(
     if not frontend_host:
         raise HTTPException(status_code=400, detail="Host do frontend não informado")
 
-    users_service.send_reset_email(user, frontend_host)
+    users_service.send_reset_email(db, user, frontend_host)
     return {"message": "E-mail de redefinição enviado com sucesso!"}
 
 
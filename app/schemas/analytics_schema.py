@@ -0,0 +1,75 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+# Total gasto por categoria, tag, usuário ou dia da semana
+class BreakdownItem(BaseModel):
+    key: Optional[str] = None
+    label: str
+    total: float
+    count: int
+    share: float
+
+
+# Total mensal com média móvel e variação em relação ao mês anterior
+class TrendPoint(BaseModel):
+    month: str
+    total: float
+    count: int
+    movingAverage: float
+    delta: Optional[float] = None
+    deltaPct: Optional[float] = None
+
+
+class WorkspaceAnalytics(BaseModel):
+    total: float
+    count: int
+    byCategory: List[BreakdownItem]
+    byTag: List[BreakdownItem]
+    byUser: List[BreakdownItem]
+    byWeekday: List[BreakdownItem]
+    trend: List[TrendPoint]
+
+
+# Previsão mensal de gastos (com intervalo de incerteza)
+class ForecastPoint(BaseModel):
+    month: str
+    value: float
+    lower: float
+    upper: float
+
+
+class ExpenseForecast(BaseModel):
+    workspaceId: str
+    categoryId: Optional[str] = None
+    historyMonths: int
+    points: List[ForecastPoint]
+
+
+# Despesa marcada pelo detector (valor atípico ou possível duplicata)
+class ExpenseFlagOut(BaseModel):
+    expenseId: str
+    kind: str
+    score: Optional[float] = None
+    detail: Optional[Dict] = None
+    createdAt: datetime
+    name: Optional[str] = None
+    value: Optional[float] = None
+    date: Optional[datetime] = None
+
+
+# Sugestões de tag e categoria para uma nova despesa
+class TagSuggestion(BaseModel):
+    tagId: str
+    confidence: float
+
+
+class CategorySuggestion(BaseModel):
+    category: Dict
+    confidence: float
+
+
+class ExpenseSuggestions(BaseModel):
+    tags: List[TagSuggestion]
+    categories: List[CategorySuggestion]
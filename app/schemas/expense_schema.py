@@ -1,6 +1,22 @@
-from pydantic import BaseModel, RootModel
-from typing import Optional, List, Dict
+from pydantic import (
+    AliasChoices,
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Field,
+    RootModel,
+)
+from typing import Annotated, Optional, List, Dict
 from datetime import datetime
+from uuid import UUID
+
+
+def _id_to_str(value):
+    return str(value) if isinstance(value, UUID) else value
+
+
+# IDs das colunas UUID chegam como uuid.UUID ao validar a partir do ORM
+IdStr = Annotated[str, BeforeValidator(_id_to_str)]
 
 
 # Schema para criação de uma nova despesa
@@ -16,22 +32,104 @@ class ExpenseCreate(BaseModel):
     workspaceId: str
 
 
-# Schema de resposta de uma despesa
+# Tag resumida embutida na despesa
+class ExpenseTag(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: IdStr
+    name: str
+    color: Optional[str] = None
+
+
+# Schema de resposta de uma despesa; valida direto da linha do ORM
+# (Expense.model_validate(expense)), aceitando os nomes das colunas
 class Expense(BaseModel):
-    id: str
+    model_config = ConfigDict(from_attributes=True)
+
+    id: IdStr
     name: Optional[str] = None
     value: Optional[float] = None
     category: Optional[Dict] = None
-    tagId: Optional[str] = None
-    tag: Optional[Dict] = None
+    tagId: Optional[IdStr] = Field(
+        None, validation_alias=AliasChoices("tagId", "tag_id")
+    )
+    tag: Optional[ExpenseTag] = None
     date: Optional[datetime] = None
-    userId: Optional[str] = None
+    userId: Optional[IdStr] = Field(
+        None, validation_alias=AliasChoices("userId", "user_id")
+    )
     description: str
     color: str
+    workspaceId: IdStr = Field(
+        validation_alias=AliasChoices("workspaceId", "workspace_id")
+    )
+
+
+# Página de despesas (paginação por cursor)
+class ExpensePage(BaseModel):
+    items: List[Expense]
+    nextCursor: Optional[str] = None
+
+
+# Linha de um arquivo de importação (CSV, OFX ou JSON-lines). O valor vai
+# para o rollup mensal: NaN/infinito estragariam o total do mês para sempre,
+# e créditos/estornos (<= 0) ficam de fora, como no OFX
+class ExpenseImportRow(BaseModel):
+    name: Optional[str] = None
+    value: float = Field(..., gt=0, allow_inf_nan=False)
+    category: Optional[Dict] = None
+    tagId: Optional[str] = None
+    date: datetime
+    description: str = ""
+    color: str = "#9e9e9e"
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+# Resultado da importação em lote
+class ExpenseImportResult(BaseModel):
+    inserted: int
+    skipped: int
+    errorCount: int
+    errors: List[ImportRowError]
+
+
+# Seleção de despesas para operações em lote
+class ExpenseFilter(BaseModel):
     workspaceId: str
+    startDate: Optional[datetime] = None
+    endDate: Optional[datetime] = None
+    tagId: Optional[str] = None
+    categoryId: Optional[str] = None
+    userId: Optional[str] = None
+
+
+# Campos a alterar; só os enviados são aplicados (null limpa o campo)
+class ExpensePatch(BaseModel):
+    name: Optional[str] = None
+    value: Optional[float] = None
+    category: Optional[Dict] = None
+    tagId: Optional[str] = None
+    date: Optional[datetime] = None
+    description: Optional[str] = None
+    color: Optional[str] = None
+
+
+class ExpenseBulkDelete(BaseModel):
+    ids: Optional[List[str]] = None
+    filter: Optional[ExpenseFilter] = None
+
+
+class ExpenseBulkUpdate(ExpenseBulkDelete):
+    patch: ExpensePatch
+
 
-    class Config:
-        orm_mode = True
+class ExpenseBulkResult(BaseModel):
+    affected: int
+    byWorkspace: Dict[str, int]
 
 
 # Informações do usuário que gastou
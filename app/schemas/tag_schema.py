@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 class TagBase(BaseModel):
@@ -9,7 +9,6 @@ class TagCreate(TagBase):
     workspace_id: str
 
 class Tag(TagBase):
-    id: str
+    model_config = ConfigDict(from_attributes=True)
 
-    class Config:
-        from_attributes = True
+    id: str
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from typing import Optional
 from datetime import date, datetime
 
@@ -34,7 +34,9 @@ class UserCreate(BaseModel):
 
 
 class UserOut(BaseModel):
-    id: str                 
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
     email: EmailStr
     name: Optional[str]
     username: Optional[str]
@@ -42,9 +44,6 @@ class UserOut(BaseModel):
     birthdate: Optional[date]
     income: Optional[float]
 
-    class Config:
-        orm_mode = True
-
 class PasswordChange(BaseModel):
     currentPassword: str = Field(..., min_length=6)
     newPassword: str = Field(..., min_length=6)
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import AliasChoices, BaseModel, ConfigDict, EmailStr, Field
 from uuid import UUID
 
 
@@ -10,13 +10,12 @@ class WorkspaceType(BaseModel):
 
 
 class WorkspaceUser(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
     name: str
     email: Optional[EmailStr]
 
-    class Config:
-        orm_mode = True
-
 
 class WorkspaceBase(BaseModel):
     name: str
@@ -36,10 +35,10 @@ class WorkspaceUpdate(BaseModel):
     type: Optional[WorkspaceType] = None
 
 
+# Valida direto do ORM (Workspace.model_validate(workspace)), membros incluídos
 class Workspace(WorkspaceBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
-    userId: UUID
+    userId: UUID = Field(validation_alias=AliasChoices("userId", "user_id"))
     users: List[WorkspaceUser]
-
-    class Config:
-        orm_mode = True
@@ -0,0 +1,34 @@
+"""Worker do detector de anomalias e duplicatas.
+
+Uso:
+    python -m app.scripts.anomaly_worker
+"""
+import logging
+import time
+from app.config import ANOMALY_POLL_SECONDS
+from app.database import SessionLocal
+from app.services.anomaly_service import process_scan_batch
+
+logger = logging.getLogger("anomaly_worker")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    while True:
+        db = SessionLocal()
+        try:
+            processed = process_scan_batch(db)
+        except Exception:
+            logger.exception("Falha ao analisar a fila de despesas")
+            db.rollback()
+            processed = 0
+        finally:
+            db.close()
+
+        # Se processou algo, busca o próximo lote logo; senão espera
+        if not processed:
+            time.sleep(ANOMALY_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
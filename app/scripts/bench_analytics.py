@@ -0,0 +1,97 @@
+"""Compara as agregações vetorizadas (pandas) com o loop em Python usado
+antes no resumo anual, sobre dados sintéticos (sem banco).
+
+Uso:
+    python -m app.scripts.bench_analytics --rows 200000
+"""
+import argparse
+import time
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from app.services.analytics_service import FRAME_COLUMNS, breakdown, monthly_trend
+
+
+def synthetic_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    categories = rng.integers(1, 13, rows).astype(str)
+    users = rng.integers(1, 6, rows).astype(str)
+    frame = pd.DataFrame(
+        {
+            "date": pd.Timestamp("2024-01-01")
+            + pd.to_timedelta(rng.integers(0, 365, rows), unit="D"),
+            "value": rng.uniform(1, 500, rows).round(2),
+            "category_id": categories,
+            "category_name": np.char.add("Categoria ", categories),
+            "tag_id": None,
+            "tag_name": None,
+            "user_id": users,
+            "user_name": np.char.add("Usuário ", users),
+        }
+    )
+    return frame[FRAME_COLUMNS]
+
+
+def loop_summary(records) -> dict:
+    # Mesmo formato do antigo get_annual_expense_summary: mês -> categoria -> usuário
+    result = defaultdict(lambda: {"total": 0.0})
+    for item in records:
+        month = item["date"].strftime("%B").lower()
+        category_id = item["category_id"] or "Sem Categoria"
+        if category_id not in result[month]:
+            result[month][category_id] = {"itens": [], "total": 0.0}
+        entry = next(
+            (
+                e
+                for e in result[month][category_id]["itens"]
+                if e["user"]["id"] == item["user_id"]
+            ),
+            None,
+        )
+        if entry:
+            entry["total"] += item["value"] or 0
+        else:
+            result[month][category_id]["itens"].append(
+                {
+                    "user": {"id": item["user_id"], "name": item["user_name"]},
+                    "total": item["value"] or 0,
+                }
+            )
+        result[month][category_id]["total"] += item["value"] or 0
+        result[month]["total"] += item["value"] or 0
+    return result
+
+
+def vectorized_summary(frame: pd.DataFrame) -> pd.Series:
+    return frame.groupby(
+        [frame["date"].dt.month, "category_id", "user_id"], sort=False
+    )["value"].sum()
+
+
+def _timed(label: str, fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best * 1000:10.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frame = synthetic_frame(args.rows)
+    records = frame.to_dict("records")
+    print(f"{args.rows} despesas, melhor de {args.repeat}")
+
+    _timed("loop (resumo anual)", lambda: loop_summary(records), args.repeat)
+    _timed("pandas (mês/categoria/usuário)", lambda: vectorized_summary(frame), args.repeat)
+    _timed("pandas breakdown categoria", lambda: breakdown(frame, "category"), args.repeat)
+    _timed("pandas tendência mensal", lambda: monthly_trend(frame), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Compara os backends de cache (TTLCache em memória x RedisCache) nas
+operações usadas pela API: set com tags, get (acerto e falta) e invalidação.
+
+Usa o Redis em REDIS_URL; com --fake, o fakeredis (servidor embutido, sem
+rede), útil para conferir o backend sem subir um Redis.
+
+Uso:
+    python -m app.scripts.bench_cache --ops 50000
+    python -m app.scripts.bench_cache --fake
+"""
+import argparse
+import time
+from app.utils.cache import TTLCache
+from app.utils.redis_cache import RedisCache, get_redis
+
+
+def _redis_client(fake: bool):
+    if fake:
+        import fakeredis
+
+        return fakeredis.FakeRedis()
+    return get_redis()
+
+
+def _check(cache) -> None:
+    # Mesmo contrato nos dois backends
+    cache.set(("user", "1", "ws"), True, tags=(("workspace", "ws"),))
+    cache.set(("user", "2", "ws"), False, tags=(("workspace", "ws"),))
+    cache.set(b"\x00token", {"sub": "1"}, ttl=0.05)
+    assert cache.get(("user", "1", "ws")) is True
+    assert cache.get(("user", "2", "ws")) is False
+    assert cache.get(b"\x00token") == {"sub": "1"}
+
+    cache.invalidate_tag(("workspace", "ws"))
+    assert cache.get(("user", "1", "ws")) is None
+    assert cache.get(("user", "2", "ws")) is None
+
+    time.sleep(0.1)
+    assert cache.get(b"\x00token") is None
+    cache.set("x", 1)
+    cache.delete("x")
+    assert cache.get("x", "ausente") == "ausente"
+    cache.clear()
+
+
+def _timed(label: str, fn, ops: int) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {ops / elapsed:12,.0f} ops/s {elapsed * 1e6 / ops:8.1f} µs/op")
+
+
+def bench(name: str, cache, ops: int) -> None:
+    _check(cache)
+    keys = [("user", str(i), str(i % 100)) for i in range(ops)]
+    print(f"\n{name}")
+
+    def set_all():
+        for key in keys:
+            cache.set(key, True, tags=(("workspace", key[2]),))
+
+    def get_hits():
+        for key in keys:
+            cache.get(key)
+
+    def get_misses():
+        for key in keys:
+            cache.get(("ausente",) + key)
+
+    def invalidate():
+        for workspace in range(100):
+            cache.invalidate_tag(("workspace", str(workspace)))
+
+    _timed("set (1 tag)", set_all, ops)
+    _timed("get (acerto)", get_hits, ops)
+    _timed("get (falta)", get_misses, ops)
+    _timed("invalidate_tag (por chave)", invalidate, ops)
+    cache.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--fake", action="store_true", help="usa fakeredis")
+    args = parser.parse_args()
+
+    print(f"{args.ops} chaves")
+    bench("memória (TTLCache)", TTLCache(maxsize=args.ops * 2), args.ops)
+    bench(
+        "redis" + (" (fakeredis)" if args.fake else ""),
+        RedisCache("bench", client=_redis_client(args.fake)),
+        args.ops,
+    )
+
+
+if __name__ == "__main__":
+    main()
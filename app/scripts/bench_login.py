@@ -0,0 +1,102 @@
+"""Vazão de login (verificação de senha) sob carga concorrente, com e sem o
+pool de processos de app.auth.hashing, e o efeito sobre o resto da API.
+
+Um ThreadPoolExecutor faz o papel do threadpool do Starlette: recebe uma
+rajada de logins e, ao mesmo tempo, requisições leves (CRUD simulado, ~1 ms).
+No modo "inline" o bcrypt roda na própria thread, como antes; no modo "pool"
+a thread só espera o processo de hash e a back-pressure recusa o excesso (503).
+
+Custos e limites vêm da configuração (BCRYPT_ROUNDS, PASSWORD_SCHEMES,
+PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING...).
+
+Uso:
+    python -m app.scripts.bench_login --logins 200 --threads 40
+    BCRYPT_ROUNDS=10 python -m app.scripts.bench_login --modes pool
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List
+from fastapi import HTTPException
+from app.auth.hashing import build_context, hash_password, hashing_stats, verify_password
+
+PASSWORD = "senha-de-teste-123"
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def run(mode: str, hashed: str, logins: int, threads: int, crud_interval: float) -> dict:
+    context = build_context()
+    rejected = 0
+    lock = threading.Lock()
+
+    def login():
+        nonlocal rejected
+        if mode == "inline":
+            context.verify(PASSWORD, hashed)
+            return
+        try:
+            verify_password(PASSWORD, hashed)
+        except HTTPException:
+            with lock:
+                rejected += 1
+
+    def crud(submitted_at: float) -> float:
+        time.sleep(0.001)
+        return (time.perf_counter() - submitted_at) * 1000
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        login_futures = [pool.submit(login) for _ in range(logins)]
+
+        # Requisições leves chegando durante a rajada de logins
+        crud_futures = []
+        while not all(f.done() for f in login_futures):
+            crud_futures.append(pool.submit(crud, time.perf_counter()))
+            time.sleep(crud_interval)
+        elapsed = time.perf_counter() - start
+        wait(crud_futures)
+
+    crud_latencies = sorted(f.result() for f in crud_futures)
+    return {
+        "logins_per_second": (logins - rejected) / elapsed,
+        "rejected": rejected,
+        "elapsed": elapsed,
+        "crud_p50": _percentile(crud_latencies, 0.50),
+        "crud_p99": _percentile(crud_latencies, 0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=40, help="threadpool simulado")
+    parser.add_argument("--crud-interval", type=float, default=0.005, help="segundos")
+    parser.add_argument("--modes", default="inline,pool")
+    args = parser.parse_args()
+
+    # Hash criado pelo pool, também para aquecer os processos
+    hashed = hash_password(PASSWORD)
+    scheme = build_context().identify(hashed)
+    print(f"{args.logins} logins ({scheme}), {args.threads} threads")
+
+    for mode in args.modes.split(","):
+        result = run(mode, hashed, args.logins, args.threads, args.crud_interval)
+        print(
+            f"{mode:<8} {result['logins_per_second']:8.1f} logins/s "
+            f"({result['elapsed']:6.2f} s, {result['rejected']} recusados com 503)  "
+            f"CRUD p50 {result['crud_p50']:8.1f} ms  p99 {result['crud_p99']:8.1f} ms"
+        )
+
+    verify = hashing_stats().get(scheme, {}).get("verify")
+    if verify and verify["count"]:
+        print(f"\ntempo médio de verificação no worker: {verify['sum'] / verify['count']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Vazão do worker do outbox de e-mails contra o sink local
+(app.scripts.email_sink): e-mails por segundo do enfileiramento até o último
+"sent", com falhas opcionais do sink (viram retentativa).
+
+Por padrão usa um SQLite temporário só com a tabela email_outbox e um
+worker. Com --database-url usa um banco já migrado (ex.: Postgres), onde
+--workers > 1 reserva lotes em paralelo via SKIP LOCKED.
+
+Uso:
+    python -m app.scripts.bench_outbox --messages 2000
+    python -m app.scripts.bench_outbox --fail-rate 0.05 --batch-size 100
+    python -m app.scripts.bench_outbox --database-url postgresql+psycopg2://... --workers 4
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from functools import partial
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import EmailOutbox
+from app.scripts.email_sink import SinkHandler, start_sink
+from app.services import email_outbox_service
+from app.services.email_outbox_service import enqueue_email, process_outbox_batch, send_email
+from app.utils.http_client import OutboundClient, get_client, register_client
+
+
+def _session_factory(database_url: str, sqlite_path: str):
+    if database_url:
+        engine = create_engine(database_url, pool_size=20)
+    else:
+        # Arquivo, não memória: cada thread usa a própria conexão
+        engine = create_engine(f"sqlite:///{sqlite_path}")
+        Base.metadata.create_all(engine, tables=[EmailOutbox.__table__])
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+# Só as mensagens do benchmark, num banco que pode ter outras
+BENCH_ROWS = EmailOutbox.payload["bench"].isnot(None)
+
+
+def _enqueue(Session, messages: int) -> None:
+    with Session() as db:
+        db.execute(delete(EmailOutbox).where(BENCH_ROWS))
+        for i in range(messages):
+            enqueue_email(
+                db,
+                {
+                    "bench": True,
+                    "to": [{"email": f"user{i}@example.com"}],
+                    "subject": f"Benchmark {i}",
+                    "htmlContent": "<p>ok</p>",
+                },
+            )
+        db.commit()
+
+
+def _worker(Session, send, batch_size: int, stop: threading.Event) -> None:
+    while not stop.is_set():
+        with Session() as db:
+            if not process_outbox_batch(db, send=send, batch_size=batch_size):
+                time.sleep(0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=120, help="segundos")
+    parser.add_argument("--database-url", default="", help="banco já migrado")
+    args = parser.parse_args()
+
+    if args.workers > 1 and not args.database_url:
+        parser.error("--workers > 1 precisa de --database-url (SQLite não tem SKIP LOCKED)")
+
+    # Retentativas logo em seguida, para medir o custo delas e não a espera
+    email_outbox_service.EMAIL_RETRY_BASE_SECONDS = 0
+    server = start_sink(fail_rate=args.fail_rate, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    register_client("brevo", OutboundClient("brevo", failure_threshold=10**9))
+    send = partial(
+        send_email, url=f"http://127.0.0.1:{server.server_address[1]}/v3/smtp/email"
+    )
+
+    sqlite_dir = tempfile.TemporaryDirectory()
+    Session = _session_factory(
+        args.database_url, os.path.join(sqlite_dir.name, "outbox.db")
+    )
+    _enqueue(Session, args.messages)
+    print(
+        f"{args.messages} e-mails, lotes de {args.batch_size}, {args.workers} worker(s), "
+        f"falha no sink {args.fail_rate:.0%}"
+    )
+
+    stop = threading.Event()
+    workers = [
+        threading.Thread(target=_worker, args=(Session, send, args.batch_size, stop))
+        for _ in range(args.workers)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+
+    sent = 0
+    deadline = start + args.timeout
+    while time.perf_counter() < deadline:
+        with Session() as db:
+            sent = (
+                db.query(EmailOutbox)
+                .filter(BENCH_ROWS, EmailOutbox.status == "sent")
+                .count()
+            )
+        if sent >= args.messages:
+            break
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for worker in workers:
+        worker.join()
+    server.shutdown()
+    Session.kw["bind"].dispose()
+    sqlite_dir.cleanup()
+
+    latency = get_client("brevo").stats()["latency_ms"]
+    print(f"enviados   {sent:8d} em {elapsed:6.2f} s  {sent / elapsed:10,.0f} e-mails/s")
+    print(f"no sink    {SinkHandler.received:8d} recebidos")
+    if latency["count"]:
+        print(f"latência média do POST {latency['sum'] / latency['count']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
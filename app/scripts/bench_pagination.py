@@ -0,0 +1,224 @@
+"""Mede, sobre 1M de despesas sintéticas num SQLite local (sem Postgres):
+
+- resumo anual: o caminho antigo (todas as linhas do ano para o Python e o
+  loop com next() por usuário) contra um único GROUP BY mês/categoria/usuário
+  que só devolve agregados, montado por _build_annual_summary;
+- listagem paginada: página profunda com OFFSET contra keyset em (date, id).
+
+Uso:
+    python -m app.scripts.bench_pagination --rows 1000000
+    python -m app.scripts.bench_pagination --rows 200000 --db /tmp/bench.db
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from app.services.expenses_service import _build_annual_summary
+
+WORKSPACE_ID = "ws-bench"
+YEAR = 2024
+
+
+def populate(conn: sqlite3.Connection, rows: int, users: int, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    conn.executescript(
+        """
+        CREATE TABLE users (id TEXT PRIMARY KEY, name TEXT);
+        CREATE TABLE expenses (
+            id TEXT PRIMARY KEY,
+            workspace_id TEXT NOT NULL,
+            user_id TEXT,
+            category_id TEXT,
+            value REAL,
+            date TEXT
+        );
+        """
+    )
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    conn.executemany(
+        "INSERT INTO users VALUES (?, ?)",
+        [(u, f"Usuário {i}") for i, u in enumerate(user_ids)],
+    )
+
+    start = datetime(YEAR, 1, 1)
+    batch = []
+    for _ in range(rows):
+        date = start + timedelta(seconds=rng.randint(0, 366 * 86_400 - 1))
+        batch.append(
+            (
+                str(uuid.uuid4()),
+                WORKSPACE_ID,
+                rng.choice(user_ids),
+                rng.choice([None] + [str(c) for c in range(1, 13)]),
+                round(rng.uniform(1, 500), 2),
+                date.isoformat(sep=" "),
+            )
+        )
+        if len(batch) == 50_000:
+            conn.executemany("INSERT INTO expenses VALUES (?, ?, ?, ?, ?, ?)", batch)
+            batch.clear()
+    conn.executemany("INSERT INTO expenses VALUES (?, ?, ?, ?, ?, ?)", batch)
+    # Mesmo índice de ix_expenses_workspace_id_date
+    conn.execute("CREATE INDEX ix_expenses_ws_date ON expenses (workspace_id, date, id)")
+    conn.commit()
+
+
+def _year_bounds():
+    return f"{YEAR}-01-01 00:00:00", f"{YEAR + 1}-01-01 00:00:00"
+
+
+def old_summary(conn: sqlite3.Connection) -> dict:
+    # Como o antigo get_annual_expense_summary: cada linha do ano (com o nome do
+    # usuário que vinha do grafo joined) e busca linear pelo usuário da categoria
+    rows = conn.execute(
+        """
+        SELECT e.date, e.category_id, e.user_id, u.name, e.value
+        FROM expenses e LEFT JOIN users u ON u.id = e.user_id
+        WHERE e.workspace_id = ? AND e.date >= ? AND e.date < ?
+        """,
+        (WORKSPACE_ID, *_year_bounds()),
+    )
+    result = defaultdict(lambda: {"total": 0.0})
+    for date, category_id, user_id, user_name, value in rows:
+        month = datetime.fromisoformat(date).strftime("%B").lower()
+        category_id = category_id or "Sem Categoria"
+        if category_id not in result[month]:
+            result[month][category_id] = {"itens": [], "total": 0.0}
+        entry = next(
+            (
+                e
+                for e in result[month][category_id]["itens"]
+                if e["user"]["id"] == user_id
+            ),
+            None,
+        )
+        if entry:
+            entry["total"] += value or 0
+        else:
+            result[month][category_id]["itens"].append(
+                {
+                    "user": {"id": user_id, "name": user_name or "Desconhecido"},
+                    "total": value or 0,
+                }
+            )
+        result[month][category_id]["total"] += value or 0
+        result[month]["total"] += value or 0
+    return result
+
+
+def grouped_summary(conn: sqlite3.Connection) -> dict:
+    # Agrega no banco e junta o nome do usuário uma vez por grupo
+    rows = conn.execute(
+        """
+        SELECT g.month, g.category_id, g.user_id, u.name, g.total
+        FROM (
+            SELECT CAST(strftime('%m', date) AS INTEGER) AS month,
+                   category_id, user_id, SUM(value) AS total
+            FROM expenses
+            WHERE workspace_id = ? AND date >= ? AND date < ?
+            GROUP BY month, category_id, user_id
+        ) g LEFT JOIN users u ON u.id = g.user_id
+        """,
+        (WORKSPACE_ID, *_year_bounds()),
+    ).fetchall()
+    return _build_annual_summary(YEAR, rows)
+
+
+def _normalized(summary: dict) -> dict:
+    # Ordem dos itens e arredondamento da soma podem variar entre os caminhos
+    result = {}
+    for month, categories in summary.items():
+        result[month] = {"total": round(categories["total"], 2)}
+        for category_id, data in categories.items():
+            if category_id == "total":
+                continue
+            result[month][category_id] = (
+                round(data["total"], 2),
+                sorted(
+                    (i["user"]["id"], i["user"]["name"], round(i["total"], 2))
+                    for i in data["itens"]
+                ),
+            )
+    return result
+
+
+def offset_page(conn: sqlite3.Connection, offset: int, size: int) -> list:
+    return conn.execute(
+        """
+        SELECT id, date, value FROM expenses WHERE workspace_id = ?
+        ORDER BY date, id LIMIT ? OFFSET ?
+        """,
+        (WORKSPACE_ID, size, offset),
+    ).fetchall()
+
+
+def keyset_page(conn: sqlite3.Connection, after: tuple, size: int) -> list:
+    return conn.execute(
+        """
+        SELECT id, date, value FROM expenses
+        WHERE workspace_id = ? AND (date, id) > (?, ?)
+        ORDER BY date, id LIMIT ?
+        """,
+        (WORKSPACE_ID, after[1], after[0], size),
+    ).fetchall()
+
+
+def _timed(label: str, fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<44} {best * 1000:10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--db", default=":memory:", help="arquivo SQLite (recriado)")
+    args = parser.parse_args()
+
+    if args.db != ":memory:" and os.path.exists(args.db):
+        os.remove(args.db)
+    conn = sqlite3.connect(args.db)
+
+    start = time.perf_counter()
+    populate(conn, args.rows, args.users)
+    print(
+        f"{args.rows} despesas, {args.users} usuários "
+        f"(carga em {time.perf_counter() - start:.1f} s), melhor de {args.repeat}"
+    )
+
+    print("\nresumo anual")
+    old = _timed("linhas + loop com next() (antigo)", lambda: old_summary(conn), args.repeat)
+    new = _timed("GROUP BY mês/categoria/usuário", lambda: grouped_summary(conn), args.repeat)
+    assert _normalized(old) == _normalized(new), "resumos diferentes"
+
+    print(f"\npágina de {args.page_size} no fim da listagem")
+    offset = max(args.rows - args.page_size, 0)
+    by_offset = _timed(
+        f"OFFSET {offset}",
+        lambda: offset_page(conn, offset, args.page_size),
+        args.repeat,
+    )
+    # Cursor = última linha da página anterior, como em encode_cursor
+    previous = offset_page(conn, offset - 1, 1)[0] if offset else None
+    if previous:
+        by_keyset = _timed(
+            "keyset (date, id) > cursor",
+            lambda: keyset_page(conn, previous, args.page_size),
+            args.repeat,
+        )
+        assert by_offset == by_keyset, "páginas diferentes"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Compara a serialização da listagem de despesas (10k linhas por padrão):
+montagem manual + jsonable_encoder/json (caminho antigo) contra
+model_validate/TypeAdapter a partir das linhas e orjson. Sem banco: as
+linhas são objetos com os mesmos atributos do ORM.
+
+Uso:
+    python -m app.scripts.bench_serialization --rows 10000
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app.schemas.expense_schema import Expense, ExpensePage
+from app.utils.http_cache import _default
+
+
+def synthetic_rows(rows: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    workspace_id, user_id = uuid.uuid4(), uuid.uuid4()
+    tags = [
+        SimpleNamespace(id=str(uuid.uuid4()), name=f"Tag {i}", color="#ff9800")
+        for i in range(10)
+    ]
+    start = datetime(2024, 1, 1)
+    result = []
+    for i in range(rows):
+        tag = rng.choice(tags + [None])
+        result.append(
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                name=f"Despesa {i}",
+                value=round(rng.uniform(1, 500), 2),
+                category={"id": str(rng.randint(1, 12)), "name": "Categoria"},
+                tag_id=uuid.UUID(tag.id) if tag else None,
+                tag=tag,
+                date=start + timedelta(minutes=rng.randint(0, 525_600)),
+                user_id=user_id,
+                description="Descrição da despesa",
+                color="#9e9e9e",
+                workspace_id=workspace_id,
+            )
+        )
+    return result
+
+
+def manual_out(expense) -> Expense:
+    # Como _expense_out montava cada despesa antes
+    tag = expense.tag
+    return Expense(
+        id=str(expense.id),
+        name=expense.name,
+        value=expense.value,
+        category=expense.category,
+        tagId=str(expense.tag_id) if expense.tag_id else None,
+        tag={"id": tag.id, "name": tag.name, "color": tag.color} if tag else None,
+        date=expense.date,
+        userId=str(expense.user_id) if expense.user_id else None,
+        description=expense.description,
+        color=expense.color,
+        workspaceId=str(expense.workspace_id),
+    )
+
+
+def old_path(rows) -> bytes:
+    page = ExpensePage(items=[manual_out(e) for e in rows])
+    # response_model: o FastAPI despeja e valida de novo antes de codificar
+    page = ExpensePage.model_validate(page.model_dump())
+    return json.dumps(jsonable_encoder(page)).encode()
+
+
+def per_row_path(rows) -> bytes:
+    page = ExpensePage(items=[Expense.model_validate(e) for e in rows])
+    return orjson.dumps(page, default=_default)
+
+
+_expense_list = TypeAdapter(List[Expense])
+
+
+def adapter_path(rows) -> bytes:
+    page = ExpensePage(items=_expense_list.validate_python(rows, from_attributes=True))
+    return orjson.dumps(page, default=_default)
+
+
+def adapter_dump_json_path(rows) -> bytes:
+    items = _expense_list.validate_python(rows, from_attributes=True)
+    return ExpensePage(items=items).model_dump_json().encode()
+
+
+def _timed(label: str, fn, repeat: int) -> bytes:
+    best, body = float("inf"), b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:10.1f} ms {len(body) / 1024:10.0f} KiB")
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows)
+    print(f"{args.rows} despesas, melhor de {args.repeat}")
+
+    paths = [
+        ("manual + jsonable_encoder + json", old_path),
+        ("model_validate por linha + orjson", per_row_path),
+        ("TypeAdapter + orjson", adapter_path),
+        ("TypeAdapter + model_dump_json", adapter_dump_json_path),
+    ]
+    bodies = [_timed(label, lambda: fn(rows), args.repeat) for label, fn in paths]
+    # Mesmo conteúdo em todos os caminhos
+    decoded = [json.loads(body) for body in bodies]
+    assert all(d == decoded[0] for d in decoded), "saídas diferentes"
+
+
+if __name__ == "__main__":
+    main()
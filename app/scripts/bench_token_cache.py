@@ -0,0 +1,59 @@
+"""Custo por requisição da autenticação: verificar o JWT a cada chamada
+(como antes) contra o cache de claims de app.auth.token_cache, somado à
+checagem de revogação (check_not_revoked). A leitura de
+users.tokens_valid_after no banco fica de fora: é a mesma nos dois caminhos.
+
+Uso:
+    python -m app.scripts.bench_token_cache --calls 100000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from app.auth import token_cache
+from app.auth.tokens import ACCESS, check_not_revoked, create_access_token
+from app.auth.tokens import decode_token as verify_token
+
+
+def _timed(label: str, fn, calls: int) -> None:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed * 1e6 / calls:8.2f} µs/req {calls / elapsed:12,.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50_000)
+    parser.add_argument("--tokens", type=int, default=100, help="tokens distintos")
+    args = parser.parse_args()
+
+    tokens = [create_access_token(f"user-{i}") for i in range(args.tokens)]
+    cutoff = datetime.utcnow() - timedelta(days=1)
+    print(f"{args.calls} chamadas, {args.tokens} tokens distintos")
+
+    position = 0
+
+    def next_token() -> str:
+        nonlocal position
+        position = (position + 1) % len(tokens)
+        return tokens[position]
+
+    def uncached():
+        claims = verify_token(next_token(), expected_types=[ACCESS])
+        check_not_revoked(claims, cutoff)
+
+    def cached():
+        claims = token_cache.decode_token(next_token(), expected_types=[ACCESS])
+        check_not_revoked(claims, cutoff)
+
+    for token in tokens:
+        token_cache.decode_token(token)
+
+    _timed("jwt.decode a cada requisição", uncached, args.calls)
+    _timed("cache de claims", cached, args.calls)
+    print(f"\n{token_cache.token_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Sink HTTP local que imita a API de e-mail, para testes e benchmarks.
+
+Uso:
+    python -m app.scripts.email_sink --port 8025 [--fail-rate 0.1] [--quiet]
+    BREVO_API_URL=http://localhost:8025/v3/smtp/email python -m app.scripts.email_worker
+"""
+import argparse
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class SinkHandler(BaseHTTPRequestHandler):
+    fail_rate = 0.0
+    quiet = False
+    received = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if random.random() < self.fail_rate:
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        message = json.loads(body or b"{}")
+        with SinkHandler.lock:
+            SinkHandler.received += 1
+            count = SinkHandler.received
+        if not self.quiet:
+            print(f"[{count}] {message.get('subject')} -> {message.get('to')}")
+
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps({"messageId": str(count)}).encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_sink(
+    port: int = 0, fail_rate: float = 0.0, quiet: bool = False
+) -> ThreadingHTTPServer:
+    """Cria o servidor (porta 0 = qualquer livre); quem chama decide onde servir."""
+    SinkHandler.fail_rate = fail_rate
+    SinkHandler.quiet = quiet
+    SinkHandler.received = 0
+    return ThreadingHTTPServer(("127.0.0.1", port), SinkHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--quiet", action="store_true", help="não imprime cada e-mail")
+    args = parser.parse_args()
+
+    server = start_sink(args.port, args.fail_rate, args.quiet)
+    print(f"Sink de e-mail em http://127.0.0.1:{server.server_address[1]}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
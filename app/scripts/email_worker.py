@@ -0,0 +1,34 @@
+"""Worker do outbox de e-mails.
+
+Uso:
+    python -m app.scripts.email_worker
+"""
+import logging
+import time
+from app.config import EMAIL_OUTBOX_POLL_SECONDS
+from app.database import SessionLocal
+from app.services.email_outbox_service import process_outbox_batch
+
+logger = logging.getLogger("email_worker")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    while True:
+        db = SessionLocal()
+        try:
+            processed = process_outbox_batch(db)
+        except Exception:
+            logger.exception("Falha ao processar o outbox")
+            db.rollback()
+            processed = 0
+        finally:
+            db.close()
+
+        # Se processou algo, busca o próximo lote logo; senão espera
+        if not processed:
+            time.sleep(EMAIL_OUTBOX_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
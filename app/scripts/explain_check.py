@@ -0,0 +1,133 @@
+"""Roda EXPLAIN nas consultas dos services e falha se houver Seq Scan em tabela grande.
+
+Uso (contra um Postgres local já migrado com `alembic upgrade head`):
+    python -m app.scripts.explain_check --seed 200000
+    python -m app.scripts.explain_check --min-rows 10000
+"""
+import argparse
+import sys
+from sqlalchemy import select, text
+from app.database import engine
+from app.models import Tag as TagModel, workspace_users
+from app.services.expenses_service import (
+    _annual_summary_query,
+    _workspace_expenses_query,
+)
+from app.services.workspaces_service import _access_query
+
+# workspaces.id é varchar e expenses.workspace_id é UUID: os workspaces
+# sintéticos usam md5('seed-ws-' || w)::uuid, o mesmo valor nas três tabelas
+SEED_SQL = """
+INSERT INTO users (id, email, password, name)
+SELECT 'seed-user-' || u, 'seed' || u || '@example.com', 'x', 'Seed ' || u
+FROM generate_series(1, 200) AS u
+ON CONFLICT DO NOTHING;
+
+INSERT INTO workspaces (id, name, color, type, user_id)
+SELECT md5('seed-ws-' || w)::uuid::text, 'Seed ' || w, '#000000',
+       '{"id": "1", "name": "seed"}', 'seed-user-' || (1 + w % 200)
+FROM generate_series(1, 500) AS w
+ON CONFLICT DO NOTHING;
+
+INSERT INTO workspace_users (workspace_id, user_id)
+SELECT md5('seed-ws-' || w)::uuid::text, 'seed-user-' || (1 + (w * 7) % 200)
+FROM generate_series(1, 500) AS w
+ON CONFLICT DO NOTHING;
+
+INSERT INTO expenses (id, name, value, category, date, user_id, description,
+                      color, workspace_id)
+SELECT gen_random_uuid(), 'seed', (random() * 500)::numeric(10, 2),
+       jsonb_build_object('id', (1 + n % 12)::text),
+       timestamp '2024-01-01' + (n % 730) * interval '1 day',
+       NULL, 'seed', '#000000', md5('seed-ws-' || (1 + n % 500))::uuid
+FROM generate_series(1, :rows) AS n;
+
+ANALYZE;
+"""
+
+# Primeiro workspace sintético (w = 1) e um membro dele
+SAMPLE_SQL = """
+SELECT w.id, wu.user_id
+FROM workspaces w JOIN workspace_users wu ON wu.workspace_id = w.id
+ORDER BY w.id = md5('seed-ws-1')::uuid::text DESC
+LIMIT 1
+"""
+
+
+def service_queries(workspace_id: str, user_id: str, year: int) -> dict:
+    return {
+        "access_check": _access_query(user_id, workspace_id),
+        "list_expenses": _workspace_expenses_query(workspace_id).limit(101),
+        "list_expenses_month": _workspace_expenses_query(
+            workspace_id, month=6, year=year
+        ).limit(101),
+        "annual_summary": _annual_summary_query(workspace_id, year),
+        "list_tags": select(TagModel).where(TagModel.workspace_id == workspace_id),
+        "user_workspaces": select(workspace_users.c.workspace_id).where(
+            workspace_users.c.user_id == user_id
+        ),
+    }
+
+
+def _seq_scans(plan: dict):
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0, help="despesas sintéticas")
+    parser.add_argument(
+        "--min-rows",
+        type=int,
+        default=10_000,
+        help="tabelas com menos linhas que isso podem ter Seq Scan",
+    )
+    parser.add_argument("--year", type=int, default=2024)
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        if args.seed:
+            for statement in SEED_SQL.split(";\n"):
+                if statement.strip():
+                    conn.execute(text(statement), {"rows": args.seed})
+
+    with engine.connect() as conn:
+        sample = conn.execute(text(SAMPLE_SQL)).first()
+        if sample is None:
+            print("Banco vazio: rode com --seed")
+            return 1
+        workspace_id, user_id = sample
+
+        sizes = dict(
+            conn.execute(
+                text("SELECT relname, reltuples FROM pg_class WHERE relkind = 'r'")
+            ).all()
+        )
+
+        failures = 0
+        queries = service_queries(workspace_id, user_id, args.year)
+        for name, stmt in queries.items():
+            compiled = stmt.compile(bind=conn)
+            plan = conn.exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+            ).scalar()[0]["Plan"]
+
+            large = [
+                table
+                for table in _seq_scans(plan)
+                if sizes.get(table, 0) >= args.min_rows
+            ]
+            if large:
+                failures += 1
+                print(f"FALHOU {name} (Seq Scan: {', '.join(large)})")
+            else:
+                print(f"ok     {name}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
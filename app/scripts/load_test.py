@@ -0,0 +1,157 @@
+"""Teste de carga comparando DB_MODE=sync e DB_MODE=async: requisições por
+segundo e latência (p50/p99) de uma rota autenticada.
+
+Sobe um uvicorn por modo (mesmo banco do DATABASE_URL), faz login uma vez e
+dispara `--concurrency` clientes em paralelo durante `--duration` segundos.
+O cache de respostas (ETag) é desligado nos servidores (RESPONSE_CACHE_SIZE=0)
+para que toda requisição chegue ao banco; use --keep-response-cache para
+medir com ele.
+
+Com --url, mede um servidor já em execução (o modo é o que ele usa).
+
+Uso:
+    python -m app.scripts.load_test --email eu@exemplo.com --password segredo
+    python -m app.scripts.load_test --path /api/annual/<workspace_id>/2024 \\
+        --concurrency 200 --duration 30 --email ... --password ...
+    python -m app.scripts.load_test --url http://localhost:8000 --email ... --password ...
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import requests
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def _login(base_url: str, email: str, password: str) -> str:
+    response = requests.post(
+        f"{base_url}/api/login", json={"email": email, "password": password}, timeout=30
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def _wait_ready(base_url: str, process: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("O servidor terminou antes de ficar pronto.")
+        try:
+            requests.get(f"{base_url}/", timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError("O servidor não respondeu a tempo.")
+
+
+def _spawn(mode: str, port: int, keep_response_cache: bool) -> subprocess.Popen:
+    env = dict(os.environ, DB_MODE=mode)
+    if not keep_response_cache:
+        env["RESPONSE_CACHE_SIZE"] = "0"
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--log-level", "warning",
+        ],
+        env=env,
+    )
+
+
+def run_load(url: str, token: str, concurrency: int, duration: float) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        nonlocal errors
+        session = requests.Session()
+        session.headers["Authorization"] = f"Bearer {token}"
+        local, local_errors = [], 0
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                ok = session.get(url, timeout=30).status_code < 400
+            except requests.RequestException:
+                ok = False
+            local.append((time.perf_counter() - start) * 1000)
+            local_errors += not ok
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(client)
+    elapsed = time.monotonic() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50": _percentile(latencies, 0.50),
+        "p99": _percentile(latencies, 0.99),
+    }
+
+
+def _report(label: str, result: dict) -> None:
+    print(
+        f"{label:<8} {result['rps']:10.1f} req/s  p50 {result['p50']:8.1f} ms  "
+        f"p99 {result['p99']:8.1f} ms  {result['requests']:8d} req  "
+        f"{result['errors']:6d} erros"
+    )
+
+
+def measure(
+    base_url: str, args: argparse.Namespace, process: Optional[subprocess.Popen] = None
+) -> dict:
+    if process is not None:
+        _wait_ready(base_url, process)
+    token = _login(base_url, args.email, args.password)
+    url = base_url + args.path
+    # Aquecimento: conexões do pool e caches de token/hash
+    run_load(url, token, args.concurrency, min(args.duration, 2))
+    return run_load(url, token, args.concurrency, args.duration)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--path", default="/api/workspaces")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--modes", default="sync,async")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="mede um servidor já em execução")
+    parser.add_argument("--keep-response-cache", action="store_true")
+    args = parser.parse_args()
+
+    print(f"GET {args.path}, {args.concurrency} clientes, {args.duration:.0f} s")
+    if args.url:
+        _report("servidor", measure(args.url.rstrip("/"), args))
+        return
+
+    for mode in args.modes.split(","):
+        process = _spawn(mode, args.port, args.keep_response_cache)
+        try:
+            _report(mode, measure(f"http://127.0.0.1:{args.port}", args, process))
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
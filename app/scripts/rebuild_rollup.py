@@ -0,0 +1,41 @@
+"""Recalcula ou verifica a tabela expense_monthly_rollup.
+
+Uso:
+    python -m app.scripts.rebuild_rollup           # verifica e recalcula
+    python -m app.scripts.rebuild_rollup --verify  # apenas verifica
+"""
+import argparse
+import sys
+from app.database import SessionLocal, engine
+from app.models import ExpenseMonthlyRollup
+from app.services.rollup_service import rebuild_rollup, verify_rollup
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--verify", action="store_true", help="apenas reporta divergências"
+    )
+    args = parser.parse_args()
+
+    ExpenseMonthlyRollup.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        drift = verify_rollup(db)
+        for item in drift:
+            print(item)
+        print(f"{len(drift)} divergência(s) encontrada(s)")
+
+        if args.verify:
+            return 1 if drift else 0
+
+        rebuild_rollup(db)
+        print("Rollup recalculado")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
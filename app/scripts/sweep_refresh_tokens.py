@@ -0,0 +1,20 @@
+"""Remove refresh tokens expirados.
+
+Uso (ex.: via cron):
+    python -m app.scripts.sweep_refresh_tokens
+"""
+from app.database import SessionLocal
+from app.services.refresh_tokens_service import purge_expired_refresh_tokens
+
+
+def main():
+    db = SessionLocal()
+    try:
+        removed = purge_expired_refresh_tokens(db)
+        print(f"{removed} refresh token(s) expirado(s) removido(s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+from datetime import datetime
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from sqlalchemy import String, cast, select
+from sqlalchemy.orm import Session
+from app.models import Expense as ExpenseModel
+from app.models import Tag as TagModel
+from app.models import User as UserModel
+from app.services.workspaces_service import user_has_access_to_workspace
+
+# Análises sobre um DataFrame carregado com uma única consulta estreita;
+# todas as agregações são group-bys vetorizados do pandas.
+FRAME_COLUMNS = [
+    "date",
+    "value",
+    "category_id",
+    "category_name",
+    "tag_id",
+    "tag_name",
+    "user_id",
+    "user_name",
+]
+
+# dimensão -> (coluna da chave, coluna do rótulo, rótulo quando vazio)
+DIMENSIONS = {
+    "category": ("category_id", "category_name", "Sem Categoria"),
+    "tag": ("tag_id", "tag_name", "Sem Tag"),
+    "user": ("user_id", "user_name", "Desconhecido"),
+}
+
+WEEKDAYS = ["segunda", "terça", "quarta", "quinta", "sexta", "sábado", "domingo"]
+
+
+def _frame_query(
+    workspace_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None
+):
+    # tag_id e user_id são UUID em expenses e varchar em tags/users
+    tag_col = cast(ExpenseModel.tag_id, String)
+    user_col = cast(ExpenseModel.user_id, String)
+    stmt = (
+        select(
+            ExpenseModel.date,
+            ExpenseModel.value,
+            ExpenseModel.category["id"].astext,
+            ExpenseModel.category["name"].astext,
+            tag_col,
+            TagModel.name,
+            user_col,
+            UserModel.name,
+        )
+        .outerjoin(TagModel, TagModel.id == tag_col)
+        .outerjoin(UserModel, UserModel.id == user_col)
+        .where(ExpenseModel.workspace_id == workspace_id, ExpenseModel.date.isnot(None))
+    )
+    if start:
+        stmt = stmt.where(ExpenseModel.date >= start)
+    if end:
+        stmt = stmt.where(ExpenseModel.date < end)
+    return stmt
+
+
+def load_expense_frame(
+    db: Session,
+    workspace_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> pd.DataFrame:
+    rows = db.execute(_frame_query(workspace_id, start, end)).all()
+    frame = pd.DataFrame.from_records(rows, columns=FRAME_COLUMNS)
+    frame["date"] = pd.to_datetime(frame["date"])
+    frame["value"] = pd.to_numeric(frame["value"]).fillna(0.0)
+    return frame
+
+
+def _items(keys, labels, totals, counts) -> List[dict]:
+    grand_total = float(totals.sum())
+    shares = totals / grand_total if grand_total else totals * 0.0
+    return [
+        {"key": key, "label": label, "total": total, "count": count, "share": share}
+        for key, label, total, count, share in zip(
+            keys, labels, totals.tolist(), counts.tolist(), shares.tolist()
+        )
+    ]
+
+
+def breakdown(frame: pd.DataFrame, dimension: str) -> List[dict]:
+    if frame.empty:
+        return []
+
+    key_column, label_column, default_label = DIMENSIONS[dimension]
+    grouped = (
+        frame.assign(
+            _key=frame[key_column].fillna(""),
+            _label=frame[label_column].fillna(default_label),
+        )
+        .groupby("_key", sort=False)
+        .agg(total=("value", "sum"), count=("value", "size"), label=("_label", "first"))
+        .sort_values("total", ascending=False)
+    )
+    return _items(
+        [key or None for key in grouped.index],
+        grouped["label"].tolist(),
+        grouped["total"],
+        grouped["count"],
+    )
+
+
+def weekday_breakdown(frame: pd.DataFrame) -> List[dict]:
+    if frame.empty:
+        return []
+
+    grouped = (
+        frame.groupby(frame["date"].dt.dayofweek)["value"]
+        .agg(["sum", "size"])
+        .reindex(range(7), fill_value=0)
+    )
+    return _items(
+        [str(day) for day in range(7)], WEEKDAYS, grouped["sum"], grouped["size"]
+    )
+
+
+def monthly_trend(frame: pd.DataFrame, window: int = 3) -> List[dict]:
+    if frame.empty:
+        return []
+
+    # resample preenche com zero os meses sem despesas
+    monthly = frame.set_index("date")["value"].resample("MS").agg(["sum", "size"])
+    moving_average = monthly["sum"].rolling(window, min_periods=1).mean()
+    delta = monthly["sum"].diff()
+    delta_pct = monthly["sum"].pct_change().replace([np.inf, -np.inf], np.nan)
+
+    def _optional(series: pd.Series) -> list:
+        return [None if pd.isna(v) else float(v) for v in series]
+
+    return [
+        {
+            "month": month.strftime("%Y-%m"),
+            "total": total,
+            "count": count,
+            "movingAverage": average,
+            "delta": change,
+            "deltaPct": change_pct,
+        }
+        for month, total, count, average, change, change_pct in zip(
+            monthly.index,
+            monthly["sum"].tolist(),
+            monthly["size"].tolist(),
+            moving_average.tolist(),
+            _optional(delta),
+            _optional(delta_pct),
+        )
+    ]
+
+
+def _load_checked(
+    workspace_id: str,
+    user_id: str,
+    db: Session,
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> pd.DataFrame:
+    if not user_has_access_to_workspace(user_id, workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+    return load_expense_frame(db, workspace_id, start, end)
+
+
+def get_workspace_analytics(
+    workspace_id: str,
+    user_id: str,
+    db: Session,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    window: int = 3,
+) -> dict:
+    frame = _load_checked(workspace_id, user_id, db, start, end)
+    return {
+        "total": float(frame["value"].sum()),
+        "count": len(frame),
+        "byCategory": breakdown(frame, "category"),
+        "byTag": breakdown(frame, "tag"),
+        "byUser": breakdown(frame, "user"),
+        "byWeekday": weekday_breakdown(frame),
+        "trend": monthly_trend(frame, window),
+    }
+
+
+def get_breakdown(
+    workspace_id: str,
+    dimension: str,
+    user_id: str,
+    db: Session,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[dict]:
+    frame = _load_checked(workspace_id, user_id, db, start, end)
+    if dimension == "weekday":
+        return weekday_breakdown(frame)
+    return breakdown(frame, dimension)
+
+
+def get_monthly_trend(
+    workspace_id: str,
+    user_id: str,
+    db: Session,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    window: int = 3,
+) -> List[dict]:
+    frame = _load_checked(workspace_id, user_id, db, start, end)
+    return monthly_trend(frame, window)
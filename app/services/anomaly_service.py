@@ -0,0 +1,257 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy import and_, delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, aliased
+from app.config import (
+    ANOMALY_BATCH_SIZE,
+    ANOMALY_CONTAMINATION,
+    ANOMALY_MIN_SAMPLES,
+    ANOMALY_MODEL_CACHE_SIZE,
+    ANOMALY_MODEL_TTL_SECONDS,
+    ANOMALY_TRAINING_DAYS,
+)
+from app.models import Expense as ExpenseModel
+from app.models import ExpenseFlag, ExpenseScanQueue
+from app.services.workspaces_service import user_has_access_to_workspace
+from app.utils.cache import TTLCache
+
+# Detecção de valores atípicos (IsolationForest por workspace e categoria)
+# e de duplicatas (mesmo valor, dia e descrição). As despesas novas entram
+# numa fila e são analisadas em lote pelo worker, fora do caminho da requisição.
+OUTLIER = "outlier"
+DUPLICATE = "duplicate"
+
+# workspace_id -> {category_id: modelo}
+_model_cache = TTLCache(maxsize=ANOMALY_MODEL_CACHE_SIZE, ttl=ANOMALY_MODEL_TTL_SECONDS)
+
+
+def enqueue_expense_scan(db, expense_id, workspace_id) -> None:
+    """Agenda a análise; entra no commit do caller. Aceita Session ou AsyncSession."""
+    db.add(
+        ExpenseScanQueue(
+            expense_id=expense_id,
+            workspace_id=str(workspace_id),
+            enqueued_at=datetime.utcnow(),
+        )
+    )
+
+
+def _category_column():
+    return func.coalesce(ExpenseModel.category["id"].astext, "")
+
+
+def _training_query(workspace_id: str, since: datetime):
+    return select(_category_column(), ExpenseModel.value).where(
+        ExpenseModel.workspace_id == workspace_id,
+        ExpenseModel.value.isnot(None),
+        ExpenseModel.date >= since,
+    )
+
+
+def _features(values) -> np.ndarray:
+    # Escala log: gastos têm cauda longa
+    return np.log1p(np.clip(np.asarray(values, dtype=float), 0, None)).reshape(-1, 1)
+
+
+def _fit_category_models(rows) -> Dict[str, object]:
+    # Import tardio: só o worker carrega o scikit-learn
+    from sklearn.ensemble import IsolationForest
+
+    values_by_category = defaultdict(list)
+    for category_id, value in rows:
+        values_by_category[category_id].append(value)
+
+    models = {}
+    for category_id, values in values_by_category.items():
+        # Com pouco histórico qualquer valor parece atípico
+        if len(values) < ANOMALY_MIN_SAMPLES:
+            continue
+        models[category_id] = IsolationForest(
+            n_estimators=100, contamination=ANOMALY_CONTAMINATION, random_state=0
+        ).fit(_features(values))
+    return models
+
+
+def _workspace_models(db: Session, workspace_id: str) -> Dict[str, object]:
+    models = _model_cache.get(workspace_id)
+    if models is None:
+        since = datetime.utcnow() - timedelta(days=ANOMALY_TRAINING_DAYS)
+        rows = db.execute(_training_query(workspace_id, since)).all()
+        models = _fit_category_models(rows)
+        _model_cache.set(workspace_id, models)
+    return models
+
+
+def _batch_query(expense_ids):
+    return select(
+        ExpenseModel.id,
+        ExpenseModel.workspace_id,
+        _category_column(),
+        ExpenseModel.value,
+    ).where(ExpenseModel.id.in_(expense_ids), ExpenseModel.value.isnot(None))
+
+
+def _duplicates_query(expense_ids):
+    """Pares (despesa, anterior igual): mesmo workspace, valor, dia e descrição."""
+    other = aliased(ExpenseModel)
+    day = func.date_trunc("day", ExpenseModel.date)
+    return (
+        select(ExpenseModel.id, ExpenseModel.workspace_id, other.id)
+        .join(
+            other,
+            and_(
+                other.workspace_id == ExpenseModel.workspace_id,
+                other.date >= day,
+                other.date < day + timedelta(days=1),
+                other.value == ExpenseModel.value,
+                func.lower(func.trim(other.description))
+                == func.lower(func.trim(ExpenseModel.description)),
+                # Só a mais recente do par é marcada
+                tuple_(other.created_at, other.id)
+                < tuple_(ExpenseModel.created_at, ExpenseModel.id),
+            ),
+        )
+        .where(ExpenseModel.id.in_(expense_ids))
+    )
+
+
+def _outlier_flags(db: Session, rows) -> List[dict]:
+    by_group = defaultdict(list)
+    for expense_id, workspace_id, category_id, value in rows:
+        by_group[(str(workspace_id), category_id)].append((expense_id, value))
+
+    flags = []
+    for (workspace_id, category_id), items in by_group.items():
+        model = _workspace_models(db, workspace_id).get(category_id)
+        if model is None:
+            continue
+
+        features = _features([value for _, value in items])
+        predictions = model.predict(features)
+        scores = -model.score_samples(features)  # maior = mais atípico
+        for (expense_id, _), prediction, score in zip(items, predictions, scores):
+            if prediction == -1:
+                flags.append(
+                    {
+                        "expense_id": expense_id,
+                        "kind": OUTLIER,
+                        "workspace_id": workspace_id,
+                        "score": float(score),
+                        "detail": {"categoryId": category_id or None},
+                    }
+                )
+    return flags
+
+
+def _duplicate_flags(db: Session, expense_ids) -> List[dict]:
+    flags = {}
+    for expense_id, workspace_id, other_id in db.execute(_duplicates_query(expense_ids)):
+        flags.setdefault(
+            expense_id,
+            {
+                "expense_id": expense_id,
+                "kind": DUPLICATE,
+                "workspace_id": str(workspace_id),
+                "score": 1.0,
+                "detail": {"duplicateOf": str(other_id)},
+            },
+        )
+    return list(flags.values())
+
+
+def _save_flags(db: Session, flags: List[dict]) -> None:
+    now = datetime.utcnow()
+    stmt = pg_insert(ExpenseFlag).values([{**f, "created_at": now} for f in flags])
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["expense_id", "kind"],
+            set_={
+                "score": stmt.excluded.score,
+                "detail": stmt.excluded.detail,
+                "created_at": stmt.excluded.created_at,
+            },
+        )
+    )
+
+
+def process_scan_batch(db: Session, batch_size: int = ANOMALY_BATCH_SIZE) -> int:
+    """Analisa um lote da fila. Retorna quantas despesas foram processadas.
+
+    SKIP LOCKED permite vários workers em paralelo.
+    """
+    expense_ids = (
+        db.execute(
+            select(ExpenseScanQueue.expense_id)
+            .order_by(ExpenseScanQueue.enqueued_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+    if not expense_ids:
+        return 0
+
+    rows = db.execute(_batch_query(expense_ids)).all()
+    flags = _outlier_flags(db, rows) + _duplicate_flags(db, expense_ids)
+    if flags:
+        _save_flags(db, flags)
+
+    db.execute(
+        delete(ExpenseScanQueue).where(ExpenseScanQueue.expense_id.in_(expense_ids))
+    )
+    db.commit()
+    return len(expense_ids)
+
+
+def _flags_query(workspace_id: str, kind: Optional[str], limit: int):
+    stmt = (
+        select(
+            ExpenseFlag.expense_id,
+            ExpenseFlag.kind,
+            ExpenseFlag.score,
+            ExpenseFlag.detail,
+            ExpenseFlag.created_at,
+            ExpenseModel.name,
+            ExpenseModel.value,
+            ExpenseModel.date,
+        )
+        .join(ExpenseModel, ExpenseModel.id == ExpenseFlag.expense_id)
+        .where(ExpenseFlag.workspace_id == workspace_id)
+    )
+    if kind:
+        stmt = stmt.where(ExpenseFlag.kind == kind)
+    return stmt.order_by(ExpenseFlag.created_at.desc()).limit(limit)
+
+
+def list_expense_flags(
+    workspace_id: str,
+    user_id: str,
+    db: Session,
+    kind: Optional[str] = None,
+    limit: int = 100,
+) -> List[dict]:
+    if not user_has_access_to_workspace(user_id, workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    rows = db.execute(_flags_query(workspace_id, kind, limit)).all()
+    return [
+        {
+            "expenseId": str(row.expense_id),
+            "kind": row.kind,
+            "score": row.score,
+            "detail": row.detail,
+            "createdAt": row.created_at,
+            "name": row.name,
+            "value": row.value,
+            "date": row.date,
+        }
+        for row in rows
+    ]
+
+
+def anomaly_model_cache_stats() -> dict:
+    return _model_cache.stats()
@@ -0,0 +1,220 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import uuid4
+from typing import Optional
+from sqlalchemy import select
+from app.models import Expense as ExpenseModel
+from app.models import Tag as TagModel
+from app.schemas.expense_schema import (
+    ExpenseBulkDelete,
+    ExpenseBulkResult,
+    ExpenseBulkUpdate,
+    ExpenseCreate,
+    Expense,
+    ExpensePage,
+)
+from app.config import EXPENSES_MAX_PAGE_SIZE, EXPENSES_PAGE_SIZE
+from app.services.anomaly_service import enqueue_expense_scan
+from app.services.async_workspaces_service import user_has_access_to_workspace
+from app.services.expenses_service import (
+    _annual_summary_query,
+    _build_annual_summary,
+    _bulk_condition,
+    _bulk_delete_deltas,
+    _bulk_delete_statement,
+    _bulk_result,
+    _bulk_update_deltas,
+    _bulk_update_statement,
+    _bulk_workspaces_query,
+    _check_patch_tag,
+    _patch_values,
+    _expense_by_id_query,
+    _expense_items,
+    _expense_out,
+    _keyset_filter,
+    _workspace_expenses_query,
+)
+from app.services.rollup_service import (
+    expense_delta_statement,
+    rollup_delta_statements,
+)
+from app.utils.http_cache import bump_workspaces
+from app.utils.pagination import encode_cursor
+
+
+async def _apply_expense_delta(db: AsyncSession, expense: ExpenseModel, sign: int = 1):
+    stmt = expense_delta_statement(expense, sign)
+    if stmt is not None:
+        await db.execute(stmt)
+
+
+async def _get_expense(expense_id: str, db: AsyncSession) -> ExpenseModel:
+    result = await db.execute(_expense_by_id_query(expense_id))
+    expense = result.scalars().first()
+    if not expense:
+        raise Exception("Despesa não encontrada.")
+    return expense
+
+
+async def create_expense_service(
+    expense: ExpenseCreate, user_id: str, db: AsyncSession
+) -> Expense:
+    if not await user_has_access_to_workspace(user_id, expense.workspaceId, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    new_expense = ExpenseModel(
+        id=str(uuid4()),
+        user_id=user_id,
+        workspace_id=expense.workspaceId,
+        name=expense.name,
+        value=expense.value,
+        date=expense.date,
+        description=expense.description,
+        color=expense.color,
+        tag_id=expense.tagId,
+        category=expense.category,
+    )
+
+    db.add(new_expense)
+    await _apply_expense_delta(db, new_expense)
+    enqueue_expense_scan(db, new_expense.id, new_expense.workspace_id)
+    await db.commit()
+    bump_workspaces(new_expense.workspace_id)
+
+    db.expunge(new_expense)
+    return _expense_out(await _get_expense(new_expense.id, db))
+
+
+async def get_expenses_by_workspace(
+    workspace_id: str,
+    user_id: str,
+    db: AsyncSession,
+    month: Optional[int] = None,
+    year: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> ExpensePage:
+    if not await user_has_access_to_workspace(user_id, workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    limit = min(max(limit or EXPENSES_PAGE_SIZE, 1), EXPENSES_MAX_PAGE_SIZE)
+    stmt = _workspace_expenses_query(workspace_id, month, year)
+    if cursor:
+        stmt = _keyset_filter(stmt, cursor)
+
+    result = await db.execute(stmt.limit(limit + 1))
+    expenses = result.scalars().all()
+    has_more = len(expenses) > limit
+    expenses = expenses[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = expenses[-1]
+        next_cursor = encode_cursor(last.date, last.id)
+
+    return ExpensePage(items=_expense_items(expenses), nextCursor=next_cursor)
+
+
+async def delete_expense(expense_id: str, user_id: str, db: AsyncSession):
+    expense = await _get_expense(expense_id, db)
+
+    if not await user_has_access_to_workspace(user_id, expense.workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    workspace_id = expense.workspace_id
+    await _apply_expense_delta(db, expense, sign=-1)
+    await db.delete(expense)
+    await db.commit()
+    bump_workspaces(workspace_id)
+
+    return {"detail": "Despesa deletada"}
+
+
+async def update_expense(
+    expense_id: str, data: ExpenseCreate, user_id: str, db: AsyncSession
+) -> Expense:
+    expense = await _get_expense(expense_id, db)
+
+    if not await user_has_access_to_workspace(user_id, expense.workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    await _apply_expense_delta(db, expense, sign=-1)
+
+    expense.name = data.name
+    expense.value = data.value
+    expense.date = data.date
+    expense.description = data.description
+    expense.color = data.color
+    expense.tag_id = data.tagId
+    expense.category = data.category
+
+    await _apply_expense_delta(db, expense)
+    await db.commit()
+    bump_workspaces(expense.workspace_id)
+
+    db.expunge(expense)
+    return _expense_out(await _get_expense(expense_id, db))
+
+
+async def _apply_rollup_deltas(db: AsyncSession, deltas) -> None:
+    for stmt in rollup_delta_statements(deltas):
+        await db.execute(stmt)
+
+
+async def _check_bulk_access(condition, selection, user_id: str, db: AsyncSession):
+    if selection.filter:
+        workspace_ids = [selection.filter.workspaceId]
+    else:
+        result = await db.execute(_bulk_workspaces_query(condition))
+        workspace_ids = result.scalars().all()
+
+    for workspace_id in workspace_ids:
+        if not await user_has_access_to_workspace(user_id, workspace_id, db):
+            raise Exception("Usuário não tem acesso a este workspace.")
+    return workspace_ids
+
+
+async def bulk_update_expenses(
+    data: ExpenseBulkUpdate, user_id: str, db: AsyncSession
+) -> ExpenseBulkResult:
+    condition = _bulk_condition(data)
+    values = _patch_values(data.patch)
+    workspace_ids = await _check_bulk_access(condition, data, user_id, db)
+
+    if values.get("tag_id"):
+        result = await db.execute(
+            select(TagModel.workspace_id).where(TagModel.id == values["tag_id"])
+        )
+        _check_patch_tag(result.scalar(), workspace_ids)
+
+    result = await db.execute(_bulk_update_statement(condition, values))
+    deltas, counts = _bulk_update_deltas(result.all())
+    await _apply_rollup_deltas(db, deltas)
+    await db.commit()
+    bump_workspaces(*counts)
+
+    return _bulk_result(counts)
+
+
+async def bulk_delete_expenses(
+    data: ExpenseBulkDelete, user_id: str, db: AsyncSession
+) -> ExpenseBulkResult:
+    condition = _bulk_condition(data)
+    await _check_bulk_access(condition, data, user_id, db)
+
+    result = await db.execute(_bulk_delete_statement(condition))
+    deltas, counts = _bulk_delete_deltas(result.all())
+    await _apply_rollup_deltas(db, deltas)
+    await db.commit()
+    bump_workspaces(*counts)
+
+    return _bulk_result(counts)
+
+
+async def get_annual_expense_summary(
+    workspace_id: str, year: int, user_id: str, db: AsyncSession
+) -> dict:
+    if not await user_has_access_to_workspace(user_id, workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    result = await db.execute(_annual_summary_query(workspace_id, year))
+    return _build_annual_summary(year, result.all())
@@ -0,0 +1,79 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload
+from uuid import uuid4
+from typing import List
+from app.models import Tag as TagModel
+from app.schemas.tag_schema import TagCreate, Tag
+from app.services.async_workspaces_service import user_has_access_to_workspace
+from app.utils.http_cache import bump_workspaces
+
+
+async def _get_tag(tag_id: str, db: AsyncSession) -> TagModel:
+    result = await db.execute(
+        select(TagModel).options(lazyload("*")).where(TagModel.id == tag_id)
+    )
+    tag = result.scalars().first()
+    if not tag:
+        raise Exception("Tag não encontrada.")
+    return tag
+
+
+async def create_tag_service(tag: TagCreate, user_id: str, db: AsyncSession) -> Tag:
+    if not await user_has_access_to_workspace(user_id, tag.workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    new_tag = TagModel(
+        id=str(uuid4()),
+        name=tag.name,
+        color=tag.color,
+        user_id=user_id,
+        workspace_id=tag.workspace_id,
+    )
+    db.add(new_tag)
+    await db.commit()
+    bump_workspaces(tag.workspace_id)
+    return Tag.model_validate(new_tag)
+
+
+async def get_tags_by_workspace(
+    workspace_id: str, user_id: str, db: AsyncSession
+) -> List[Tag]:
+    if not await user_has_access_to_workspace(user_id, workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    result = await db.execute(
+        select(TagModel)
+        .options(lazyload("*"))
+        .where(TagModel.workspace_id == workspace_id)
+    )
+    return [Tag.model_validate(tag) for tag in result.scalars().all()]
+
+
+async def update_tag_service(
+    tag_id: str, tag_data: TagCreate, user_id: str, db: AsyncSession
+) -> Tag:
+    tag = await _get_tag(tag_id, db)
+
+    if not await user_has_access_to_workspace(user_id, tag.workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    tag.name = tag_data.name
+    tag.color = tag_data.color
+
+    await db.commit()
+    bump_workspaces(tag.workspace_id)
+    return Tag.model_validate(tag)
+
+
+async def delete_tag(tag_id: str, user_id: str, db: AsyncSession) -> dict:
+    tag = await _get_tag(tag_id, db)
+
+    if not await user_has_access_to_workspace(user_id, tag.workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    workspace_id = tag.workspace_id
+    await db.delete(tag)
+    await db.commit()
+    bump_workspaces(workspace_id)
+    return {"detail": "Tag deletada com sucesso"}
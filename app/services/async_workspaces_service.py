@@ -0,0 +1,158 @@
+from typing import List
+from uuid import uuid4
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user_model import User as UserModel
+from app.models.workspace_model import Workspace as WorkspaceModel, workspace_users
+from app.schemas.workspace_schema import WorkspaceCreate, WorkspaceUpdate
+from app.schemas.workspace_schema import Workspace as WorkspaceSchema
+from app.services.email_outbox_service import enqueue_email
+from app.services.workspaces_service import (
+    _access_query,
+    _membership_cache,
+    _workspace_list,
+    _workspace_options,
+    build_workspace_invite_email,
+    invalidate_workspace_access,
+)
+from app.utils.http_cache import bump_users, bump_workspaces
+
+
+async def user_has_access_to_workspace(
+    user_id: str, workspace_id: str, db: AsyncSession
+) -> bool:
+    key = (str(user_id), str(workspace_id))
+    cached = _membership_cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(_access_query(user_id, workspace_id))
+    has_access = bool(result.scalar())
+
+    _membership_cache.set(key, has_access, tags=(("workspace", key[1]),))
+    return has_access
+
+
+async def get_workspace_by_id(workspace_id: str, db: AsyncSession) -> WorkspaceModel:
+    result = await db.execute(
+        select(WorkspaceModel)
+        .options(*_workspace_options())
+        .where(WorkspaceModel.id == workspace_id)
+    )
+    workspace = result.scalars().first()
+    if not workspace:
+        raise HTTPException(status_code=404, detail="Workspace não encontrado")
+    return workspace
+
+
+async def list_user_workspaces(
+    user_id: str, db: AsyncSession
+) -> List[WorkspaceSchema]:
+    joined_ids = select(workspace_users.c.workspace_id).where(
+        workspace_users.c.user_id == user_id
+    )
+    result = await db.execute(
+        select(WorkspaceModel)
+        .options(*_workspace_options())
+        .where(
+            (WorkspaceModel.user_id == user_id)
+            | WorkspaceModel.id.in_(joined_ids)
+        )
+    )
+    return _workspace_list.validate_python(result.scalars().unique().all())
+
+
+async def create_workspace(
+    data: WorkspaceCreate, current_user: UserModel, db: AsyncSession
+):
+    type_value = dict(data.type.model_dump())
+    type_value["id"] = str(type_value["id"])  # garante string
+
+    workspace_id = str(uuid4())
+    db.add(
+        WorkspaceModel(
+            id=workspace_id,
+            name=data.name,
+            color=data.color,
+            icon=data.icon,
+            type=type_value,
+            user_id=current_user.id,
+        )
+    )
+    await db.flush()
+
+    # Define membros (dono + usuários enviados)
+    member_ids = {current_user.id}
+    if data.users:
+        member_ids |= {str(uid) for uid in data.users}
+
+    await db.execute(
+        insert(workspace_users),
+        [{"workspace_id": workspace_id, "user_id": uid} for uid in member_ids],
+    )
+    await db.commit()
+    invalidate_workspace_access(workspace_id)
+    bump_users(*member_ids)
+
+    db.expunge_all()
+    return WorkspaceSchema.model_validate(await get_workspace_by_id(workspace_id, db))
+
+
+async def update_workspace(
+    workspace_id: str, data: WorkspaceUpdate, current_user: UserModel, db: AsyncSession
+):
+    workspace = await get_workspace_by_id(workspace_id, db)
+    if workspace.user_id != current_user.id:
+        raise HTTPException(
+            status_code=403, detail="Apenas o dono pode editar o workspace"
+        )
+
+    for field, value in data.model_dump(exclude_unset=True).items():
+        if field == "type" and value is not None:
+            value = dict(value)
+            value["id"] = str(value.get("id", ""))
+        setattr(workspace, field, value)
+
+    await db.commit()
+    bump_workspaces(workspace_id)
+    return WorkspaceSchema.model_validate(workspace)
+
+
+async def delete_workspace(
+    workspace_id: str, current_user: UserModel, db: AsyncSession
+):
+    workspace = await get_workspace_by_id(workspace_id, db)
+    if workspace.user_id != current_user.id:
+        raise HTTPException(
+            status_code=403, detail="Apenas o dono pode deletar o workspace"
+        )
+
+    workspace.users = []
+    await db.delete(workspace)
+    await db.commit()
+    invalidate_workspace_access(workspace_id)
+
+
+async def add_user_to_workspace(user_id: str, workspace_id: str, db: AsyncSession):
+    await db.execute(
+        insert(workspace_users).values(user_id=user_id, workspace_id=workspace_id)
+    )
+    await db.commit()
+    invalidate_workspace_access(workspace_id)
+    bump_users(user_id)
+
+
+async def send_workspace_invite_email(
+    db: AsyncSession,
+    email: str,
+    workspace_name: str,
+    workspace_id: str,
+    frontend_host: str,
+):
+    # Enviado pelo worker do outbox (app/scripts/email_worker.py)
+    enqueue_email(
+        db,
+        build_workspace_invite_email(email, workspace_name, workspace_id, frontend_host),
+    )
+    await db.commit()
@@ -1,24 +1,32 @@
 from fastapi import HTTPException, status
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
-from app.auth.jwt_handler import (
-    create_access_token,
-    create_refresh_token,
-    verify_access_token,
-)
-from app.config import ALGORITHM, SECRET_KEY
+from app.auth.token_cache import decode_token, evict_user_tokens
+from app.auth.tokens import ACCESS, TokenError, check_not_revoked, create_access_token
 from app.models.user_model import User
-from app.services.users_service import verify_password
+from app.models.loading import IDENTITY_ONLY, user_load_options
+from app.auth.hashing import verify_and_update
+from app.services.refresh_tokens_service import (
+    issue_refresh_token,
+    rotate_refresh_token,
+)
+from app.services.users_service import get_user_by_email, revoke_user_tokens
 
 def login_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.password):
+    user = get_user_by_email(db, email)
+    valid, new_hash = verify_and_update(password, user.password) if user else (False, None)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Email ou senha inválidos"
         )
 
+    # Esquema ou custo mudou: regrava o hash com a configuração atual
+    if new_hash:
+        user.password = new_hash
+        db.commit()
+
     access_token = create_access_token(user.id)  # ID já é str UUID
-    refresh_token = create_refresh_token(user.id)
+    refresh_token = issue_refresh_token(db, user.id)
+    db.commit()
 
     user_data = {
         "id": user.id,
@@ -38,52 +46,50 @@ def login_user(db: Session, email: str, password: str):
     }
 
 def refresh_access_token(db: Session, refresh_token: str):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Token inválido ou expirado",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
-        if payload.get("type") != "refresh":
-            raise credentials_exception
-
-        user_id = payload.get("sub")
-        if not user_id:
-            raise credentials_exception
+    # Não carrega o usuário: a rotação valida tudo pela tabela refresh_tokens
+    user_id, new_refresh_token = rotate_refresh_token(db, refresh_token)
 
-    except JWTError:
-        raise credentials_exception
-
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise credentials_exception
-
-    new_access_token = create_access_token(user.id)
-
-    return {"access_token": new_access_token, "token_type": "bearer"}
+    return {
+        "access_token": create_access_token(user_id),
+        "refresh_token": new_refresh_token,
+        "token_type": "bearer",
+    }
 
 def verify_access(db: Session, token: str) -> User:
     try:
-        payload = verify_access_token(token)
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido"
-            )
-
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Usuário não encontrado",
-            )
+        claims = decode_token(token, expected_types=[ACCESS])
+    except TokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido ou expirado",
+        )
 
-        return user
+    user = (
+        db.query(User)
+        .options(*user_load_options(IDENTITY_ONLY))
+        .filter(User.id == claims.sub)
+        .first()
+    )
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuário não encontrado",
+        )
 
-    except JWTError:
+    try:
+        check_not_revoked(claims, user.tokens_valid_after)
+    except TokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido ou expirado",
         )
+
+    return user
+
+
+def logout_user(db: Session, user_id: str) -> dict:
+    # Encerra todas as sessões: o corte vale para todos os tokens do usuário
+    revoke_user_tokens(db, user_id)
+    db.commit()
+    evict_user_tokens(user_id)
+    return {"message": "Logout realizado com sucesso"}
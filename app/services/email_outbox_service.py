@@ -0,0 +1,138 @@
+import random
+from datetime import datetime, timedelta
+from uuid import uuid4
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config import (
+    BREVO_API_KEY,
+    BREVO_API_URL,
+    EMAIL_MAX_ATTEMPTS,
+    EMAIL_OUTBOX_BATCH_SIZE,
+    EMAIL_OUTBOX_LEASE_SECONDS,
+    EMAIL_RETRY_BASE_SECONDS,
+    EMAIL_RETRY_MAX_SECONDS,
+)
+from app.models import EmailOutbox
+from app.utils.http_client import (
+    CircuitOpenError,
+    OutboundClient,
+    ProviderBusyError,
+    get_client,
+    register_client,
+)
+
+SENDER = {"name": "Expensely", "email": "soniamaradesa@gmail.com"}
+
+register_client("brevo", OutboundClient("brevo"))
+
+
+def enqueue_email(db, payload: dict) -> EmailOutbox:
+    """Adiciona o e-mail ao outbox; o envio acontece quando o caller fizer commit.
+
+    Aceita Session ou AsyncSession (só usa `add`).
+    """
+    message = EmailOutbox(
+        id=str(uuid4()),
+        payload={"sender": SENDER, **payload},
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+    )
+    db.add(message)
+    return message
+
+
+def send_email(payload: dict, url: str = BREVO_API_URL) -> None:
+    headers = {"api-key": BREVO_API_KEY, "Content-Type": "application/json"}
+    response = get_client("brevo").post(url, json=payload, headers=headers)
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.status_code}: {response.text[:500]}")
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    # Backoff exponencial com jitter
+    delay = min(EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1), EMAIL_RETRY_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def _claim_batch(db: Session, batch_size: int) -> list:
+    """Reserva um lote numa transação curta: status "sending" e next_attempt_at
+    como fim da reserva. Se o worker cair no meio, a reserva vence e outro
+    worker reenvia (entrega pelo menos uma vez).
+
+    SKIP LOCKED permite vários workers em paralelo sem reservar o mesmo e-mail.
+    """
+    now = datetime.utcnow()
+    messages = (
+        db.execute(
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status.in_(("pending", "sending")),
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+    lease_until = now + timedelta(seconds=EMAIL_OUTBOX_LEASE_SECONDS)
+    claimed = []
+    for message in messages:
+        message.status = "sending"
+        message.next_attempt_at = lease_until
+        # Lido antes do commit: depois dele o acesso reabriria uma transação
+        claimed.append((message, message.payload))
+    db.commit()
+    return claimed
+
+
+def _release(db: Session, claimed) -> None:
+    # Devolve à fila sem contar tentativa
+    now = datetime.utcnow()
+    for message, _ in claimed:
+        message.status = "pending"
+        message.next_attempt_at = now
+    db.commit()
+
+
+def process_outbox_batch(
+    db: Session, send=send_email, batch_size: int = EMAIL_OUTBOX_BATCH_SIZE
+) -> int:
+    """Envia um lote de e-mails pendentes. Retorna quantos foram processados.
+
+    O envio acontece fora de transação; cada e-mail grava o próprio resultado
+    com um commit curto.
+    """
+    claimed = _claim_batch(db, batch_size)
+    processed = 0
+
+    for index, (message, payload) in enumerate(claimed):
+        try:
+            send(payload)
+        except (CircuitOpenError, ProviderBusyError):
+            # Provedor indisponível: não conta tentativa, o resto do lote
+            # volta para a fila para a próxima rodada
+            _release(db, claimed[index:])
+            break
+        except Exception as e:
+            message.attempts += 1
+            message.last_error = str(e)[:1000]
+            if message.attempts >= EMAIL_MAX_ATTEMPTS:
+                message.status = "dead"  # dead-letter: só reprocessa manualmente
+            else:
+                message.status = "pending"
+                message.next_attempt_at = datetime.utcnow() + _retry_delay(
+                    message.attempts
+                )
+        else:
+            message.attempts += 1
+            message.status = "sent"
+            message.sent_at = datetime.utcnow()
+            message.last_error = None
+        db.commit()
+        processed += 1
+
+    # Devolvidos à fila não contam: com o provedor fora, o worker espera
+    return processed
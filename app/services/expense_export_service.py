@@ -0,0 +1,171 @@
+import csv
+import io
+from datetime import datetime
+from typing import Iterator, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import String, cast, select
+from sqlalchemy.orm import Session
+from app.config import EXPORT_CHUNK_SIZE
+from app.database import SessionLocal
+from app.models import Expense as ExpenseModel
+from app.models import Tag as TagModel
+from app.services.workspaces_service import user_has_access_to_workspace
+
+# Exportação em streaming: as linhas vêm de um cursor no servidor em
+# blocos de EXPORT_CHUNK_SIZE e cada bloco é escrito direto na resposta.
+COLUMNS = [
+    "id",
+    "date",
+    "name",
+    "value",
+    "category_id",
+    "category_name",
+    "tag_id",
+    "tag_name",
+    "user_id",
+    "description",
+    "color",
+]
+
+MEDIA_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def _export_query(
+    workspace_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None
+):
+    # Só as colunas exportadas, sem carregar entidades ORM; tag_id é UUID em
+    # expenses e varchar em tags
+    tag_col = cast(ExpenseModel.tag_id, String)
+    stmt = (
+        select(
+            ExpenseModel.id,
+            ExpenseModel.date,
+            ExpenseModel.name,
+            ExpenseModel.value,
+            ExpenseModel.category["id"].astext,
+            ExpenseModel.category["name"].astext,
+            tag_col,
+            TagModel.name,
+            ExpenseModel.user_id,
+            ExpenseModel.description,
+            ExpenseModel.color,
+        )
+        .outerjoin(TagModel, TagModel.id == tag_col)
+        .where(ExpenseModel.workspace_id == workspace_id)
+    )
+    if start:
+        stmt = stmt.where(ExpenseModel.date >= start)
+    if end:
+        stmt = stmt.where(ExpenseModel.date < end)
+    return stmt.order_by(ExpenseModel.date.asc(), ExpenseModel.id.asc())
+
+
+def _chunks(stmt) -> Iterator[list]:
+    # Sessão própria: a sessão da requisição é fechada antes do streaming
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        for rows in result.partitions():
+            yield rows
+    finally:
+        db.close()
+
+
+def _csv_chunks(stmt) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+
+    for rows in _chunks(stmt):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():  # só o cabeçalho, sem linhas
+        yield buffer.getvalue().encode()
+
+
+class _StreamSink(io.RawIOBase):
+    """Destino de escrita que acumula bytes até serem drenados."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _parquet_chunks(stmt) -> Iterator[bytes]:
+    schema = pa.schema(
+        [
+            ("id", pa.string()),
+            ("date", pa.timestamp("us")),
+            ("name", pa.string()),
+            ("value", pa.float64()),
+            ("category_id", pa.string()),
+            ("category_name", pa.string()),
+            ("tag_id", pa.string()),
+            ("tag_name", pa.string()),
+            ("user_id", pa.string()),
+            ("description", pa.string()),
+            ("color", pa.string()),
+        ]
+    )
+
+    sink = _StreamSink()
+    # Cada bloco vira um row group; só o rodapé depende do arquivo inteiro
+    with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+        for rows in _chunks(stmt):
+            frame = pd.DataFrame.from_records(rows, columns=COLUMNS)
+            for column in ("id", "tag_id", "user_id"):
+                frame[column] = frame[column].map(
+                    lambda v: str(v) if v is not None else None
+                )
+            writer.write_table(
+                pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+            )
+            yield sink.drain()
+    yield sink.drain()
+
+
+def export_expense_rows(
+    workspace_id: str,
+    fmt: str = "csv",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Iterator[bytes]:
+    stmt = _export_query(workspace_id, start, end)
+    if fmt == "parquet":
+        return _parquet_chunks(stmt)
+    return _csv_chunks(stmt)
+
+
+def export_workspace_expenses(
+    workspace_id: str,
+    user_id: str,
+    db: Session,
+    fmt: str = "csv",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Iterator[bytes]:
+    if not user_has_access_to_workspace(user_id, workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    return export_expense_rows(workspace_id, fmt, start, end)
@@ -0,0 +1,280 @@
+import csv
+import io
+import json
+import re
+from datetime import datetime
+from typing import IO, Iterator, Optional, Tuple
+from uuid import uuid4
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config import (
+    IMPORT_COPY_BATCH_SIZE,
+    IMPORT_MAX_REPORTED_ERRORS,
+    IMPORT_MAX_ROWS,
+)
+from app.models import Tag as TagModel
+from app.schemas.expense_schema import ExpenseImportResult, ExpenseImportRow
+from app.services.rollup_service import add_rollup_delta, apply_rollup_deltas
+from app.services.workspaces_service import user_has_access_to_workspace
+from app.utils.http_cache import bump_workspaces
+
+# Importação em lote: o arquivo é lido e validado em streaming e as linhas
+# válidas entram via COPY, tudo numa única transação.
+FORMATS = {
+    ".csv": "csv",
+    ".ofx": "ofx",
+    ".qfx": "ofx",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+COPY_COLUMNS = (
+    "id",
+    "name",
+    "value",
+    "category",
+    "tag_id",
+    "date",
+    "user_id",
+    "description",
+    "color",
+    "workspace_id",
+    "created_at",
+    "updated_at",
+)
+COPY_SQL = f"COPY expenses ({', '.join(COPY_COLUMNS)}) FROM STDIN"
+# As despesas importadas também entram na fila do detector de anomalias
+COPY_SCAN_QUEUE_SQL = (
+    "COPY expense_scan_queue (expense_id, workspace_id, enqueued_at) FROM STDIN"
+)
+
+# Linha bruta: (número da linha no arquivo, campos ou None se ignorada)
+RawRow = Tuple[int, Optional[dict]]
+
+
+def detect_format(filename: Optional[str], fmt: Optional[str] = None) -> str:
+    if fmt:
+        if fmt not in FORMATS.values():
+            raise Exception(f"Formato não suportado: {fmt}")
+        return fmt
+    for extension, name in FORMATS.items():
+        if (filename or "").lower().endswith(extension):
+            return name
+    raise Exception("Não foi possível identificar o formato do arquivo.")
+
+
+def _csv_rows(lines: IO[str]) -> Iterator[RawRow]:
+    reader = csv.DictReader(lines)
+    for row in reader:
+        fields = {k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+        value = fields.get("value")
+        if value and "," in value and "." not in value:
+            fields["value"] = value.replace(",", ".")
+        if "category" in fields:
+            try:
+                fields["category"] = json.loads(fields["category"])
+            except ValueError:
+                pass  # a validação reporta o erro na linha
+        yield reader.line_num, fields
+
+
+def _jsonl_rows(lines: IO[str]) -> Iterator[RawRow]:
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            fields = json.loads(line)
+        except ValueError:
+            fields = None
+        if not isinstance(fields, dict):
+            fields = {"_error": "Linha não é um objeto JSON válido"}
+        yield number, fields
+
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+
+
+def _ofx_date(value: str):
+    digits = re.match(r"\d+", value or "")
+    digits = digits.group(0) if digits else ""
+    for length, pattern in ((14, "%Y%m%d%H%M%S"), (8, "%Y%m%d")):
+        if len(digits) >= length:
+            return datetime.strptime(digits[:length], pattern)
+    return value  # a validação reporta o erro na linha
+
+
+def _ofx_transaction(fields: dict) -> Optional[dict]:
+    try:
+        amount = float(fields.get("TRNAMT", "").replace(",", "."))
+    except ValueError:
+        return {"value": fields.get("TRNAMT"), "date": fields.get("DTPOSTED")}
+
+    # Créditos (valor positivo) não são despesas
+    if amount >= 0:
+        return None
+    return {
+        "name": fields.get("NAME") or fields.get("PAYEE"),
+        "description": fields.get("MEMO", ""),
+        "value": -amount,
+        "date": _ofx_date(fields.get("DTPOSTED", "")),
+    }
+
+
+def _ofx_rows(lines: IO[str]) -> Iterator[RawRow]:
+    # Funciona tanto para OFX 1.x (SGML, sem tags de fechamento) quanto 2.x (XML)
+    current, start = None, 0
+    for number, line in enumerate(lines, 1):
+        for closing, tag, value in _OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    yield start, _ofx_transaction(current)
+                    current = None
+                elif not closing:
+                    current, start = {}, number
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+
+
+PARSERS = {"csv": _csv_rows, "ofx": _ofx_rows, "jsonl": _jsonl_rows}
+
+
+def _copy_field(value) -> str:
+    if value is None:
+        return r"\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_line(values) -> str:
+    return "\t".join(_copy_field(v) for v in values) + "\n"
+
+
+def _copy(db: Session, sql: str, buffer: io.StringIO) -> None:
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(sql, buffer)
+    finally:
+        cursor.close()
+
+
+def _error_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def import_expenses(
+    workspace_id: str,
+    user_id: str,
+    file: IO[bytes],
+    fmt: str,
+    db: Session,
+    encoding: str = "utf-8-sig",
+    atomic: bool = False,
+) -> ExpenseImportResult:
+    """Importa despesas de um arquivo.
+
+    Linhas inválidas são reportadas e ignoradas; com `atomic=True`,
+    qualquer erro desfaz a importação inteira.
+    """
+    if not user_has_access_to_workspace(user_id, workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    tag_ids = set(
+        db.execute(
+            select(TagModel.id).where(TagModel.workspace_id == workspace_id)
+        ).scalars()
+    )
+
+    inserted = skipped = error_count = 0
+    errors = []
+    deltas = {}
+    buffer, queue_buffer = io.StringIO(), io.StringIO()
+    pending = 0
+    now = datetime.utcnow()
+
+    def report(line: int, message: str):
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+            errors.append({"line": line, "error": message})
+
+    lines = io.TextIOWrapper(file, encoding=encoding, errors="replace", newline="")
+    try:
+        for line, fields in PARSERS[fmt](lines):
+            if fields is None:
+                skipped += 1
+                continue
+            if inserted + pending >= IMPORT_MAX_ROWS:
+                report(line, f"Limite de {IMPORT_MAX_ROWS} linhas por importação")
+                break
+            if "_error" in fields:
+                report(line, fields["_error"])
+                continue
+
+            try:
+                row = ExpenseImportRow.model_validate(fields)
+            except ValidationError as e:
+                report(line, _error_message(e))
+                continue
+            if row.tagId and row.tagId not in tag_ids:
+                report(line, "tagId: tag não pertence a este workspace")
+                continue
+
+            expense_id = uuid4()
+            buffer.write(
+                _copy_line(
+                    (
+                        expense_id,
+                        row.name,
+                        row.value,
+                        json.dumps(row.category) if row.category is not None else None,
+                        row.tagId,
+                        row.date.isoformat(),
+                        user_id,
+                        row.description,
+                        row.color,
+                        workspace_id,
+                        now.isoformat(),
+                        now.isoformat(),
+                    )
+                )
+            )
+            queue_buffer.write(_copy_line((expense_id, workspace_id, now.isoformat())))
+            add_rollup_delta(
+                deltas, workspace_id, user_id, row.date, row.category, row.value
+            )
+            pending += 1
+
+            if pending >= IMPORT_COPY_BATCH_SIZE:
+                _copy(db, COPY_SQL, buffer)
+                _copy(db, COPY_SCAN_QUEUE_SQL, queue_buffer)
+                inserted += pending
+                pending = 0
+                buffer, queue_buffer = io.StringIO(), io.StringIO()
+    finally:
+        lines.detach()
+
+    if atomic and error_count:
+        db.rollback()
+        inserted = 0
+    else:
+        if pending:
+            _copy(db, COPY_SQL, buffer)
+            _copy(db, COPY_SCAN_QUEUE_SQL, queue_buffer)
+            inserted += pending
+        apply_rollup_deltas(db, deltas)
+        db.commit()
+        bump_workspaces(workspace_id)
+
+    return ExpenseImportResult(
+        inserted=inserted, skipped=skipped, errorCount=error_count, errors=errors
+    )
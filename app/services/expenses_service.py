@@ -1,10 +1,38 @@
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy import and_, delete, or_, select, tuple_, update
+from sqlalchemy.orm import Session, joinedload, lazyload
 from uuid import uuid4
 from app.models import Expense as ExpenseModel
-from app.schemas.expense_schema import ExpenseCreate, Expense, AnnualExpenseSummary
+from app.models import ExpenseMonthlyRollup as RollupModel
+from app.models import Tag as TagModel
+from app.config import (
+    EXPENSES_BULK_MAX_IDS,
+    EXPENSES_MAX_PAGE_SIZE,
+    EXPENSES_PAGE_SIZE,
+    EXPENSES_STREAM_BATCH_SIZE,
+)
+from app.database import SessionLocal
+from app.schemas.expense_schema import (
+    ExpenseCreate,
+    Expense,
+    ExpensePage,
+    AnnualExpenseSummary,
+    ExpenseBulkDelete,
+    ExpenseBulkResult,
+    ExpenseBulkUpdate,
+    ExpensePatch,
+)
+from app.services.anomaly_service import enqueue_expense_scan
 from app.services.workspaces_service import user_has_access_to_workspace
+from app.services.rollup_service import (
+    add_rollup_delta,
+    apply_expense_delta,
+    apply_rollup_deltas,
+)
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.http_cache import bump_workspaces
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 from collections import defaultdict
 from app.models import User as UserModel
 
@@ -25,14 +53,76 @@ def create_expense_service(
         description=expense.description,
         color=expense.color,
         tag_id=expense.tagId,
-        category_id=expense.category.get("id") if expense.category else None,
+        category=expense.category,
     )
 
     db.add(new_expense)
+    apply_expense_delta(db, new_expense)
+    enqueue_expense_scan(db, new_expense.id, new_expense.workspace_id)
     db.commit()
     db.refresh(new_expense)
+    bump_workspaces(new_expense.workspace_id)
 
-    return Expense.from_orm(new_expense)
+    return _expense_out(new_expense)
+
+
+# Valida a lista inteira de linhas do ORM numa só chamada
+_expense_list = TypeAdapter(List[Expense])
+
+
+def _expense_out(expense: ExpenseModel) -> Expense:
+    return Expense.model_validate(expense, from_attributes=True)
+
+
+def _expense_items(expenses) -> List[Expense]:
+    return _expense_list.validate_python(expenses, from_attributes=True)
+
+
+def _expense_out_options():
+    # Só a despesa e sua tag; o grafo de usuário/workspace não é usado aqui
+    return (lazyload("*"), joinedload(ExpenseModel.tag).lazyload("*"))
+
+
+def _expense_by_id_query(expense_id: str):
+    return (
+        select(ExpenseModel)
+        .options(*_expense_out_options())
+        .where(ExpenseModel.id == expense_id)
+    )
+
+
+def _workspace_expenses_query(
+    workspace_id: str, month: Optional[int] = None, year: Optional[int] = None
+):
+    stmt = (
+        select(ExpenseModel)
+        .options(*_expense_out_options())
+        .where(ExpenseModel.workspace_id == workspace_id)
+    )
+
+    if month and year:
+        start_date = datetime(year, month, 1)
+        end_date = datetime(year + int(month == 12), (month % 12) + 1, 1)
+        stmt = stmt.where(
+            ExpenseModel.date >= start_date, ExpenseModel.date < end_date
+        )
+
+    # Postgres ordena NULLs por último em ASC
+    return stmt.order_by(ExpenseModel.date.asc(), ExpenseModel.id.asc())
+
+
+def _keyset_filter(stmt, cursor: str):
+    """Restringe a consulta ao que vem depois do cursor em (date, id)."""
+    after_date, after_id = decode_cursor(cursor)
+    if after_date is None:
+        return stmt.where(ExpenseModel.date.is_(None), ExpenseModel.id > after_id)
+
+    return stmt.where(
+        or_(
+            tuple_(ExpenseModel.date, ExpenseModel.id) > tuple_(after_date, after_id),
+            ExpenseModel.date.is_(None),
+        )
+    )
 
 
 def get_expenses_by_workspace(
@@ -41,21 +131,59 @@ def get_expenses_by_workspace(
     db: Session,
     month: Optional[int] = None,
     year: Optional[int] = None,
-) -> List[Expense]:
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> ExpensePage:
     if not user_has_access_to_workspace(user_id, workspace_id, db):
         raise Exception("Usuário não tem acesso a este workspace.")
 
-    query = db.query(ExpenseModel).filter(ExpenseModel.workspace_id == workspace_id)
+    limit = min(max(limit or EXPENSES_PAGE_SIZE, 1), EXPENSES_MAX_PAGE_SIZE)
+    stmt = _workspace_expenses_query(workspace_id, month, year)
 
-    if month and year:
-        start_date = datetime(year, month, 1)
-        end_date = datetime(year + int(month == 12), (month % 12) + 1, 1)
-        query = query.filter(
-            ExpenseModel.date >= start_date, ExpenseModel.date < end_date
-        )
+    if cursor:
+        stmt = _keyset_filter(stmt, cursor)
+
+    # Busca um registro a mais para saber se existe próxima página
+    expenses = db.execute(stmt.limit(limit + 1)).scalars().all()
+    has_more = len(expenses) > limit
+    expenses = expenses[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = expenses[-1]
+        next_cursor = encode_cursor(last.date, last.id)
+
+    return ExpensePage(items=_expense_items(expenses), nextCursor=next_cursor)
+
+
+def ndjson_expense_rows(
+    workspace_id: str, month: Optional[int] = None, year: Optional[int] = None
+) -> Iterator[bytes]:
+    """Gera as despesas em NDJSON, lidas via cursor no servidor em lotes."""
+    stmt = _workspace_expenses_query(workspace_id, month, year).execution_options(
+        yield_per=EXPENSES_STREAM_BATCH_SIZE
+    )
+
+    # Sessão própria: a sessão da requisição é fechada antes do streaming
+    stream_db = SessionLocal()
+    try:
+        for expense in stream_db.execute(stmt).scalars():
+            yield _expense_out(expense).model_dump_json().encode() + b"\n"
+    finally:
+        stream_db.close()
+
+
+def stream_workspace_expenses(
+    workspace_id: str,
+    user_id: str,
+    db: Session,
+    month: Optional[int] = None,
+    year: Optional[int] = None,
+) -> Iterator[bytes]:
+    if not user_has_access_to_workspace(user_id, workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
 
-    expenses = query.all()
-    return [Expense.from_orm(e) for e in expenses]
+    return ndjson_expense_rows(workspace_id, month, year)
 
 
 def delete_expense(expense_id: str, user_id: str, db: Session):
@@ -66,8 +194,11 @@ def delete_expense(expense_id: str, user_id: str, db: Session):
     if not user_has_access_to_workspace(user_id, expense.workspace_id, db):
         raise Exception("Usuário não tem acesso a este workspace.")
 
+    workspace_id = expense.workspace_id
+    apply_expense_delta(db, expense, sign=-1)
     db.delete(expense)
     db.commit()
+    bump_workspaces(workspace_id)
 
     return {"detail": "Despesa deletada"}
 
@@ -82,18 +213,228 @@ def update_expense(
     if not user_has_access_to_workspace(user_id, expense.workspace_id, db):
         raise Exception("Usuário não tem acesso a este workspace.")
 
+    apply_expense_delta(db, expense, sign=-1)
+
     expense.name = data.name
     expense.value = data.value
     expense.date = data.date
     expense.description = data.description
     expense.color = data.color
     expense.tag_id = data.tagId
-    expense.category_id = data.category.get("id") if data.category else None
+    expense.category = data.category
 
+    apply_expense_delta(db, expense)
     db.commit()
     db.refresh(expense)
+    bump_workspaces(expense.workspace_id)
+
+    return _expense_out(expense)
+
+
+# Campos do patch -> colunas
+_PATCH_COLUMNS = {
+    "name": "name",
+    "value": "value",
+    "category": "category",
+    "tagId": "tag_id",
+    "date": "date",
+    "description": "description",
+    "color": "color",
+}
+
+
+def _bulk_condition(selection: ExpenseBulkDelete):
+    """Condição WHERE para uma seleção por IDs e/ou filtro."""
+    if not selection.ids and not selection.filter:
+        raise Exception("Informe os IDs ou um filtro.")
+    if selection.ids and len(selection.ids) > EXPENSES_BULK_MAX_IDS:
+        raise Exception(f"No máximo {EXPENSES_BULK_MAX_IDS} IDs por operação.")
+
+    conditions = []
+    if selection.ids:
+        conditions.append(ExpenseModel.id.in_(selection.ids))
+
+    f = selection.filter
+    if f:
+        conditions.append(ExpenseModel.workspace_id == f.workspaceId)
+        if f.startDate:
+            conditions.append(ExpenseModel.date >= f.startDate)
+        if f.endDate:
+            conditions.append(ExpenseModel.date < f.endDate)
+        if f.tagId:
+            conditions.append(ExpenseModel.tag_id == f.tagId)
+        if f.categoryId:
+            conditions.append(ExpenseModel.category["id"].astext == f.categoryId)
+        if f.userId:
+            conditions.append(ExpenseModel.user_id == f.userId)
+
+    return and_(*conditions)
+
+
+def _bulk_workspaces_query(condition):
+    return select(ExpenseModel.workspace_id).where(condition).distinct()
+
+
+def _patch_values(patch: ExpensePatch) -> dict:
+    values = {
+        _PATCH_COLUMNS[field]: value
+        for field, value in patch.model_dump(exclude_unset=True).items()
+    }
+    if not values:
+        raise Exception("Nenhum campo para atualizar.")
+    values["updated_at"] = datetime.utcnow()
+    return values
+
+
+def _check_patch_tag(tag_workspace_id, workspace_ids) -> None:
+    # A tag pertence a um único workspace: todas as despesas precisam ser dele
+    if tag_workspace_id is None or {str(w) for w in workspace_ids} - {
+        str(tag_workspace_id)
+    }:
+        raise Exception("A tag não pertence ao workspace das despesas.")
+
+
+def _bulk_update_statement(condition, values: dict):
+    # O FROM com FOR UPDATE devolve os valores anteriores no RETURNING,
+    # necessários para retirar as despesas antigas do rollup
+    old = (
+        select(
+            ExpenseModel.id,
+            ExpenseModel.workspace_id,
+            ExpenseModel.user_id,
+            ExpenseModel.date,
+            ExpenseModel.category,
+            ExpenseModel.value,
+        )
+        .where(condition)
+        .with_for_update()
+        .subquery("old")
+    )
+    return (
+        update(ExpenseModel)
+        .where(ExpenseModel.id == old.c.id)
+        .values(**values)
+        .returning(
+            old.c.workspace_id,
+            old.c.user_id,
+            old.c.date,
+            old.c.category,
+            old.c.value,
+            ExpenseModel.user_id,
+            ExpenseModel.date,
+            ExpenseModel.category,
+            ExpenseModel.value,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _bulk_delete_statement(condition):
+    return (
+        delete(ExpenseModel)
+        .where(condition)
+        .returning(
+            ExpenseModel.workspace_id,
+            ExpenseModel.user_id,
+            ExpenseModel.date,
+            ExpenseModel.category,
+            ExpenseModel.value,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _bulk_update_deltas(rows):
+    deltas, counts = {}, defaultdict(int)
+    for workspace_id, old_user, old_date, old_category, old_value, *new in rows:
+        new_user, new_date, new_category, new_value = new
+        add_rollup_delta(
+            deltas, workspace_id, old_user, old_date, old_category, old_value, -1
+        )
+        add_rollup_delta(deltas, workspace_id, new_user, new_date, new_category, new_value)
+        counts[str(workspace_id)] += 1
+    return deltas, counts
+
+
+def _bulk_delete_deltas(rows):
+    deltas, counts = {}, defaultdict(int)
+    for workspace_id, user, date, category, value in rows:
+        add_rollup_delta(deltas, workspace_id, user, date, category, value, -1)
+        counts[str(workspace_id)] += 1
+    return deltas, counts
+
+
+def _bulk_result(counts: Dict[str, int]) -> ExpenseBulkResult:
+    return ExpenseBulkResult(affected=sum(counts.values()), byWorkspace=dict(counts))
 
-    return Expense.from_orm(expense)
+
+def _check_bulk_access(condition, selection, user_id: str, db: Session) -> list:
+    """Checa o acesso uma vez por workspace distinto da seleção."""
+    if selection.filter:
+        workspace_ids = [selection.filter.workspaceId]
+    else:
+        workspace_ids = db.execute(_bulk_workspaces_query(condition)).scalars().all()
+
+    for workspace_id in workspace_ids:
+        if not user_has_access_to_workspace(user_id, workspace_id, db):
+            raise Exception("Usuário não tem acesso a este workspace.")
+    return workspace_ids
+
+
+def bulk_update_expenses(
+    data: ExpenseBulkUpdate, user_id: str, db: Session
+) -> ExpenseBulkResult:
+    condition = _bulk_condition(data)
+    values = _patch_values(data.patch)
+    workspace_ids = _check_bulk_access(condition, data, user_id, db)
+
+    if values.get("tag_id"):
+        tag_workspace_id = db.execute(
+            select(TagModel.workspace_id).where(TagModel.id == values["tag_id"])
+        ).scalar()
+        _check_patch_tag(tag_workspace_id, workspace_ids)
+
+    rows = db.execute(_bulk_update_statement(condition, values)).all()
+    deltas, counts = _bulk_update_deltas(rows)
+    apply_rollup_deltas(db, deltas)
+    db.commit()
+    bump_workspaces(*counts)
+
+    return _bulk_result(counts)
+
+
+def bulk_delete_expenses(
+    data: ExpenseBulkDelete, user_id: str, db: Session
+) -> ExpenseBulkResult:
+    condition = _bulk_condition(data)
+    _check_bulk_access(condition, data, user_id, db)
+
+    rows = db.execute(_bulk_delete_statement(condition)).all()
+    deltas, counts = _bulk_delete_deltas(rows)
+    apply_rollup_deltas(db, deltas)
+    db.commit()
+    bump_workspaces(*counts)
+
+    return _bulk_result(counts)
+
+
+def _annual_summary_query(workspace_id: str, year: int):
+    # Lê do rollup mensal em vez da tabela expenses
+    return (
+        select(
+            RollupModel.month,
+            RollupModel.category_id,
+            RollupModel.user_id,
+            UserModel.name,
+            RollupModel.total,
+        )
+        .outerjoin(UserModel, UserModel.id == RollupModel.user_id)
+        .where(
+            RollupModel.workspace_id == workspace_id,
+            RollupModel.year == year,
+            RollupModel.count > 0,
+        )
+    )
 
 
 def get_annual_expense_summary(
@@ -102,51 +443,31 @@ def get_annual_expense_summary(
     if not user_has_access_to_workspace(user_id, workspace_id, db):
         raise Exception("Usuário não tem acesso a este workspace.")
 
-    start_date = datetime(year, 1, 1)
-    end_date = datetime(year, 12, 31, 23, 59, 59)
+    stmt = _annual_summary_query(workspace_id, year)
+    return _build_annual_summary(year, db.execute(stmt).all())
 
-    expenses = (
-        db.query(ExpenseModel)
-        .filter(
-            ExpenseModel.workspace_id == workspace_id,
-            ExpenseModel.date >= start_date,
-            ExpenseModel.date <= end_date,
-        )
-        .all()
-    )
 
+def _build_annual_summary(year: int, rows) -> dict:
     result = defaultdict(lambda: {"total": 0.0})
 
-    for item in expenses:
-        month = item.date.strftime("%B").lower()
-        category_id = item.category_id or "Sem Categoria"
+    for month_number, category_id, row_user_id, user_name, total in rows:
+        month = datetime(year, int(month_number), 1).strftime("%B").lower()
+        category_id = category_id or "Sem Categoria"
+        total = float(total or 0)
 
         if category_id not in result[month]:
             result[month][category_id] = {"itens": [], "total": 0.0}
 
-        user_entry = next(
-            (
-                e
-                for e in result[month][category_id]["itens"]
-                if e["user"]["id"] == item.user_id
-            ),
-            None,
+        result[month][category_id]["itens"].append(
+            {
+                "user": {
+                    "id": str(row_user_id),
+                    "name": user_name or "Desconhecido",
+                },
+                "total": total,
+            }
         )
-
-        if user_entry:
-            user_entry["total"] += item.value or 0
-        else:
-            result[month][category_id]["itens"].append(
-                {
-                    "user": {
-                        "id": item.user_id,
-                        "name": item.user.name if item.user else "Desconhecido",
-                    },
-                    "total": item.value or 0,
-                }
-            )
-
-        result[month][category_id]["total"] += item.value or 0
-        result[month]["total"] += item.value or 0
+        result[month][category_id]["total"] += total
+        result[month]["total"] += total
 
     return result
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.config import (
+    FORECAST_CACHE_SIZE,
+    FORECAST_MAX_MONTHS,
+    FORECAST_MAX_PENDING,
+    FORECAST_MIN_MONTHS,
+    FORECAST_QUEUE_TIMEOUT,
+    FORECAST_WORKERS,
+)
+from app.models import ExpenseMonthlyRollup as RollupModel
+from app.services.workspaces_service import user_has_access_to_workspace
+from app.utils.cache import TTLCache
+
+# Previsão mensal de gastos com Prophet. A série vem do rollup mensal e o
+# ajuste roda em processos separados. O cache é indexado pela marca d'água
+# (digest da série): o modelo só é reajustado quando os dados mudam.
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(FORECAST_MAX_PENDING)
+
+# (workspace_id, category_id, marca d'água) -> previsão até FORECAST_MAX_MONTHS
+_forecast_cache = TTLCache(maxsize=FORECAST_CACHE_SIZE, ttl=7 * 24 * 3600)
+
+# Ajustes em andamento: requisições simultâneas para a mesma chave esperam o mesmo
+_inflight: Dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
+Series = List[Tuple[str, float]]
+
+
+def _series_query(workspace_id: str, category_id: Optional[str] = None):
+    stmt = (
+        select(RollupModel.year, RollupModel.month, func.sum(RollupModel.total))
+        .where(RollupModel.workspace_id == workspace_id, RollupModel.count > 0)
+        .group_by(RollupModel.year, RollupModel.month)
+    )
+    if category_id is not None:
+        stmt = stmt.where(RollupModel.category_id == category_id)
+    return stmt
+
+
+def _monthly_series(rows, today: datetime) -> Series:
+    """Série contínua (meses sem gasto = 0) até o último mês completo."""
+    totals = {(int(year), int(month)): float(total or 0) for year, month, total in rows}
+    if not totals:
+        return []
+
+    year, month = min(totals)
+    # O mês corrente ainda está incompleto: fica de fora do ajuste
+    last = (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+    series = []
+    while (year, month) <= last:
+        series.append((f"{year:04d}-{month:02d}-01", totals.get((year, month), 0.0)))
+        year, month = (year, month + 1) if month < 12 else (year + 1, 1)
+    return series
+
+
+def _watermark(series: Series) -> str:
+    return hashlib.sha256(json.dumps(series).encode()).hexdigest()
+
+
+def _fit_job(series: Series, periods: int) -> List[dict]:
+    # Import no worker: o Prophet (e o Stan) não é carregado nos processos da API
+    import pandas as pd
+    from prophet import Prophet
+
+    frame = pd.DataFrame(series, columns=["ds", "y"])
+    frame["ds"] = pd.to_datetime(frame["ds"])
+
+    model = Prophet(
+        yearly_seasonality=len(frame) >= 24,
+        weekly_seasonality=False,
+        daily_seasonality=False,
+    )
+    model.fit(frame)
+
+    future = model.make_future_dataframe(
+        periods=periods, freq="MS", include_history=False
+    )
+    forecast = model.predict(future)
+    return [
+        {
+            "month": ds.strftime("%Y-%m"),
+            "value": max(float(yhat), 0.0),
+            "lower": max(float(lower), 0.0),
+            "upper": max(float(upper), 0.0),
+        }
+        for ds, yhat, lower, upper in zip(
+            forecast["ds"], forecast["yhat"], forecast["yhat_lower"], forecast["yhat_upper"]
+        )
+    ]
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=FORECAST_WORKERS)
+        return _executor
+
+
+def _fit(key: tuple, series: Series) -> List[dict]:
+    with _inflight_lock:
+        future = _inflight.get(key)
+
+    owner = False
+    if future is None:
+        # Back-pressure: no máximo FORECAST_MAX_PENDING ajustes na fila. A
+        # espera pela vaga fica fora do lock, para não travar quem só vai
+        # aguardar um ajuste já em andamento.
+        if not _slots.acquire(timeout=FORECAST_QUEUE_TIMEOUT):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado, tente novamente em instantes.",
+                headers={"Retry-After": "5"},
+            )
+        try:
+            # Enquanto esperava, outra requisição pode ter começado ou
+            # concluído o mesmo ajuste
+            with _inflight_lock:
+                future = _inflight.get(key)
+                cached = _forecast_cache.get(key) if future is None else None
+                if future is None and cached is None:
+                    future = _get_executor().submit(
+                        _fit_job, series, FORECAST_MAX_MONTHS
+                    )
+                    _inflight[key] = future
+                    owner = True
+        finally:
+            if not owner:
+                _slots.release()
+        if cached is not None:
+            return cached
+
+    try:
+        forecast = future.result()
+        if owner:
+            # No cache antes de sair de _inflight: a nova checagem acima não
+            # encontra uma janela sem nenhum dos dois
+            _forecast_cache.set(key, forecast)
+    finally:
+        if owner:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+            _slots.release()
+    return forecast
+
+
+def get_expense_forecast(
+    workspace_id: str,
+    user_id: str,
+    db: Session,
+    category_id: Optional[str] = None,
+    months: int = 6,
+) -> dict:
+    if not user_has_access_to_workspace(user_id, workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    rows = db.execute(_series_query(workspace_id, category_id)).all()
+    series = _monthly_series(rows, datetime.utcnow())
+    if len(series) < FORECAST_MIN_MONTHS:
+        raise Exception(
+            f"São necessários pelo menos {FORECAST_MIN_MONTHS} meses de histórico."
+        )
+
+    key = (workspace_id, category_id, _watermark(series))
+    forecast = _forecast_cache.get(key)
+    if forecast is None:
+        forecast = _fit(key, series)
+
+    return {
+        "workspaceId": workspace_id,
+        "categoryId": category_id,
+        "historyMonths": len(series),
+        "points": forecast[: min(months, FORECAST_MAX_MONTHS)],
+    }
+
+
+def forecast_cache_stats() -> dict:
+    return _forecast_cache.stats()
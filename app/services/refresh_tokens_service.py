@@ -0,0 +1,107 @@
+import hashlib
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+from app.auth.tokens import REFRESH, TokenError, create_refresh_token, decode_token
+from app.config import REFRESH_TOKEN_EXPIRE_MINUTES
+from app.models import RefreshToken
+
+
+def _hash(jti: str) -> str:
+    return hashlib.sha256(jti.encode()).hexdigest()
+
+
+def issue_refresh_token(
+    db: Session, user_id: str, family_id: Optional[str] = None
+) -> str:
+    """Cria um refresh token e seu registro. Não faz commit."""
+    jti = uuid.uuid4().hex
+    family_id = family_id or uuid.uuid4().hex
+    db.execute(
+        insert(RefreshToken).values(
+            token_hash=_hash(jti),
+            family_id=family_id,
+            user_id=str(user_id),
+            expires_at=datetime.utcnow()
+            + timedelta(minutes=REFRESH_TOKEN_EXPIRE_MINUTES),
+            revoked=False,
+        )
+    )
+    return create_refresh_token(user_id, jti=jti, family_id=family_id)
+
+
+def rotate_refresh_token(db: Session, refresh_token: str) -> Tuple[str, str]:
+    """Consome o refresh token e devolve (user_id, novo refresh token).
+
+    Um token já usado (ou revogado) indica vazamento: a família inteira
+    é revogada.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token inválido ou expirado",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    try:
+        claims = decode_token(refresh_token, expected_types=[REFRESH])
+    except TokenError:
+        raise credentials_exception
+    if not claims.jti:
+        raise credentials_exception
+
+    token_hash = _hash(claims.jti)
+    now = datetime.utcnow()
+
+    # Marca como usado atomicamente; só uma requisição concorrente vence
+    consumed = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked.is_(False),
+            RefreshToken.expires_at > now,
+        )
+        .values(used_at=now)
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+    ).first()
+
+    if consumed is None:
+        family_id = db.execute(
+            select(RefreshToken.family_id).where(RefreshToken.token_hash == token_hash)
+        ).scalar()
+        if family_id is not None:
+            revoke_family(db, family_id)
+            db.commit()
+        raise credentials_exception
+
+    user_id, family_id = consumed
+    new_token = issue_refresh_token(db, user_id, family_id)
+    db.commit()
+    return user_id, new_token
+
+
+def revoke_family(db: Session, family_id: str) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id)
+        .values(revoked=True)
+    )
+
+
+def revoke_user_refresh_tokens(db: Session, user_id: str) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == str(user_id), RefreshToken.revoked.is_(False))
+        .values(revoked=True)
+    )
+
+
+def purge_expired_refresh_tokens(db: Session) -> int:
+    result = db.execute(
+        delete(RefreshToken).where(RefreshToken.expires_at <= datetime.utcnow())
+    )
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,145 @@
+from typing import Dict, List, Tuple
+from sqlalchemy import Integer, String, cast, delete, extract, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.models import Expense as ExpenseModel
+from app.models import ExpenseMonthlyRollup as RollupModel
+
+ROLLUP_KEY = ["workspace_id", "year", "month", "category_id", "user_id"]
+
+
+def _category_id(category) -> str:
+    if category and category.get("id") is not None:
+        return str(category["id"])
+    return ""
+
+
+def _upsert_statement(values):
+    stmt = pg_insert(RollupModel).values(values)
+    return stmt.on_conflict_do_update(
+        index_elements=ROLLUP_KEY,
+        set_={
+            "total": RollupModel.total + stmt.excluded.total,
+            "count": RollupModel.count + stmt.excluded.count,
+        },
+    )
+
+
+def expense_delta_statement(expense: ExpenseModel, sign: int = 1):
+    """Upsert que soma (sign=1) ou subtrai (sign=-1) uma despesa do rollup."""
+    if expense.date is None:
+        return None
+
+    return _upsert_statement(
+        dict(
+            workspace_id=str(expense.workspace_id),
+            year=expense.date.year,
+            month=expense.date.month,
+            category_id=_category_id(expense.category),
+            user_id=str(expense.user_id),
+            total=sign * (expense.value or 0),
+            count=sign,
+        )
+    )
+
+
+RollupDeltas = Dict[Tuple[str, int, int, str, str], List[float]]
+
+
+def add_rollup_delta(
+    deltas: RollupDeltas, workspace_id, user_id, date, category, value, sign: int = 1
+) -> None:
+    """Acumula em memória o delta de uma despesa (para escritas em lote)."""
+    if date is None:
+        return
+    key = (str(workspace_id), date.year, date.month, _category_id(category), str(user_id))
+    delta = deltas.setdefault(key, [0.0, 0])
+    delta[0] += sign * (value or 0)
+    delta[1] += sign
+
+
+def rollup_delta_statements(deltas: RollupDeltas, batch_size: int = 1000):
+    """Upserts multi-linha para deltas acumulados."""
+    values = [
+        dict(zip(ROLLUP_KEY, key), total=total, count=count)
+        for key, (total, count) in deltas.items()
+        if count or total
+    ]
+    return [
+        _upsert_statement(values[start : start + batch_size])
+        for start in range(0, len(values), batch_size)
+    ]
+
+
+def apply_rollup_deltas(db: Session, deltas: RollupDeltas):
+    """Não faz commit: deve rodar na mesma transação da escrita em lote."""
+    for stmt in rollup_delta_statements(deltas):
+        db.execute(stmt)
+
+
+def apply_expense_delta(db: Session, expense: ExpenseModel, sign: int = 1):
+    """Não faz commit: deve rodar na mesma transação da escrita da despesa."""
+    stmt = expense_delta_statement(expense, sign)
+    if stmt is not None:
+        db.execute(stmt)
+
+
+def _source_query():
+    """Rollup calculado diretamente a partir da tabela expenses."""
+    workspace_col = cast(ExpenseModel.workspace_id, String)
+    year_col = cast(extract("year", ExpenseModel.date), Integer)
+    month_col = cast(extract("month", ExpenseModel.date), Integer)
+    category_col = func.coalesce(ExpenseModel.category["id"].astext, "")
+    user_col = cast(ExpenseModel.user_id, String)
+
+    return (
+        select(
+            workspace_col,
+            year_col,
+            month_col,
+            category_col,
+            user_col,
+            func.coalesce(func.sum(ExpenseModel.value), 0),
+            func.count(),
+        )
+        .where(ExpenseModel.date.isnot(None))
+        .group_by(workspace_col, year_col, month_col, category_col, user_col)
+    )
+
+
+def rebuild_rollup(db: Session):
+    db.execute(delete(RollupModel))
+    db.execute(
+        insert(RollupModel).from_select(
+            ROLLUP_KEY + ["total", "count"], _source_query()
+        )
+    )
+    db.commit()
+
+
+def verify_rollup(db: Session, tolerance: float = 0.005) -> List[dict]:
+    """Compara o rollup com o recálculo a partir de expenses e lista divergências."""
+    expected = {
+        tuple(row[:5]): (float(row[5]), int(row[6]))
+        for row in db.execute(_source_query()).all()
+    }
+    actual = {
+        (r.workspace_id, r.year, r.month, r.category_id, r.user_id): (r.total, r.count)
+        for r in db.query(RollupModel).filter(RollupModel.count != 0).all()
+    }
+
+    drift = []
+    for key in expected.keys() | actual.keys():
+        exp_total, exp_count = expected.get(key, (0.0, 0))
+        act_total, act_count = actual.get(key, (0.0, 0))
+        if exp_count != act_count or abs(exp_total - act_total) > tolerance:
+            drift.append(
+                {
+                    **dict(zip(ROLLUP_KEY, key)),
+                    "expected_total": exp_total,
+                    "actual_total": act_total,
+                    "expected_count": exp_count,
+                    "actual_count": act_count,
+                }
+            )
+    return drift
@@ -0,0 +1,270 @@
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+from app.config import (
+    SUGGEST_CACHE_SIZE,
+    SUGGEST_CHECK_SECONDS,
+    SUGGEST_MIN_ROWS,
+    SUGGEST_MODEL_TTL_SECONDS,
+    SUGGEST_RETRAIN_MIN_NEW_ROWS,
+    SUGGEST_TRAIN_WORKERS,
+    SUGGEST_TRAINING_ROWS,
+)
+from app.database import SessionLocal
+from app.models import Expense as ExpenseModel
+from app.services.workspaces_service import user_has_access_to_workspace
+from app.utils.cache import TTLCache
+from app.utils.metrics import Histogram
+
+# Sugestão de tag e categoria a partir de nome + descrição: TF-IDF sobre
+# features com hashing e um classificador linear por workspace. O treino
+# roda em outro processo; a inferência (uma linha) fica no processo da API.
+# Nenhuma requisição espera treino: sem modelo pronto, a resposta vem vazia.
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+# Threads que leem os dados de treino e acompanham o job, fora das requisições
+_loader: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Um modelo com mais de SUGGEST_MODEL_TTL_SECONDS continua servindo enquanto
+# o novo treina; só workspaces sem uso por 2x esse tempo saem do cache
+_models = TTLCache(maxsize=SUGGEST_CACHE_SIZE, ttl=2 * SUGGEST_MODEL_TTL_SECONDS)
+# Workspaces com treino em andamento
+_training: Set[str] = set()
+_training_lock = threading.Lock()
+
+_inference_ms = Histogram()
+
+
+@dataclass
+class _WorkspaceModels:
+    tag_model: Optional[object]
+    category_model: Optional[object]
+    categories: Dict[str, dict]  # id -> último objeto de categoria visto
+    labeled_rows: int
+    trained_at: float
+    checked_at: float
+
+
+def _labeled_condition():
+    return or_(ExpenseModel.tag_id.isnot(None), ExpenseModel.category.isnot(None))
+
+
+def _labeled_count_query(workspace_id: str):
+    return select(func.count()).where(
+        ExpenseModel.workspace_id == workspace_id, _labeled_condition()
+    )
+
+
+def _training_query(workspace_id: str):
+    return (
+        select(
+            ExpenseModel.name,
+            ExpenseModel.description,
+            ExpenseModel.tag_id,
+            ExpenseModel.category,
+        )
+        .where(ExpenseModel.workspace_id == workspace_id, _labeled_condition())
+        .order_by(ExpenseModel.created_at.desc())
+        .limit(SUGGEST_TRAINING_ROWS)
+    )
+
+
+def _text(name: Optional[str], description: Optional[str]) -> str:
+    return f"{name or ''} {description or ''}".strip()
+
+
+def _fit_labels(texts: List[str], labels: List[Optional[str]]):
+    # Import tardio: o treino roda no processo do pool
+    import numpy as np
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.pipeline import make_pipeline
+
+    pairs = [(t, l) for t, l in zip(texts, labels) if l is not None and t]
+    if len(pairs) < SUGGEST_MIN_ROWS or len({l for _, l in pairs}) < 2:
+        return None
+
+    x, y = zip(*pairs)
+    pipeline = make_pipeline(
+        HashingVectorizer(
+            n_features=2**18,
+            alternate_sign=False,
+            ngram_range=(1, 2),
+            strip_accents="unicode",
+        ),
+        TfidfTransformer(),
+        SGDClassifier(loss="log_loss", alpha=1e-5, random_state=0),
+    ).fit(x, y)
+    # A inferência multiplica a linha esparsa por coef_.T; em ordem C, o scipy
+    # copiava a matriz inteira (classes x 2**18) a cada chamada
+    classifier = pipeline[-1]
+    classifier.coef_ = np.asfortranarray(classifier.coef_)
+    return pipeline
+
+
+def _train_job(texts, tag_labels, category_labels):
+    # Roda no processo de treino; o pipeline volta serializado (pickle)
+    return _fit_labels(texts, tag_labels), _fit_labels(texts, category_labels)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=SUGGEST_TRAIN_WORKERS)
+        return _executor
+
+
+def _get_loader() -> ThreadPoolExecutor:
+    global _loader
+    with _executor_lock:
+        if _loader is None:
+            _loader = ThreadPoolExecutor(
+                max_workers=SUGGEST_TRAIN_WORKERS, thread_name_prefix="suggest-train"
+            )
+        return _loader
+
+
+def _training_data(db: Session, workspace_id: str):
+    rows = db.execute(_training_query(workspace_id)).all()
+    labeled_rows = db.execute(_labeled_count_query(workspace_id)).scalar()
+
+    texts, tags, category_ids, categories = [], [], [], {}
+    for name, description, tag_id, category in rows:
+        texts.append(_text(name, description))
+        tags.append(str(tag_id) if tag_id else None)
+        category_id = (
+            str(category["id"]) if category and category.get("id") is not None else None
+        )
+        category_ids.append(category_id)
+        if category_id is not None:
+            categories.setdefault(category_id, category)  # mais recente primeiro
+    return (texts, tags, category_ids), categories, labeled_rows
+
+
+def _train(workspace_id: str) -> None:
+    """Roda numa thread do _loader: lê os dados, treina no pool e guarda."""
+    try:
+        db = SessionLocal()
+        try:
+            job_args, categories, labeled_rows = _training_data(db, workspace_id)
+        finally:
+            db.close()
+
+        tag_model, category_model = (
+            _get_executor().submit(_train_job, *job_args).result()
+        )
+        now = time.monotonic()
+        _models.set(
+            workspace_id,
+            _WorkspaceModels(
+                tag_model, category_model, categories, labeled_rows, now, now
+            ),
+        )
+    except Exception:
+        logger.exception("Falha ao treinar sugestões do workspace %s", workspace_id)
+    finally:
+        with _training_lock:
+            _training.discard(workspace_id)
+
+
+def _start_training(workspace_id: str) -> None:
+    with _training_lock:
+        if workspace_id in _training:
+            return
+        _training.add(workspace_id)
+    _get_loader().submit(_train, workspace_id)
+
+
+def _workspace_models(db: Session, workspace_id: str) -> Optional[_WorkspaceModels]:
+    models = _models.get(workspace_id)
+    if models is None:
+        # Primeiro uso (ou workspace ocioso): aquece em segundo plano
+        _start_training(workspace_id)
+        return None
+
+    now = time.monotonic()
+    if now - models.trained_at >= SUGGEST_MODEL_TTL_SECONDS:
+        _start_training(workspace_id)
+    elif now - models.checked_at >= SUGGEST_CHECK_SECONDS:
+        # Confere de tempos em tempos se chegaram linhas rotuladas suficientes
+        models.checked_at = now
+        labeled_rows = db.execute(_labeled_count_query(workspace_id)).scalar()
+        if labeled_rows - models.labeled_rows >= SUGGEST_RETRAIN_MIN_NEW_ROWS:
+            _start_training(workspace_id)
+    return models
+
+
+def _features(models: _WorkspaceModels, text: str):
+    # Os dois pipelines usam o mesmo HashingVectorizer (sem estado): o texto
+    # é vetorizado uma vez para tag e categoria
+    model = models.tag_model if models.tag_model is not None else models.category_model
+    if model is None or not text:
+        return None
+    return model[0].transform([text])
+
+
+def _top(model, features, limit: int) -> List[tuple]:
+    if model is None or features is None:
+        return []
+    probabilities = model[1:].predict_proba(features)[0]
+    ranked = probabilities.argsort()[::-1][:limit]
+    return [(model.classes_[i], float(probabilities[i])) for i in ranked]
+
+
+def _infer(models: _WorkspaceModels, text: str, limit: int):
+    """(tags, categorias) mais prováveis para uma linha."""
+    from sklearn import config_context
+
+    # Entrada gerada aqui: a validação do sklearn custava metade da inferência
+    with config_context(assume_finite=True, skip_parameter_validation=True):
+        features = _features(models, text)
+        return (
+            _top(models.tag_model, features, limit),
+            _top(models.category_model, features, limit),
+        )
+
+
+def suggest_tag_and_category(
+    workspace_id: str,
+    user_id: str,
+    db: Session,
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    limit: int = 3,
+) -> dict:
+    if not user_has_access_to_workspace(user_id, workspace_id, db):
+        raise Exception("Usuário não tem acesso a este workspace.")
+
+    models = _workspace_models(db, workspace_id)
+    if models is None:
+        return {"tags": [], "categories": []}
+
+    start = time.perf_counter()
+    tags, categories = _infer(models, _text(name, description), limit)
+    _inference_ms.observe((time.perf_counter() - start) * 1000)
+
+    return {
+        "tags": [{"tagId": tag_id, "confidence": p} for tag_id, p in tags],
+        "categories": [
+            {"category": models.categories[category_id], "confidence": p}
+            for category_id, p in categories
+        ],
+    }
+
+
+def suggestion_stats() -> dict:
+    with _training_lock:
+        training = len(_training)
+    return {
+        "models": _models.stats(),
+        "training": training,
+        "inference_ms": _inference_ms.snapshot(),
+    }
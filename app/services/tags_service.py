@@ -4,6 +4,7 @@ from typing import List
 from app.models import Tag as TagModel
 from app.schemas.tag_schema import TagCreate, Tag
 from app.services.workspaces_service import user_has_access_to_workspace
+from app.utils.http_cache import bump_workspaces
 
 
 def create_tag_service(tag: TagCreate, user_id: str, db: Session) -> Tag:
@@ -19,8 +20,9 @@ def create_tag_service(tag: TagCreate, user_id: str, db: Session) -> Tag:
     )
     db.add(new_tag)
     db.commit()
+    bump_workspaces(tag.workspace_id)
     db.refresh(new_tag)
-    return Tag.from_orm(new_tag)
+    return Tag.model_validate(new_tag)
 
 
 def get_tags_by_workspace(workspace_id: str, user_id: str, db: Session) -> List[Tag]:
@@ -28,7 +30,7 @@ def get_tags_by_workspace(workspace_id: str, user_id: str, db: Session) -> List[
         raise Exception("Usuário não tem acesso a este workspace.")
 
     tags = db.query(TagModel).filter(TagModel.workspace_id == workspace_id).all()
-    return [Tag.from_orm(tag) for tag in tags]
+    return [Tag.model_validate(tag) for tag in tags]
 
 
 def update_tag_service(tag_id: str, tag_data: TagCreate, user_id: str, db: Session) -> Tag:
@@ -44,7 +46,8 @@ def update_tag_service(tag_id: str, tag_data: TagCreate, user_id: str, db: Sessi
 
     db.commit()
     db.refresh(tag)
-    return Tag.from_orm(tag)
+    bump_workspaces(tag.workspace_id)
+    return Tag.model_validate(tag)
 
 
 def delete_tag(tag_id: str, user_id: str, db: Session) -> dict:
@@ -55,6 +58,8 @@ def delete_tag(tag_id: str, user_id: str, db: Session) -> dict:
     if not user_has_access_to_workspace(user_id, tag.workspace_id, db):
         raise Exception("Usuário não tem acesso a este workspace.")
 
+    workspace_id = tag.workspace_id
     db.delete(tag)
     db.commit()
+    bump_workspaces(workspace_id)
     return {"detail": "Tag deletada com sucesso"}
@@ -1,37 +1,46 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 from app.database import SessionLocal
 from app.models.user_model import User
-from datetime import datetime, timedelta
-from jose import jwt
+from app.models.loading import IDENTITY_ONLY, user_load_options
 from typing import Optional
-from app.config import SECRET_KEY, ALGORITHM, RESET_TOKEN_EXPIRE_MINUTES, BREVO_API_KEY
-import requests
+from app.config import RESET_TOKEN_EXPIRE_MINUTES
 from sqlalchemy.exc import IntegrityError
-from app.config import pwd_context
+from app.auth.hashing import hash_password, verify_password
+from app.auth.token_cache import evict_user_tokens
+from app.auth.tokens import create_reset_token
+from app.services.email_outbox_service import enqueue_email
+from app.services.refresh_tokens_service import revoke_user_refresh_tokens
+from app.services.workspaces_service import user_workspace_ids
+from app.utils.http_cache import bump_users, bump_workspaces
 from app.schemas.user_schema import PasswordChange
-from app.utils.hash import get_password_hash
 from uuid import uuid4
+from datetime import datetime
+
+def get_user_by_email(
+    db: Session, email: str, profile: str = IDENTITY_ONLY
+) -> Optional[User]:
+    return (
+        db.query(User)
+        .options(*user_load_options(profile))
+        .filter(User.email == email)
+        .first()
+    )
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    return db.query(User).filter(User.email == email).first()
-
-def get_user_by_id(db: Session, user_id: str) -> User:
-    user = db.query(User).filter(User.id == user_id).first()
+def get_user_by_id(db: Session, user_id: str, profile: str = IDENTITY_ONLY) -> User:
+    user = (
+        db.query(User)
+        .options(*user_load_options(profile))
+        .filter(User.id == user_id)
+        .first()
+    )
     if not user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     return user
 
 
 def get_all_users(db: Session):
-    return db.query(User).all()
+    return db.query(User).options(*user_load_options(IDENTITY_ONLY)).all()
 
 
 def create_user(user_data: dict):
@@ -55,7 +64,7 @@ def create_user(user_data: dict):
             )
 
         # Hash da senha
-        hashed_password = pwd_context.hash(user_data["password"])
+        hashed_password = hash_password(user_data["password"])
 
         # Cria usuário com UUID
         db_user = User(
@@ -110,16 +119,34 @@ def create_user(user_data: dict):
 def update_user(db: Session, user_id: str, update_data: dict) -> User:
     user = get_user_by_id(db, user_id)
     for key, value in update_data.items():
+        # O corte de revogação só muda por revoke_user_tokens
+        if key == "tokens_valid_after":
+            continue
         setattr(user, key, value)
     db.commit()
     db.refresh(user)
+    # Nome e e-mail aparecem nas respostas em cache do usuário e dos
+    # workspaces de que ele participa (membros, autores de despesas)
+    bump_users(user_id)
+    bump_workspaces(*user_workspace_ids(user_id, db))
     return user
 
 
+def revoke_user_tokens(db: Session, user_id: str) -> None:
+    """Revoga todos os tokens já emitidos para o usuário (acesso, refresh e
+    redefinição de senha). Sem commit; depois do commit, evict_user_tokens."""
+    db.query(User).filter(User.id == user_id).update(
+        {User.tokens_valid_after: datetime.utcnow()}, synchronize_session=False
+    )
+    revoke_user_refresh_tokens(db, user_id)
+
+
 def change_password(db: Session, user_id: str, new_password: str):
     user = get_user_by_id(db, user_id)
     user.password = hash_password(new_password)
+    revoke_user_tokens(db, user_id)
     db.commit()
+    evict_user_tokens(user_id)
     return {"message": "Senha alterada com sucesso"}
 
 
@@ -127,18 +154,14 @@ def change_password(db: Session, user_id: str, new_password: str):
 # Recuperação de senha
 # ------------------------
 def create_password_reset_token(user: User) -> str:
-    expire = datetime.utcnow() + timedelta(minutes=RESET_TOKEN_EXPIRE_MINUTES)
-    payload = {"sub": str(user.id), "exp": expire}
-    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
-    return token
+    return create_reset_token(user.id)
 
 
-def send_reset_email(user: User, frontend_host: str):
+def send_reset_email(db: Session, user: User, frontend_host: str):
     token = create_password_reset_token(user)
     reset_link = f"{frontend_host}/password-reset/{token}"
 
     payload = {
-        "sender": {"name": "Expensely", "email": "soniamaradesa@gmail.com"},
         "to": [{"email": user.email}],
         "subject": "Redefinição de senha - Expensely",
         "htmlContent": f"""
@@ -157,21 +180,9 @@ def send_reset_email(user: User, frontend_host: str):
         "textContent": f"Olá {user.name}, use o link para redefinir sua senha: {reset_link}. Link válido por {RESET_TOKEN_EXPIRE_MINUTES} minutos.",
     }
 
-    headers = {"api-key": BREVO_API_KEY, "Content-Type": "application/json"}
-
-    response = requests.post(
-        "https://api.brevo.com/v3/smtp/email", json=payload, headers=headers
-    )
-
-    if response.status_code >= 400:
-        try:
-            error_message = response.json()
-        except Exception:
-            error_message = response.text
-        raise HTTPException(
-            status_code=500,
-            detail=f"Falha ao enviar e-mail de recuperação: {error_message}",
-        )
+    # Enviado pelo worker do outbox (app/scripts/email_worker.py)
+    enqueue_email(db, payload)
+    db.commit()
 
 
 def update_password(db: Session, user: User, data: PasswordChange) -> User:
@@ -180,9 +191,11 @@ def update_password(db: Session, user: User, data: PasswordChange) -> User:
             status_code=status.HTTP_400_BAD_REQUEST, detail="Senha atual incorreta."
         )
 
-    user.password = get_password_hash(data.newPassword)
+    user.password = hash_password(data.newPassword)
     db.add(user)
+    revoke_user_tokens(db, user.id)
     db.commit()
+    evict_user_tokens(user.id)
     db.refresh(user)
 
     return user
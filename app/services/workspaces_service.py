@@ -1,27 +1,80 @@
 from uuid import uuid4
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import insert, delete, select
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, lazyload, selectinload
+from sqlalchemy import insert, delete, select, exists, or_
 from typing import List, Optional
 from app.models.user_model import User as UserModel
 from app.models.workspace_model import Workspace as WorkspaceModel, workspace_users
-from app.schemas.workspace_schema import WorkspaceCreate, WorkspaceUpdate, WorkspaceUser
+from app.schemas.workspace_schema import WorkspaceCreate, WorkspaceUpdate
 from app.schemas.workspace_schema import Workspace as WorkspaceSchema
-from datetime import datetime, timedelta
-from jose import jwt
-from app.config import SECRET_KEY, ALGORITHM, INVITE_TOKEN_EXPIRE_MINUTES, BREVO_API_KEY
-import requests
+from app.auth.tokens import INVITE, TokenError, create_invite_token, decode_token
+from app.config import (
+    INVITE_TOKEN_EXPIRE_MINUTES,
+    MEMBERSHIP_CACHE_SIZE,
+    MEMBERSHIP_CACHE_TTL_SECONDS,
+)
+from app.utils.cache import make_cache
+from app.utils.http_cache import bump_users, bump_workspaces
+from app.services.email_outbox_service import enqueue_email
+
+# Cache de (user_id, workspace_id) -> bool para a checagem de acesso
+_membership_cache = make_cache(
+    "membership", maxsize=MEMBERSHIP_CACHE_SIZE, ttl=MEMBERSHIP_CACHE_TTL_SECONDS
+)
+
+
+# Valida a lista de workspaces (com membros) numa só chamada
+_workspace_list = TypeAdapter(List[WorkspaceSchema])
+
+
+def _workspace_options():
+    # O mapeamento carrega despesas e tags em joined: aqui só os membros,
+    # explicitamente (também na AsyncSession, que não permite lazy load)
+    return (lazyload("*"), selectinload(WorkspaceModel.users).lazyload("*"))
+
+
+def _workspace_out(workspace_id: str, db: Session) -> WorkspaceSchema:
+    workspace = (
+        db.execute(
+            select(WorkspaceModel)
+            .options(*_workspace_options())
+            .where(WorkspaceModel.id == workspace_id)
+            .execution_options(populate_existing=True)
+        )
+        .scalars()
+        .first()
+    )
+    return WorkspaceSchema.model_validate(workspace)
+
+
+def _user_workspaces_condition(user_id: str):
+    """Workspaces dos quais o usuário é dono ou membro."""
+    joined_ids = select(workspace_users.c.workspace_id).where(
+        workspace_users.c.user_id == user_id
+    )
+    return (WorkspaceModel.user_id == user_id) | WorkspaceModel.id.in_(joined_ids)
 
 
-def list_user_workspaces(current_user: UserModel, db: Session):
-    owned = db.query(WorkspaceModel).filter_by(user_id=current_user.id).all()
-    stmt = select(workspace_users.c.workspace_id).where(
-        workspace_users.c.user_id == current_user.id
+def list_user_workspaces(user_id: str, db: Session) -> List[WorkspaceSchema]:
+    workspaces = (
+        db.execute(
+            select(WorkspaceModel)
+            .options(*_workspace_options())
+            .where(_user_workspaces_condition(user_id))
+        )
+        .scalars()
+        .all()
+    )
+    return _workspace_list.validate_python(workspaces)
+
+
+def user_workspace_ids(user_id: str, db: Session) -> List[str]:
+    return list(
+        db.execute(
+            select(WorkspaceModel.id).where(_user_workspaces_condition(user_id))
+        ).scalars()
     )
-    joined_ids = [wid for (wid,) in db.execute(stmt).all()]
-    joined = db.query(WorkspaceModel).filter(WorkspaceModel.id.in_(joined_ids)).all()
-    all_workspaces = {ws.id: ws for ws in owned + joined}
-    return list(all_workspaces.values())
 
 
 def create_workspace(data: WorkspaceCreate, current_user: UserModel, db: Session):
@@ -33,8 +86,9 @@ def create_workspace(data: WorkspaceCreate, current_user: UserModel, db: Session
     )
     type_value["id"] = str(type_value["id"])  # garante string
 
+    workspace_id = str(uuid4())
     workspace = WorkspaceModel(
-        id=str(uuid4()),
+        id=workspace_id,
         name=data.name,
         color=data.color,
         icon=data.icon,
@@ -43,7 +97,6 @@ def create_workspace(data: WorkspaceCreate, current_user: UserModel, db: Session
     )
     db.add(workspace)
     db.commit()
-    db.refresh(workspace)
 
     # Define membros (dono + usuários enviados)
     member_ids = [current_user.id]
@@ -51,30 +104,13 @@ def create_workspace(data: WorkspaceCreate, current_user: UserModel, db: Session
         member_ids += [uid for uid in data.users if uid != current_user.id]
 
     for uid in set(member_ids):
-        stmt = insert(workspace_users).values(workspace_id=workspace.id, user_id=uid)
+        stmt = insert(workspace_users).values(workspace_id=workspace_id, user_id=uid)
         db.execute(stmt)
     db.commit()
+    invalidate_workspace_access(workspace_id)
+    bump_users(*member_ids)
 
-    # Monta lista de usuários para o schema
-    users_list: List[WorkspaceUser] = []
-    for uid in set(member_ids):
-        user_obj = db.query(UserModel).filter(UserModel.id == uid).first()
-        if user_obj:
-            users_list.append(
-                WorkspaceUser(
-                    id=str(user_obj.id), name=user_obj.name, email=user_obj.email
-                )
-            )
-
-    return WorkspaceSchema(
-        id=str(workspace.id),
-        userId=str(workspace.user_id),
-        name=workspace.name,
-        color=workspace.color,
-        icon=workspace.icon,
-        type=workspace.type,
-        users=users_list,
-    )
+    return _workspace_out(workspace_id, db)
 
 
 def update_workspace(
@@ -100,31 +136,8 @@ def update_workspace(
             setattr(workspace, field, value)
 
     db.commit()
-    db.refresh(workspace)
-
-    # Monta lista de usuários sem alterar
-    users_list: List[WorkspaceUser] = []
-    stmt = select(workspace_users.c.user_id).where(
-        workspace_users.c.workspace_id == workspace.id
-    )
-    for (uid,) in db.execute(stmt).all():
-        user_obj = db.query(UserModel).filter(UserModel.id == uid).first()
-        if user_obj:
-            users_list.append(
-                WorkspaceUser(
-                    id=str(user_obj.id), name=user_obj.name, email=user_obj.email
-                )
-            )
-
-    return WorkspaceSchema(
-        id=str(workspace.id),
-        userId=str(workspace.user_id),
-        name=workspace.name,
-        color=workspace.color,
-        icon=workspace.icon,
-        type=workspace.type,
-        users=users_list,
-    )
+    bump_workspaces(workspace_id)
+    return _workspace_out(workspace_id, db)
 
 
 def delete_workspace(workspace_id: str, current_user: UserModel, db: Session):
@@ -147,43 +160,58 @@ def delete_workspace(workspace_id: str, current_user: UserModel, db: Session):
 
     # Commit da transação
     db.commit()
+    invalidate_workspace_access(workspace_id)
 
 
-def user_has_access_to_workspace(user_id: str, workspace_id: str, db: Session):
-    workspace = db.query(WorkspaceModel).filter_by(id=workspace_id).first()
-    if workspace and workspace.user_id == user_id:
-        return True
-
-    stmt = select(workspace_users).where(
+def _access_query(user_id: str, workspace_id: str):
+    # Dono ou membro, resolvido em uma única consulta EXISTS
+    is_owner = exists().where(
+        (WorkspaceModel.id == workspace_id) & (WorkspaceModel.user_id == user_id)
+    )
+    is_member = exists().where(
         (workspace_users.c.workspace_id == workspace_id)
         & (workspace_users.c.user_id == user_id)
     )
-    membership = db.execute(stmt).first()
-    return membership is not None
+    return select(or_(is_owner, is_member))
+
+
+def user_has_access_to_workspace(user_id: str, workspace_id: str, db: Session):
+    key = (str(user_id), str(workspace_id))
+    cached = _membership_cache.get(key)
+    if cached is not None:
+        return cached
+
+    has_access = bool(db.execute(_access_query(user_id, workspace_id)).scalar())
+
+    _membership_cache.set(key, has_access, tags=(("workspace", key[1]),))
+    return has_access
+
+
+def invalidate_workspace_access(workspace_id: str):
+    """Membros mudaram: descarta a checagem de acesso e as respostas em cache."""
+    _membership_cache.invalidate_tag(("workspace", str(workspace_id)))
+    bump_workspaces(workspace_id)
+
+
+def membership_cache_stats() -> dict:
+    return _membership_cache.stats()
 
 
 def create_workspace_invite_token(
-    email: str, workspace_id: str, workspace_name: str, workspace_icon: str
+    email: str,
+    workspace_id: str,
+    workspace_name: str,
+    workspace_icon: Optional[str] = None,
 ) -> str:
-    expire = datetime.utcnow() + timedelta(minutes=INVITE_TOKEN_EXPIRE_MINUTES)
-    payload = {
-        "sub": email,
-        "workspace_id": workspace_id,
-        "workspace_name": workspace_name,
-        "workspace_icon": workspace_icon,
-        "exp": expire,
-    }
-    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
-    return token
+    return create_invite_token(email, workspace_id, workspace_name, workspace_icon)
 
 
-def send_workspace_invite_email(
+def build_workspace_invite_email(
     email: str, workspace_name: str, workspace_id: str, frontend_host: str
-):
-    token = create_workspace_invite_token(email, workspace_id)
+) -> dict:
+    token = create_workspace_invite_token(email, workspace_id, workspace_name)
     invite_link = f"{frontend_host}/workspace-invite/{token}"
-    payload = {
-        "sender": {"name": "Expensely", "email": "soniamaradesa@gmail.com"},
+    return {
         "to": [{"email": email}],
         "subject": f"Convite para workspace {workspace_name} - Expensely",
         "htmlContent": f"""
@@ -193,25 +221,32 @@ def send_workspace_invite_email(
         """,
         "textContent": f"Link para aceitar: {invite_link}",
     }
-    headers = {"api-key": BREVO_API_KEY, "Content-Type": "application/json"}
-    response = requests.post(
-        "https://api.brevo.com/v3/smtp/email", json=payload, headers=headers
+
+
+def send_workspace_invite_email(
+    db: Session, email: str, workspace_name: str, workspace_id: str, frontend_host: str
+):
+    # Enviado pelo worker do outbox (app/scripts/email_worker.py)
+    enqueue_email(
+        db,
+        build_workspace_invite_email(email, workspace_name, workspace_id, frontend_host),
     )
-    if response.status_code >= 400:
-        raise HTTPException(
-            status_code=500, detail=f"Falha ao enviar e-mail: {response.text}"
-        )
+    db.commit()
 
 
 def accept_workspace_invite(token: str, db: Session):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get("sub")
-        workspace_id = payload.get("workspace_id")
-    except Exception:
+        claims = decode_token(token, expected_types=[INVITE])
+    except TokenError:
         raise HTTPException(status_code=400, detail="Token inválido ou expirado")
+    email = claims.sub
+    workspace_id = claims.extra.get("workspace_id")
 
-    user = db.query(UserModel).filter(UserModel.email == email).first()
+    # Só id e e-mail, como linha: uma entidade expirada pelo commit abaixo
+    # seria recarregada com o grafo joined (workspaces, despesas e tags)
+    user = db.execute(
+        select(UserModel.id, UserModel.email).where(UserModel.email == email)
+    ).first()
 
     if not user:
         raise HTTPException(
@@ -233,6 +268,8 @@ def accept_workspace_invite(token: str, db: Session):
     stmt = insert(workspace_users).values(user_id=user.id, workspace_id=workspace_id)
     db.execute(stmt)
     db.commit()
+    invalidate_workspace_access(workspace_id)
+    bump_users(user.id)
 
     return {"message": f"Usuário {user.email} adicionado ao workspace com sucesso"}
 
@@ -241,3 +278,5 @@ def add_user_to_workspace(user_id: str, workspace_id: str, db: Session):
     stmt = insert(workspace_users).values(user_id=user_id, workspace_id=workspace_id)
     db.execute(stmt)
     db.commit()
+    invalidate_workspace_access(workspace_id)
+    bump_users(user_id)
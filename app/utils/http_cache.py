@@ -0,0 +1,158 @@
+import hashlib
+import uuid
+from typing import Any, Awaitable, Callable, Hashable, Iterable, List, Optional
+import orjson
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+from app.config import RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS
+from app.utils.cache import TTLCache, make_cache
+
+# Cache de respostas GET com ETag forte. Cada escopo (workspace, usuário) tem
+# uma versão que as escritas trocam; a resposta guardada só vale enquanto as
+# versões dos escopos de que ela depende não mudarem. Um acerto (200 do cache
+# ou 304) não roda a consulta da rota, só a leitura do corte de revogação do
+# token (get_current_user_id). Com CACHE_BACKEND=redis as versões valem para
+# todos os workers; os corpos ficam em cada processo, já que a versão decide
+# se ainda servem.
+_versions = make_cache(
+    "response_versions", maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL_SECONDS
+)
+# (usuário, rota, parâmetros) -> (escopos, versões, etag, corpo)
+_responses = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL_SECONDS)
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def workspace_scope(workspace_id) -> tuple:
+    return ("workspace", str(workspace_id))
+
+
+def user_scope(user_id) -> tuple:
+    return ("user", str(user_id))
+
+
+def current_version(scope: Hashable) -> str:
+    version = _versions.get(scope)
+    if version is None:
+        # Versão desconhecida (nova ou expirada): qualquer resposta guardada
+        # para o escopo deixa de valer
+        version = uuid.uuid4().hex
+        _versions.set(scope, version)
+    return version
+
+
+def bump_version(*scopes: Hashable) -> None:
+    """Invalida as respostas que dependem dos escopos. Chamar após o commit."""
+    for scope in scopes:
+        _versions.set(scope, uuid.uuid4().hex)
+
+
+def bump_workspaces(*workspace_ids) -> None:
+    bump_version(*(workspace_scope(w) for w in workspace_ids))
+
+
+def bump_users(*user_ids) -> None:
+    bump_version(*(user_scope(u) for u in user_ids))
+
+
+def _cache_key(request: Request, user_id) -> tuple:
+    params = tuple(sorted(request.query_params.multi_items()))
+    return (str(user_id), request.url.path, params)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match usa comparação fraca: ignora o prefixo W/
+    candidates = (c.strip() for c in header.split(","))
+    return etag in (c[2:] if c.startswith("W/") else c for c in candidates)
+
+
+def _response(request: Request, etag: str, body: bytes) -> Response:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _cached(request: Request, key: tuple) -> Optional[Response]:
+    entry = _responses.get(key)
+    if entry is None:
+        return None
+    scopes, versions, etag, body = entry
+    if [current_version(s) for s in scopes] != versions:
+        return None
+    return _response(request, etag, body)
+
+
+def _default(value: Any) -> Any:
+    # orjson serializa datetime, UUID, dict e list; os modelos viram dict aqui
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def _store(
+    request: Request,
+    key: tuple,
+    scopes: List[Hashable],
+    versions: List[str],
+    data: Any,
+    more_scopes: Optional[Callable[[Any], Iterable[Hashable]]],
+) -> Response:
+    if more_scopes is not None:
+        extra = list(more_scopes(data))
+        scopes = scopes + extra
+        versions = versions + [current_version(s) for s in extra]
+
+    body = orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    _responses.set(key, (scopes, versions, etag, body))
+    return _response(request, etag, body)
+
+
+def cached_response(
+    request: Request,
+    user_id,
+    scopes: Iterable[Hashable],
+    compute: Callable[[], Any],
+    more_scopes: Optional[Callable[[Any], Iterable[Hashable]]] = None,
+) -> Response:
+    """Resposta JSON com ETag, do cache enquanto os escopos não mudarem.
+
+    `compute` faz a consulta (e a checagem de acesso) só quando necessário;
+    `more_scopes` acrescenta escopos que só se conhecem pelo resultado.
+    """
+    key = _cache_key(request, user_id)
+    response = _cached(request, key)
+    if response is not None:
+        return response
+
+    # Versões lidas antes da consulta: uma escrita concorrente invalida o resultado
+    scopes = list(scopes)
+    versions = [current_version(s) for s in scopes]
+    return _store(request, key, scopes, versions, compute(), more_scopes)
+
+
+async def async_cached_response(
+    request: Request,
+    user_id,
+    scopes: Iterable[Hashable],
+    compute: Callable[[], Awaitable[Any]],
+    more_scopes: Optional[Callable[[Any], Iterable[Hashable]]] = None,
+) -> Response:
+    key = _cache_key(request, user_id)
+    response = _cached(request, key)
+    if response is not None:
+        return response
+
+    scopes = list(scopes)
+    versions = [current_version(s) for s in scopes]
+    return _store(request, key, scopes, versions, await compute(), more_scopes)
+
+
+def response_cache_stats() -> dict:
+    return {"responses": _responses.stats(), "versions": _versions.stats()}
@@ -0,0 +1,159 @@
+import threading
+import time
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from app.config import (
+    HTTP_BREAKER_FAILURES,
+    HTTP_BREAKER_RESET_SECONDS,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_MAX_CONCURRENCY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_READ_TIMEOUT,
+)
+from app.utils.metrics import Histogram
+
+
+class CircuitOpenError(Exception):
+    """O provedor falhou demais recentemente; a chamada nem foi tentada."""
+
+
+class ProviderBusyError(Exception):
+    """Limite de chamadas simultâneas ao provedor atingido."""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        # Início da chamada de teste em half-open (só uma por vez)
+        self.probe_started_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        # Em half-open deixa passar uma única chamada de teste: o resultado
+        # decide se fecha ou reabre. Um teste que não terminou em
+        # reset_timeout (caller perdido) libera outro.
+        with self._lock:
+            state = self.state
+            if state == "open":
+                raise CircuitOpenError("Circuito aberto")
+            if state == "half-open":
+                now = time.monotonic()
+                if (
+                    self.probe_started_at is not None
+                    and now - self.probe_started_at < self.reset_timeout
+                ):
+                    raise CircuitOpenError("Circuito em teste")
+                self.probe_started_at = now
+
+    def cancel_call(self) -> None:
+        """A chamada liberada por before_call não chegou ao provedor."""
+        with self._lock:
+            self.probe_started_at = None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.probe_started_at = None
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class OutboundClient:
+    """Cliente HTTP por provedor: keep-alive, timeouts, circuit breaker,
+    limite de concorrência e histograma de latência."""
+
+    def __init__(
+        self,
+        name: str,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = HTTP_READ_TIMEOUT,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_concurrency: int = HTTP_MAX_CONCURRENCY,
+        acquire_timeout: float = 5.0,
+        failure_threshold: int = HTTP_BREAKER_FAILURES,
+        reset_timeout: float = HTTP_BREAKER_RESET_SECONDS,
+    ):
+        self.name = name
+        self.timeout = (connect_timeout, read_timeout)
+        self.acquire_timeout = acquire_timeout
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency_ms = Histogram()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        self.breaker.before_call()
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            self.breaker.cancel_call()
+            raise ProviderBusyError(f"{self.name}: limite de concorrência atingido")
+
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, url, timeout=kwargs.pop("timeout", self.timeout), **kwargs
+            )
+        except requests.RequestException:
+            self.breaker.record_failure()
+            raise
+        finally:
+            self.latency_ms.observe((time.perf_counter() - start) * 1000)
+            self._slots.release()
+
+        # 5xx e 429 indicam problema no provedor; 4xx é erro nosso
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "latency_ms": self.latency_ms.snapshot(),
+        }
+
+
+_clients: Dict[str, OutboundClient] = {}
+_clients_lock = threading.Lock()
+
+
+def register_client(name: str, client) -> None:
+    """Registra (ou substitui, ex.: por um fake em testes) o cliente de um provedor."""
+    with _clients_lock:
+        _clients[name] = client
+
+
+def get_client(name: str):
+    return _clients[name]
+
+
+def clients_stats() -> dict:
+    with _clients_lock:
+        clients = dict(_clients)
+    return {name: client.stats() for name, client in clients.items()}
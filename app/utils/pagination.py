@@ -0,0 +1,18 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+def encode_cursor(date: Optional[datetime], item_id: str) -> str:
+    raw = json.dumps([date.isoformat() if date else None, str(item_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (datetime.fromisoformat(date) if date else None), str(item_id)
+    except (ValueError, TypeError):
+        raise ValueError("Cursor inválido.")
@@ -0,0 +1,197 @@
+import base64
+import logging
+import threading
+from typing import Any, Hashable, Iterable, Optional
+import orjson
+import redis
+from app.config import (
+    REDIS_BREAKER_FAILURES,
+    REDIS_BREAKER_RESET_SECONDS,
+    REDIS_KEY_PREFIX,
+    REDIS_SOCKET_TIMEOUT,
+    REDIS_URL,
+)
+from app.utils.cache import CacheBackend
+from app.utils.http_client import CircuitBreaker, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[redis.Redis] = None
+_client_lock = threading.Lock()
+
+# Marcadores do JSON para os tipos que ele não tem
+_TUPLE = "__tuple__"
+_BYTES = "__bytes__"
+
+
+def get_redis() -> redis.Redis:
+    """Cliente (e pool de conexões) compartilhado pelos caches do processo."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = redis.Redis.from_url(
+                REDIS_URL,
+                socket_timeout=REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+            )
+        return _client
+
+
+def _pack(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, tuple):
+        return {_TUPLE: [_pack(v) for v in value]}
+    if isinstance(value, bytes):
+        return {_BYTES: base64.b64encode(value).decode()}
+    if isinstance(value, list):
+        return [_pack(v) for v in value]
+    if isinstance(value, dict) and all(isinstance(k, str) for k in value):
+        return {k: _pack(v) for k, v in value.items()}
+    raise TypeError(f"Valor não suportado no cache Redis: {type(value).__name__}")
+
+
+def _unpack(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_unpack(v) for v in value]
+    if isinstance(value, dict):
+        if len(value) == 1 and _TUPLE in value:
+            return tuple(_unpack(v) for v in value[_TUPLE])
+        if len(value) == 1 and _BYTES in value:
+            return base64.b64decode(value[_BYTES])
+        return {k: _unpack(v) for k, v in value.items()}
+    return value
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(_pack(value))
+
+
+def loads(raw: bytes) -> Any:
+    return _unpack(orjson.loads(raw))
+
+
+class RedisCache(CacheBackend):
+    """Cache no Redis (ou servidor compatível), comum a todos os workers.
+
+    Valores em JSON (orjson; tuplas e bytes marcados), nunca pickle: o
+    servidor é compartilhado. Expiração nativa (PX). Cada tag é um SET com
+    as chaves marcadas, que expira junto com a entrada mais longa (PEXPIRE
+    NX/GT, Redis 7+). Falhas de conexão viram miss: só guarde aqui o que o
+    banco pode responder de novo.
+
+    O cliente é síncrono e cada operação é limitada por REDIS_SOCKET_TIMEOUT.
+    Após REDIS_BREAKER_FAILURES falhas seguidas o circuito abre e as
+    operações viram miss sem ir à rede, para que um Redis fora do ar não
+    prenda o event loop das rotas async a cada chamada.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float = 60.0,
+        client: Optional[redis.Redis] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.skipped = 0
+        self.breaker = breaker or CircuitBreaker(
+            REDIS_BREAKER_FAILURES, REDIS_BREAKER_RESET_SECONDS
+        )
+        self._client = client
+        self._prefix = f"{REDIS_KEY_PREFIX}:{namespace}:"
+
+    @property
+    def client(self) -> redis.Redis:
+        return self._client or get_redis()
+
+    def _key(self, key: Hashable) -> str:
+        # repr é estável para as chaves usadas (str, bytes e tuplas delas)
+        return f"{self._prefix}k:{key!r}"
+
+    def _tag(self, tag: Hashable) -> str:
+        return f"{self._prefix}t:{tag!r}"
+
+    def _call(self, operation: str, fn, fallback: Any = None) -> Any:
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self.skipped += 1
+            return fallback
+        try:
+            result = fn()
+        except redis.RedisError as e:
+            self.breaker.record_failure()
+            self.errors += 1
+            logger.warning("Cache %s: falha no %s: %s", self.namespace, operation, e)
+            return fallback
+        self.breaker.record_success()
+        return result
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        raw = self._call("get", lambda: self.client.get(self._key(key)))
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return loads(raw)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[Hashable] = (),
+    ) -> None:
+        ttl_ms = max(int((self.ttl if ttl is None else ttl) * 1000), 1)
+        redis_key = self._key(key)
+        data = dumps(value)
+
+        def write():
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(redis_key, data, px=ttl_ms)
+            for tag in tags:
+                tag_key = self._tag(tag)
+                pipe.sadd(tag_key, redis_key)
+                # Nova tag: define a expiração; existente: só estende
+                pipe.pexpire(tag_key, ttl_ms, nx=True)
+                pipe.pexpire(tag_key, ttl_ms, gt=True)
+            pipe.execute()
+
+        self._call("set", write)
+
+    def delete(self, key: Hashable) -> None:
+        # A chave pode continuar listada em alguma tag; DEL de chave ausente é no-op
+        self._call("delete", lambda: self.client.delete(self._key(key)))
+
+    def invalidate_tag(self, tag: Hashable) -> None:
+        tag_key = self._tag(tag)
+
+        def invalidate():
+            keys = self.client.smembers(tag_key)
+            self.client.delete(tag_key, *keys)
+
+        self._call("invalidate_tag", invalidate)
+
+    def clear(self) -> None:
+        def clear_namespace():
+            keys = list(self.client.scan_iter(match=self._prefix + "*", count=1000))
+            if keys:
+                self.client.delete(*keys)
+
+        self._call("clear", clear_namespace)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "circuit": self.breaker.state,
+        }
@@ -0,0 +1,96 @@
+"""baseline: tabelas anteriores às migrations
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-18
+
+Esquema de users, workspaces, workspace_users, tags e expenses como existia
+antes do Alembic. Bancos já em produção não devem rodar esta revisão:
+marque-os com `alembic stamp 0000` e siga com `alembic upgrade head`.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0000"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("username", sa.String(), nullable=True, unique=True),
+        sa.Column("gender", sa.String(), nullable=True),
+        sa.Column("birthdate", sa.Date(), nullable=True),
+        sa.Column("income", sa.Float(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "workspaces",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("color", sa.String(), nullable=False),
+        sa.Column("icon", sa.String(), nullable=True),
+        sa.Column("type", sa.JSON(), nullable=False),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+    )
+    op.create_index("ix_workspaces_id", "workspaces", ["id"])
+
+    op.create_table(
+        "workspace_users",
+        sa.Column(
+            "workspace_id", sa.String(), sa.ForeignKey("workspaces.id"), primary_key=True
+        ),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), primary_key=True),
+    )
+
+    op.create_table(
+        "tags",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("color", sa.String(), nullable=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column(
+            "workspace_id", sa.String(), sa.ForeignKey("workspaces.id"), nullable=False
+        ),
+    )
+    op.create_index("ix_tags_id", "tags", ["id"])
+
+    # tag_id, user_id e workspace_id são UUID, mas as chaves referenciadas são
+    # varchar: o Postgres não aceita FK entre tipos diferentes, então elas não
+    # existem no banco (só no modelo, para os relacionamentos do ORM)
+    op.create_table(
+        "expenses",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("value", sa.Float(), nullable=True),
+        sa.Column("category", postgresql.JSONB(), nullable=True),
+        sa.Column("tag_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("date", sa.DateTime(), nullable=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("color", sa.String(), nullable=True),
+        sa.Column("workspace_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("expenses")
+    op.drop_index("ix_tags_id", table_name="tags")
+    op.drop_table("tags")
+    op.drop_table("workspace_users")
+    op.drop_index("ix_workspaces_id", table_name="workspaces")
+    op.drop_table("workspaces")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
@@ -0,0 +1,34 @@
+"""expense_monthly_rollup
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = "0000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Pode já ter sido criada por `python -m app.scripts.rebuild_rollup`
+    if sa.inspect(op.get_bind()).has_table("expense_monthly_rollup"):
+        return
+
+    op.create_table(
+        "expense_monthly_rollup",
+        sa.Column("workspace_id", sa.String(), primary_key=True),
+        sa.Column("year", sa.Integer(), primary_key=True),
+        sa.Column("month", sa.Integer(), primary_key=True),
+        sa.Column("category_id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), primary_key=True),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("expense_monthly_rollup")
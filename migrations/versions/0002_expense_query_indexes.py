@@ -0,0 +1,30 @@
+"""expense query indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_expenses_workspace_id_date", "expenses", ["workspace_id", "date", "id"]),
+    ("ix_expenses_workspace_id_user_id", "expenses", ["workspace_id", "user_id"]),
+    ("ix_workspace_users_user_id", "workspace_users", ["user_id"]),
+    ("ix_workspaces_user_id", "workspaces", ["user_id"]),
+    ("ix_tags_workspace_id", "tags", ["workspace_id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
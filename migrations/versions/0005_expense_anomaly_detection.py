@@ -0,0 +1,56 @@
+"""expense_flags e expense_scan_queue
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "expense_flags",
+        sa.Column(
+            "expense_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("expenses.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("kind", sa.String(), primary_key=True),
+        sa.Column("workspace_id", sa.String(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=True),
+        sa.Column("detail", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_expense_flags_workspace_id_created_at",
+        "expense_flags",
+        ["workspace_id", "created_at"],
+    )
+
+    op.create_table(
+        "expense_scan_queue",
+        sa.Column(
+            "expense_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("expenses.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("workspace_id", sa.String(), nullable=False),
+        sa.Column("enqueued_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_expense_scan_queue_enqueued_at", "expense_scan_queue", ["enqueued_at"]
+    )
+
+
+def downgrade():
+    op.drop_table("expense_scan_queue")
+    op.drop_table("expense_flags")
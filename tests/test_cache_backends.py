@@ -0,0 +1,111 @@
+"""Contrato de CacheBackend, igual para o TTLCache e o RedisCache."""
+import time
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+import redis
+from app.utils.cache import TTLCache
+from app.utils.http_client import CircuitBreaker
+from app.utils.redis_cache import RedisCache
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    if request.param == "memory":
+        return TTLCache(maxsize=100)
+    return RedisCache("test", client=fakeredis.FakeRedis())
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        True,
+        False,
+        0,
+        1.5,
+        "versão",
+        b"\x00corpo",
+        # Entrada do cache de respostas: (escopos, versões, etag, corpo)
+        ([("workspace", "w1"), ("user", "u1")], ["a", "b"], '"etag"', b"{}"),
+        {"id": "1", "name": "Mercado", "tags": [("t", 1)]},
+    ],
+)
+def test_round_trips_supported_values(cache, value):
+    cache.set(("user", "1"), value)
+    assert cache.get(("user", "1")) == value
+    assert type(cache.get(("user", "1"))) is type(value)
+
+
+def test_missing_key_returns_default(cache):
+    assert cache.get("ausente") is None
+    assert cache.get("ausente", "padrão") == "padrão"
+
+
+def test_entries_expire(cache):
+    cache.set(b"\x00token", "valor", ttl=0.05)
+    time.sleep(0.1)
+    assert cache.get(b"\x00token") is None
+
+
+def test_invalidate_tag_removes_only_tagged_keys(cache):
+    cache.set(("user", "1", "ws"), True, tags=(("workspace", "ws"),))
+    cache.set(("user", "2", "ws"), False, tags=(("workspace", "ws"),))
+    cache.set(("user", "1", "outro"), True, tags=(("workspace", "outro"),))
+
+    cache.invalidate_tag(("workspace", "ws"))
+
+    assert cache.get(("user", "1", "ws")) is None
+    assert cache.get(("user", "2", "ws")) is None
+    assert cache.get(("user", "1", "outro")) is True
+
+
+def test_delete_and_clear(cache):
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert cache.get("b") is None
+
+
+def test_stats_report_hits_and_misses(cache):
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["backend"] in ("memory", "redis")
+
+
+def test_redis_rejects_values_it_cannot_encode():
+    cache = RedisCache("test", client=fakeredis.FakeRedis())
+    with pytest.raises(TypeError):
+        cache.set("a", {1, 2})
+
+
+class _DownRedis:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, key):
+        self.calls += 1
+        raise redis.ConnectionError("fora do ar")
+
+
+def test_redis_outage_is_a_miss_and_opens_the_circuit():
+    client = _DownRedis()
+    cache = RedisCache(
+        "test", client=client, breaker=CircuitBreaker(failure_threshold=2)
+    )
+
+    assert cache.get("a", "padrão") == "padrão"
+    assert cache.get("a") is None
+    # Circuito aberto: nem tenta a rede
+    assert cache.get("a") is None
+    assert client.calls == 2
+    assert cache.stats()["circuit"] == "open"
+    assert cache.stats()["skipped"] == 1
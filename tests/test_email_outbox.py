@@ -0,0 +1,146 @@
+"""Worker do outbox (process_outbox_batch) sobre SQLite em memória, com um
+envio falso ou com o sink local de app.scripts.email_sink."""
+import threading
+from datetime import datetime, timedelta
+from functools import partial
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("requests")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.database import Base
+from app.models import EmailOutbox
+from app.scripts.email_sink import SinkHandler, start_sink
+from app.services import email_outbox_service
+from app.services.email_outbox_service import (
+    enqueue_email,
+    process_outbox_batch,
+    send_email,
+)
+from app.utils.http_client import CircuitOpenError, OutboundClient, register_client
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[EmailOutbox.__table__])
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _enqueue(db: Session, count: int = 1) -> list:
+    messages = [enqueue_email(db, {"subject": f"E-mail {i}"}) for i in range(count)]
+    db.commit()
+    return messages
+
+
+def _failing_send(payload):
+    raise RuntimeError("503: indisponível")
+
+
+def test_sends_and_marks_as_sent(db):
+    sent = []
+    [message] = _enqueue(db)
+
+    assert process_outbox_batch(db, send=sent.append) == 1
+
+    assert sent[0]["subject"] == "E-mail 0"
+    assert sent[0]["sender"] == email_outbox_service.SENDER
+    assert message.status == "sent"
+    assert message.attempts == 1
+    assert message.sent_at is not None
+
+
+def test_failure_is_retried_with_exponential_backoff(db, monkeypatch):
+    monkeypatch.setattr(email_outbox_service, "EMAIL_RETRY_BASE_SECONDS", 10)
+    monkeypatch.setattr(email_outbox_service, "EMAIL_RETRY_MAX_SECONDS", 1000)
+    monkeypatch.setattr(email_outbox_service.random, "uniform", lambda a, b: 1.0)
+    [message] = _enqueue(db)
+
+    delays = []
+    for _ in range(3):
+        before = datetime.utcnow()
+        process_outbox_batch(db, send=_failing_send)
+        delays.append((message.next_attempt_at - before).total_seconds())
+        assert message.status == "pending"
+        message.next_attempt_at = datetime.utcnow()  # antecipa a próxima rodada
+        db.commit()
+
+    assert message.attempts == 3
+    assert message.last_error == "503: indisponível"
+    assert [round(d) for d in delays] == [10, 20, 40]
+
+
+def test_dead_letter_after_max_attempts(db, monkeypatch):
+    monkeypatch.setattr(email_outbox_service, "EMAIL_MAX_ATTEMPTS", 2)
+    [message] = _enqueue(db)
+
+    process_outbox_batch(db, send=_failing_send)
+    message.next_attempt_at = datetime.utcnow()
+    db.commit()
+    process_outbox_batch(db, send=_failing_send)
+
+    assert message.status == "dead"
+    assert message.attempts == 2
+    # Dead-letter não volta para a fila
+    assert process_outbox_batch(db, send=_failing_send) == 0
+
+
+def test_claimed_message_is_not_sent_twice_while_leased(db):
+    _enqueue(db)
+    claimed = email_outbox_service._claim_batch(db, 10)
+
+    assert len(claimed) == 1
+    assert process_outbox_batch(db, send=_failing_send) == 0
+
+
+def test_expired_lease_is_claimed_again(db):
+    [message] = _enqueue(db)
+    email_outbox_service._claim_batch(db, 10)  # worker que caiu sem gravar
+    message.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    sent = []
+    assert process_outbox_batch(db, send=sent.append) == 1
+
+    assert len(sent) == 1
+    assert message.status == "sent"
+
+
+def test_open_breaker_releases_the_rest_of_the_batch(db):
+    messages = _enqueue(db, 3)
+    calls = []
+
+    def send(payload):
+        calls.append(payload)
+        if len(calls) > 1:
+            raise CircuitOpenError("Circuito aberto")
+
+    assert process_outbox_batch(db, send=send) == 1
+
+    assert messages[0].status == "sent"
+    for message in messages[1:]:
+        assert message.status == "pending"
+        assert message.attempts == 0
+        assert message.next_attempt_at <= datetime.utcnow()
+    assert len(calls) == 2
+
+
+def test_sends_through_the_local_sink(db):
+    server = start_sink(quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    register_client("brevo", OutboundClient("brevo"))
+    url = f"http://127.0.0.1:{server.server_address[1]}/v3/smtp/email"
+    try:
+        messages = _enqueue(db, 3)
+        assert process_outbox_batch(db, send=partial(send_email, url=url)) == 3
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert SinkHandler.received == 3
+    assert all(m.status == "sent" for m in messages)
@@ -0,0 +1,107 @@
+"""Consulta e escritores da exportação de despesas. A consulta é compilada
+no dialeto do Postgres (sem conectar); os escritores recebem linhas em
+memória no lugar do cursor do servidor."""
+import csv
+import io
+import uuid
+from datetime import datetime
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import pyarrow.parquet as pq
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import BinaryExpression
+from sqlalchemy.sql.selectable import Join
+from app.services import expense_export_service
+from app.services.analytics_service import _frame_query
+from app.services.expense_export_service import COLUMNS, _export_query
+
+
+def _join_comparisons(stmt):
+    joins = [f for f in stmt.get_final_froms() if isinstance(f, Join)]
+    while joins:
+        join = joins.pop()
+        joins.extend(side for side in (join.left, join.right) if isinstance(side, Join))
+        for node in visitors.iterate(join.onclause):
+            if isinstance(node, BinaryExpression):
+                yield node
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.parametrize("build", [_export_query, _frame_query])
+def test_joins_compare_columns_of_the_same_type(build):
+    # Postgres não tem operador varchar = uuid
+    comparisons = list(_join_comparisons(build("w1")))
+
+    assert comparisons
+    for node in comparisons:
+        assert node.left.type._type_affinity is node.right.type._type_affinity, str(node)
+
+
+def test_export_query_casts_tag_id_in_the_join():
+    sql = _sql(_export_query("w1"))
+
+    assert "LEFT OUTER JOIN tags ON tags.id = CAST(expenses.tag_id AS VARCHAR)" in sql
+
+
+def _rows(count: int) -> list:
+    return [
+        (
+            uuid.uuid4(),
+            datetime(2024, 1, 1 + i % 28),
+            f"Despesa {i}",
+            10.5 + i,
+            "1",
+            "Mercado",
+            str(uuid.uuid4()) if i % 2 else None,
+            "Casa" if i % 2 else None,
+            uuid.uuid4(),
+            None,
+            "#fff",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def chunks(monkeypatch):
+    def use(blocks):
+        monkeypatch.setattr(expense_export_service, "_chunks", lambda stmt: iter(blocks))
+
+    return use
+
+
+def test_csv_writes_header_and_every_row(chunks):
+    rows = _rows(5)
+    chunks([rows[:3], rows[3:]])
+
+    data = b"".join(expense_export_service._csv_chunks(None)).decode()
+    lines = list(csv.reader(io.StringIO(data)))
+
+    assert lines[0] == COLUMNS
+    assert len(lines) == 6
+
+
+def test_csv_without_rows_still_has_the_header(chunks):
+    chunks([])
+
+    data = b"".join(expense_export_service._csv_chunks(None)).decode()
+
+    assert list(csv.reader(io.StringIO(data))) == [COLUMNS]
+
+
+def test_parquet_reads_back_every_row(chunks):
+    rows = _rows(7)
+    chunks([rows[:4], rows[4:]])
+
+    data = b"".join(expense_export_service._parquet_chunks(None))
+    table = pq.read_table(io.BytesIO(data))
+
+    assert table.num_rows == 7
+    assert table.column_names == COLUMNS
+    assert table.column("id").to_pylist() == [str(r[0]) for r in rows]
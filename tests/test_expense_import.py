@@ -0,0 +1,225 @@
+"""Parsers da importação (CSV, OFX, JSON-lines) e o fluxo de import_expenses.
+O COPY e o rollup são trocados por fakes que guardam o que seria enviado
+ao Postgres."""
+import io
+import math
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.services import expense_import_service
+from app.services.expense_import_service import (
+    COPY_SQL,
+    _csv_rows,
+    _jsonl_rows,
+    _ofx_rows,
+    import_expenses,
+)
+
+WORKSPACE_ID = "w1"
+
+
+def _text(data: str) -> io.StringIO:
+    return io.StringIO(data, newline="")
+
+
+def test_csv_accepts_decimal_comma():
+    data = 'name,value,date\nMercado,"12,50",2024-01-05\nPadaria,3.75,2024-01-06\n'
+
+    rows = list(_csv_rows(_text(data)))
+
+    assert [fields["value"] for _, fields in rows] == ["12.50", "3.75"]
+
+
+def test_csv_keeps_thousands_separator_for_validation():
+    # "1.234,56" tem ponto e vírgula: não é convertido e a validação reporta
+    data = 'value,date\n"1.234,56",2024-01-05\n'
+
+    [(_, fields)] = _csv_rows(_text(data))
+
+    assert fields["value"] == "1.234,56"
+
+
+def test_csv_line_numbers_count_the_header():
+    data = "value,date\n1,2024-01-01\n2,2024-01-02\n"
+
+    assert [line for line, _ in _csv_rows(_text(data))] == [2, 3]
+
+
+def test_jsonl_reports_invalid_lines_and_skips_blank_ones():
+    data = '{"value": 1, "date": "2024-01-01"}\n\n[1, 2]\nnão é json\n'
+
+    rows = list(_jsonl_rows(_text(data)))
+
+    assert [line for line, _ in rows] == [1, 3, 4]
+    assert "_error" not in rows[0][1]
+    assert "_error" in rows[1][1]
+    assert "_error" in rows[2][1]
+
+
+OFX = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240105120000[-3:BRT]
+<TRNAMT>-45,90
+<NAME>Mercado
+<MEMO>Compra
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20240106
+<TRNAMT>1000.00
+<NAME>Salário
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def test_ofx_turns_debits_into_expenses_and_skips_credits():
+    rows = list(_ofx_rows(_text(OFX)))
+
+    assert [line for line, _ in rows] == [3, 10]
+    debit, credit = rows[0][1], rows[1][1]
+    assert debit["value"] == pytest.approx(45.90)
+    assert debit["name"] == "Mercado"
+    assert debit["date"].isoformat() == "2024-01-05T12:00:00"
+    assert credit is None
+
+
+class _Result:
+    def __init__(self, values):
+        self._values = values
+
+    def scalars(self):
+        return iter(self._values)
+
+
+class _FakeSession:
+    def __init__(self, tag_ids=()):
+        self.tag_ids = list(tag_ids)
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, stmt):
+        return _Result(self.tag_ids)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def copied(monkeypatch):
+    """Linhas enviadas via COPY para expenses, e os deltas do rollup."""
+    sent = {"expenses": [], "deltas": []}
+
+    def fake_copy(db, sql, buffer):
+        if sql == COPY_SQL:
+            sent["expenses"].extend(buffer.getvalue().splitlines())
+
+    monkeypatch.setattr(expense_import_service, "_copy", fake_copy)
+    monkeypatch.setattr(
+        expense_import_service,
+        "apply_rollup_deltas",
+        lambda db, deltas: sent["deltas"].append(dict(deltas)),
+    )
+    monkeypatch.setattr(
+        expense_import_service, "user_has_access_to_workspace", lambda *a: True
+    )
+    monkeypatch.setattr(expense_import_service, "bump_workspaces", lambda *a: None)
+    return sent
+
+
+def _import(data: str, fmt: str = "csv", db=None, **kwargs):
+    db = db or _FakeSession()
+    file = io.BytesIO(data.encode())
+    return import_expenses(WORKSPACE_ID, "u1", file, fmt, db, **kwargs), db
+
+
+def test_import_reports_errors_with_their_line(copied):
+    data = (
+        "name,value,date\n"
+        "Mercado,10,2024-01-01\n"
+        "Sem valor,,2024-01-02\n"
+        "Padaria,5,ontem\n"
+        "Feira,7,2024-01-03\n"
+    )
+
+    result, db = _import(data)
+
+    assert result.inserted == 2
+    assert result.errorCount == 2
+    assert [e.line for e in result.errors] == [3, 4]
+    assert "value" in result.errors[0].error
+    assert "date" in result.errors[1].error
+    assert len(copied["expenses"]) == 2
+    assert db.commits == 1
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", "0", "-10"])
+def test_import_rejects_values_that_would_break_the_rollup(copied, value):
+    data = f"value,date\n{value},2024-01-01\n"
+
+    result, _ = _import(data)
+
+    assert result.inserted == 0
+    assert result.errorCount == 1
+    for deltas in copied["deltas"]:
+        assert all(math.isfinite(total) for total, _ in deltas.values())
+
+
+def test_import_rejects_tags_from_other_workspaces(copied):
+    data = "value,date,tagId\n1,2024-01-01,t1\n2,2024-01-01,t-outro\n"
+
+    result, _ = _import(data, db=_FakeSession(tag_ids=["t1"]))
+
+    assert result.inserted == 1
+    assert [e.line for e in result.errors] == [3]
+
+
+def test_import_stops_at_max_rows(copied, monkeypatch):
+    monkeypatch.setattr(expense_import_service, "IMPORT_MAX_ROWS", 2)
+    data = "value,date\n" + "".join(f"{i},2024-01-01\n" for i in range(1, 6))
+
+    result, _ = _import(data)
+
+    assert result.inserted == 2
+    assert result.errorCount == 1
+    assert result.errors[0].line == 4
+    assert "Limite de 2 linhas" in result.errors[0].error
+
+
+def test_import_copies_in_batches(copied, monkeypatch):
+    monkeypatch.setattr(expense_import_service, "IMPORT_COPY_BATCH_SIZE", 2)
+    data = "value,date\n" + "".join(f"{i},2024-01-01\n" for i in range(1, 6))
+
+    result, _ = _import(data)
+
+    assert result.inserted == 5
+    assert len(copied["expenses"]) == 5
+    [deltas] = copied["deltas"]
+    [(total, count)] = deltas.values()
+    assert (total, count) == (15, 5)
+
+
+def test_atomic_import_rolls_back_on_any_error(copied):
+    data = "value,date\n10,2024-01-01\nnan,2024-01-02\n"
+
+    result, db = _import(data, atomic=True)
+
+    assert result.inserted == 0
+    assert result.errorCount == 1
+    assert db.rollbacks == 1
+    assert db.commits == 0
+    assert copied["deltas"] == []
+
+
+def test_ofx_import_counts_credits_as_skipped(copied):
+    result, _ = _import(OFX, fmt="ofx")
+
+    assert result.inserted == 1
+    assert result.skipped == 1
+    assert result.errorCount == 0
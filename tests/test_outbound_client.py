@@ -0,0 +1,158 @@
+"""OutboundClient com a sessão HTTP trocada por um fake, e register_client
+substituindo o cliente de um provedor."""
+import threading
+import pytest
+
+pytest.importorskip("requests")
+
+import requests
+from app.services.email_outbox_service import send_email
+from app.utils import http_client
+from app.utils.http_client import (
+    OutboundClient,
+    ProviderBusyError,
+    get_client,
+    register_client,
+)
+
+
+class _Response:
+    def __init__(self, status_code: int = 200):
+        self.status_code = status_code
+        self.text = ""
+
+
+class _FakeSession:
+    """Guarda os argumentos de cada chamada; pode segurar as chamadas até `release`."""
+
+    def __init__(self, status_code: int = 200, block: bool = False):
+        self.status_code = status_code
+        self.calls = []
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        self.started.release()
+        self.release.wait(5)
+        return _Response(self.status_code)
+
+
+class _FakeClient:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, **kwargs):
+        self.posts.append((url, kwargs))
+        return _Response(201)
+
+    def stats(self):
+        return {"posts": len(self.posts)}
+
+
+@pytest.fixture
+def registered(monkeypatch):
+    """register_client sobre um registro vazio, desfeito ao fim do teste."""
+    monkeypatch.setattr(http_client, "_clients", {})
+
+    def register(name, client):
+        register_client(name, client)
+        return get_client(name)
+
+    return register
+
+
+def _client(session: _FakeSession, **kwargs) -> OutboundClient:
+    client = OutboundClient("fake", **kwargs)
+    client.session = session
+    return client
+
+
+def test_fake_client_replaces_the_provider(registered):
+    fake = registered("brevo", _FakeClient())
+
+    send_email({"subject": "Oi"}, url="http://sink/v3/smtp/email")
+
+    [(url, kwargs)] = fake.posts
+    assert url == "http://sink/v3/smtp/email"
+    assert kwargs["json"] == {"subject": "Oi"}
+    assert http_client.clients_stats() == {"brevo": {"posts": 1}}
+
+
+def test_send_email_raises_on_provider_error(registered):
+    session = _FakeSession(status_code=400)
+    registered("brevo", _client(session))
+
+    with pytest.raises(RuntimeError):
+        send_email({"subject": "Oi"}, url="http://sink")
+
+
+def test_timeouts_are_passed_to_the_session(registered):
+    session = _FakeSession()
+    client = registered("fake", _client(session, connect_timeout=1.5, read_timeout=7))
+
+    client.post("http://provider/a", json={})
+    client.post("http://provider/b", json={}, timeout=0.5)
+
+    assert session.calls[0][2]["timeout"] == (1.5, 7)
+    assert session.calls[1][2]["timeout"] == 0.5
+
+
+def test_concurrency_limit_rejects_extra_calls(registered):
+    session = _FakeSession(block=True)
+    client = registered(
+        "fake", _client(session, max_concurrency=2, acquire_timeout=0.05)
+    )
+
+    threads = [
+        threading.Thread(target=client.post, args=("http://provider",))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for _ in threads:
+        assert session.started.acquire(timeout=5)
+
+    try:
+        with pytest.raises(ProviderBusyError):
+            client.post("http://provider")
+        assert len(session.calls) == 2
+    finally:
+        session.release.set()
+        for thread in threads:
+            thread.join()
+
+    # Vagas devolvidas: a próxima chamada passa
+    client.post("http://provider")
+    assert len(session.calls) == 3
+
+
+def test_latency_histogram_counts_every_call(registered):
+    session = _FakeSession()
+    client = registered("fake", _client(session))
+
+    for _ in range(3):
+        client.post("http://provider")
+
+    latency = client.stats()["latency_ms"]
+    assert latency["count"] == 3
+    assert latency["buckets"]["+Inf"] == 3
+    assert latency["sum"] >= 0
+
+
+def test_network_errors_are_timed_and_counted_as_failures(registered):
+    class _Down(_FakeSession):
+        def request(self, method, url, **kwargs):
+            raise requests.ConnectionError("recusada")
+
+    client = registered("fake", _client(_Down(), failure_threshold=2))
+
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            client.post("http://provider")
+
+    stats = client.stats()
+    assert stats["latency_ms"]["count"] == 2
+    assert stats["circuit"] == "open"
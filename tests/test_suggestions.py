@@ -0,0 +1,50 @@
+"""Inferência das sugestões (_infer) contra o predict_proba do pipeline
+inteiro, sobre dados sintéticos do bench."""
+import pytest
+
+pytest.importorskip("sklearn")
+
+from app.scripts.bench_suggestions import synthetic_rows
+from app.services.suggestion_service import _WorkspaceModels, _fit_labels, _infer
+
+
+@pytest.fixture(scope="module")
+def models():
+    texts, tags, categories = synthetic_rows(500, tags=8, categories=4)
+    return texts, _WorkspaceModels(
+        _fit_labels(texts, tags), _fit_labels(texts, categories), {}, 500, 0, 0
+    )
+
+
+def _expected(model, text, limit):
+    probabilities = model.predict_proba([text])[0]
+    ranked = sorted(zip(model.classes_, probabilities), key=lambda p: -p[1])
+    return [(label, pytest.approx(float(p))) for label, p in ranked[:limit]]
+
+
+def test_infer_matches_the_full_pipeline(models):
+    texts, workspace_models = models
+
+    for text in texts[:20]:
+        tags, categories = _infer(workspace_models, text, 3)
+        assert tags == _expected(workspace_models.tag_model, text, 3)
+        assert categories == _expected(workspace_models.category_model, text, 3)
+
+
+def test_coefficients_are_stored_for_sparse_inference(models):
+    _, workspace_models = models
+
+    classifier = workspace_models.tag_model[-1]
+    assert classifier.coef_.T.flags["C_CONTIGUOUS"]
+
+
+def test_missing_model_or_text_gives_no_suggestions(models):
+    texts, workspace_models = models
+    only_categories = _WorkspaceModels(
+        None, workspace_models.category_model, {}, 500, 0, 0
+    )
+
+    tags, categories = _infer(only_categories, texts[0], 3)
+    assert tags == []
+    assert len(categories) == 3
+    assert _infer(workspace_models, "", 3) == ([], [])
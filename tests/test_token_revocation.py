@@ -0,0 +1,39 @@
+import time
+from datetime import datetime, timedelta
+import pytest
+
+pytest.importorskip("jwt")
+
+from app.auth.tokens import (
+    RESET,
+    TokenError,
+    check_not_revoked,
+    create_access_token,
+    create_reset_token,
+    decode_token,
+)
+
+
+def test_token_without_cutoff_is_valid():
+    claims = decode_token(create_access_token("u1"))
+    check_not_revoked(claims, None)
+
+
+def test_tokens_issued_before_the_cutoff_are_revoked():
+    claims = decode_token(create_access_token("u1"))
+    time.sleep(0.01)
+    with pytest.raises(TokenError):
+        check_not_revoked(claims, datetime.utcnow())
+
+
+def test_login_right_after_the_cutoff_is_valid():
+    cutoff = datetime.utcnow()
+    time.sleep(0.01)
+    # iat tem fração de segundo: um login no mesmo segundo do corte vale
+    check_not_revoked(decode_token(create_access_token("u1")), cutoff)
+
+
+def test_reset_link_is_single_use():
+    claims = decode_token(create_reset_token("u1"), expected_types=[RESET])
+    with pytest.raises(TokenError):
+        check_not_revoked(claims, datetime.utcnow() + timedelta(milliseconds=1))
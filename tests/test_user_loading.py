@@ -0,0 +1,140 @@
+"""Quantas consultas (e quantas colunas) cada perfil de carregamento do
+usuário custa. Roda em SQLite em memória: só conta o SQL emitido."""
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from app.auth.tokens import create_access_token, create_invite_token
+from app.database import Base
+from app.dependencies import _load_current_user
+from app.models import Tag, User, Workspace
+from app.models.loading import FULL, IDENTITY_ONLY, MEMBERSHIP, user_load_options
+from app.services.workspaces_service import accept_workspace_invite
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+TABLES = ["users", "workspaces", "workspace_users", "tags", "expenses"]
+USER_COLUMNS = len(User.__table__.columns)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Base.metadata.tables[t] for t in TABLES])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def user_id(engine):
+    with Session(engine) as db:
+        user = User(id="u1", email="u1@example.com", password="x", name="Usuário")
+        workspace = Workspace(
+            id="w1", name="Casa", color="#fff", type={"id": 1}, user_id=user.id
+        )
+        workspace.users.append(user)
+        db.add_all([user, workspace])
+        db.add(Tag(id="t1", name="Mercado", user_id=user.id, workspace_id=workspace.id))
+        db.commit()
+    return "u1"
+
+
+@pytest.fixture
+def statements(engine):
+    """Lista (sql, largura da linha) de cada SELECT executado."""
+    executed = []
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        width = len(cursor.description) if cursor.description else 0
+        executed.append((statement, width))
+
+    yield executed
+    event.remove(engine, "after_cursor_execute", _record)
+
+
+def _load(engine, user_id, profile):
+    with Session(engine) as db:
+        user = (
+            db.query(User)
+            .options(*user_load_options(profile))
+            .filter(User.id == user_id)
+            .first()
+        )
+        db.expunge_all()
+    return user
+
+
+def test_identity_only_reads_only_the_users_row(engine, user_id, statements):
+    user = _load(engine, user_id, IDENTITY_ONLY)
+
+    assert user.id == user_id
+    assert len(statements) == 1
+    sql, width = statements[0]
+    assert width == USER_COLUMNS
+    assert "workspaces" not in sql
+    assert "expenses" not in sql
+    assert "tags" not in sql
+
+
+def test_membership_loads_workspaces_in_one_extra_query(engine, user_id, statements):
+    user = _load(engine, user_id, MEMBERSHIP)
+
+    assert [w.id for w in user.workspaces] == ["w1"]
+    assert len(statements) == 2
+    assert statements[0][1] == USER_COLUMNS
+    for sql, _ in statements:
+        assert "expenses" not in sql
+        assert "tags" not in sql
+
+
+def test_full_joins_the_whole_graph(engine, user_id, statements):
+    user = _load(engine, user_id, FULL)
+
+    assert [t.id for t in user.tags] == ["t1"]
+    sql = " ".join(s for s, _ in statements)
+    assert "expenses" in sql
+    assert "tags" in sql
+    assert statements[0][1] > USER_COLUMNS
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        user_load_options("everything")
+
+
+def test_current_user_dependency_is_one_narrow_query(engine, user_id, statements):
+    token = create_access_token(user_id)
+    with Session(engine) as db:
+        user = _load_current_user(token, db, IDENTITY_ONLY)
+        assert user.email == "u1@example.com"
+
+    assert len(statements) == 1
+    assert statements[0][1] == USER_COLUMNS
+
+
+def test_accepting_an_invite_reads_only_the_users_row(engine, user_id, statements):
+    with Session(engine) as db:
+        db.add(User(id="u2", email="u2@example.com", password="x", name="Convidado"))
+        db.commit()
+    statements.clear()
+
+    token = create_invite_token("u2@example.com", "w1", "Casa", None)
+    with Session(engine) as db:
+        accept_workspace_invite(token, db)
+
+    selects = [(sql, width) for sql, width in statements if sql.startswith("SELECT")]
+    user_query = selects[0]
+    assert "FROM users" in user_query[0]
+    assert user_query[1] <= USER_COLUMNS
+    for sql, _ in selects:
+        assert "expenses" not in sql
+        assert "tags" not in sql